@@ -4,6 +4,13 @@ import httpx
 import os
 
 from app.models.schemas import ScrapeSelectors
+from app.tools.listing_tools import (
+    get_listing_price_history,
+    get_listing_stats,
+    get_new_listings,
+    search_listings,
+    semantic_search_listings,
+)
 
 # Example specialized agent
 # This file defines a specific role or "persona"
@@ -46,6 +53,18 @@ researcher_agent = Agent(
     name="Researcher",
     instructions="""You are a Researcher. 
     Your goal is to find information and summarize it concisely.
-    Use your tools to gather data.""",
-    tools=[get_research_summary, scrape_url],
+    Use your tools to gather data.
+    For questions about businesses for sale, answer from the stored BizBuySell
+    listings (search_listings, get_listing_stats, get_listing_price_history,
+    get_new_listings, semantic_search_listings) before scraping anything.
+    Page through results only when the user needs more.""",
+    tools=[
+        get_research_summary,
+        scrape_url,
+        search_listings,
+        get_listing_stats,
+        get_listing_price_history,
+        get_new_listings,
+        semantic_search_listings,
+    ],
 )
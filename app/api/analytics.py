@@ -0,0 +1,131 @@
+"""FastAPI endpoints for aggregate analytics over BizBuySell listings."""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services import analytics_service
+
+
+router = APIRouter(prefix="/analytics")
+
+
+class GroupByResponse(BaseModel):
+    by: str
+    metric: str
+    rows: int
+    groups: List[Dict[str, Any]]
+
+
+class PercentilesResponse(BaseModel):
+    metric: str
+    count: int
+    values: Dict[str, Optional[float]]
+
+
+class HistogramResponse(BaseModel):
+    metric: str
+    count: int
+    edges: List[float]
+    counts: List[int]
+
+
+def _check_metric(metric: str) -> None:
+    if metric not in analytics_service.METRICS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"metric must be one of {', '.join(analytics_service.METRICS)}",
+        )
+
+
+@router.get("/info")
+def analytics_info(db: Session = Depends(get_db)):
+    frame = analytics_service.get_listing_frame(db)
+    return analytics_service.frame_info(frame)
+
+
+@router.get("/group-by", response_model=GroupByResponse)
+def group_by(
+    by: str = "state",
+    metric: str = "asking_price",
+    agg: List[str] = Query(default=["count", "median"]),
+    active_only: bool = True,
+    retirement_only: bool = False,
+    min_count: int = 1,
+    db: Session = Depends(get_db),
+):
+    """e.g. median asking price by state, or mean of is_retirement_listing by category."""
+    if by not in analytics_service.GROUP_COLUMNS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"by must be one of {', '.join(analytics_service.GROUP_COLUMNS)}",
+        )
+    _check_metric(metric)
+    unknown = [name for name in agg if name not in analytics_service.AGGREGATIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"agg must be among {', '.join(analytics_service.AGGREGATIONS)}",
+        )
+
+    frame = analytics_service.get_listing_frame(db)
+    groups = analytics_service.group_by(
+        frame,
+        by=by,
+        metric=metric,
+        aggs=agg,
+        active_only=active_only,
+        retirement_only=retirement_only,
+        min_count=min_count,
+    )
+    return GroupByResponse(by=by, metric=metric, rows=frame.size, groups=groups)
+
+
+@router.get("/percentiles", response_model=PercentilesResponse)
+def percentiles(
+    metric: str = "asking_price",
+    q: List[float] = Query(default=[10, 25, 50, 75, 90]),
+    active_only: bool = True,
+    retirement_only: bool = False,
+    db: Session = Depends(get_db),
+):
+    _check_metric(metric)
+    if any(value < 0 or value > 100 for value in q):
+        raise HTTPException(status_code=400, detail="q values must be in [0, 100]")
+
+    frame = analytics_service.get_listing_frame(db)
+    result = analytics_service.percentiles(
+        frame, metric, q, active_only=active_only, retirement_only=retirement_only
+    )
+    count = result.pop("count")
+    return PercentilesResponse(metric=metric, count=count, values=result)
+
+
+@router.get("/histogram", response_model=HistogramResponse)
+def histogram(
+    metric: str = "asking_price",
+    bins: int = Query(default=20, ge=1, le=500),
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    active_only: bool = True,
+    retirement_only: bool = False,
+    db: Session = Depends(get_db),
+):
+    _check_metric(metric)
+    if min_value is not None and max_value is not None and min_value >= max_value:
+        raise HTTPException(status_code=400, detail="min_value must be < max_value")
+
+    frame = analytics_service.get_listing_frame(db)
+    result = analytics_service.histogram(
+        frame,
+        metric,
+        bins=bins,
+        min_value=min_value,
+        max_value=max_value,
+        active_only=active_only,
+        retirement_only=retirement_only,
+    )
+    return HistogramResponse(metric=metric, **result)
@@ -1,15 +1,19 @@
 """FastAPI endpoints for BizBuySell listings."""
 
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Dict, Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from app.database import Listing, ListingDetail, ScrapeRun, get_db
-from app.services import listing_service
-from app.services.export_service import export_listings_to_csv
+from app.database import Listing, ListingDetail, ScrapeRun, SearchTarget, get_db
+from app.services import dedupe_service, embedding_service, listing_service
+from app.services.export_service import (
+    export_listings_incremental,
+    export_listings_to_csv,
+    export_to_parquet,
+)
 
 
 router = APIRouter()
@@ -27,6 +31,10 @@ class ListingResponse(BaseModel):
     location_raw: Optional[str]
     revenue: Optional[str]
     cash_flow: Optional[str]
+    revenue_num: Optional[int]
+    cash_flow_num: Optional[int]
+    inventory_num: Optional[int]
+    multiple: Optional[float]
     seller_reason_raw: Optional[str]
     url: str
     is_active: bool
@@ -67,6 +75,7 @@ class ListingActionRequest(BaseModel):
 class ScrapeRunResponse(BaseModel):
     id: int
     run_type: str
+    target_id: Optional[int]
     started_at: datetime
     completed_at: Optional[datetime]
     listings_found: int
@@ -81,6 +90,29 @@ class ScrapeRunResponse(BaseModel):
         orm_mode = True
 
 
+class SearchTargetRequest(BaseModel):
+    url: str
+    name: Optional[str] = None
+    cadence_minutes: Optional[int] = None  # None: adaptive, starting daily
+    priority: int = 0
+    enabled: bool = True
+
+
+class SearchTargetResponse(BaseModel):
+    id: int
+    name: Optional[str]
+    url: str
+    cadence_minutes: int
+    cadence_override: bool
+    priority: int
+    enabled: bool
+    last_run_at: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
 class StatsResponse(BaseModel):
     total_listings: int
     active_listings: int
@@ -88,34 +120,82 @@ class StatsResponse(BaseModel):
     new_today: int
 
 
+class DuplicateListingResponse(BaseModel):
+    cluster_id: int
+    similarity: Optional[float]
+    listing: ListingResponse
+
+
+class SemanticSearchResult(BaseModel):
+    score: float
+    listing: ListingResponse
+
+
 class ExportResponse(BaseModel):
     path: str
 
 
+class ParquetExportResponse(BaseModel):
+    path: str
+    files: Dict[str, List[str]]
+
+
+class IncrementalExportResponse(BaseModel):
+    destination: str
+    rows: int
+    file: Optional[str]
+    manifest: Optional[str]
+
+
 @router.get("/listings", response_model=List[ListingResponse])
 def list_listings(
+    response: Response,
     min_price: Optional[int] = None,
     max_price: Optional[int] = None,
     state: Optional[str] = None,
     city: Optional[str] = None,
     is_retirement: Optional[bool] = None,
     is_active: Optional[bool] = True,
+    min_cash_flow: Optional[int] = None,
+    max_cash_flow: Optional[int] = None,
+    min_revenue: Optional[int] = None,
+    max_revenue: Optional[int] = None,
+    min_multiple: Optional[float] = None,
+    max_multiple: Optional[float] = None,
+    sort_by: str = "last_updated_at",
+    descending: bool = True,
+    limit: int = Query(default=100, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Listing)
-    if is_active is not None:
-        query = query.filter(Listing.is_active.is_(is_active))
-    if is_retirement is not None:
-        query = query.filter(Listing.is_retirement_listing.is_(is_retirement))
-    if min_price is not None:
-        query = query.filter(Listing.asking_price >= min_price)
-    if max_price is not None:
-        query = query.filter(Listing.asking_price <= max_price)
-    if state:
-        query = query.filter(Listing.location_state == state)
-    if city:
-        query = query.filter(Listing.location_city == city)
-    return query.order_by(Listing.last_updated_at.desc()).all()
+    """
+    One page of matching listings. When more remain, the X-Next-Offset
+    header carries the offset of the next page.
+    """
+    filters = {
+        "is_active": is_active,
+        "is_retirement": is_retirement,
+        "min_price": min_price,
+        "max_price": max_price,
+        "state": state,
+        "city": city,
+        "min_cash_flow": min_cash_flow,
+        "max_cash_flow": max_cash_flow,
+        "min_revenue": min_revenue,
+        "max_revenue": max_revenue,
+        "min_multiple": min_multiple,
+        "max_multiple": max_multiple,
+    }
+    try:
+        # One row past the page tells whether another page exists
+        listings = listing_service.search_listings(
+            db, filters, sort_by=sort_by, descending=descending, limit=limit + 1, offset=offset
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if len(listings) > limit:
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return listings[:limit]
 
 
 @router.get("/listings/new", response_model=List[ListingResponse])
@@ -124,6 +204,22 @@ def list_new_listings(since_hours: int = 24, db: Session = Depends(get_db)):
     return listing_service.get_new_listings(db, since_date)
 
 
+@router.get("/listings/semantic-search", response_model=List[SemanticSearchResult])
+def semantic_search_listings(
+    q: str,
+    limit: int = Query(default=10, ge=1, le=100),
+    active_only: bool = True,
+    db: Session = Depends(get_db),
+):
+    """Listings ranked by embedding similarity to q (run sync_embeddings first)."""
+    try:
+        return embedding_service.search_listings(
+            db, q, limit=limit, active_only=active_only
+        )
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
 @router.get("/listings/{listing_id}", response_model=ListingWithDetailsResponse)
 def get_listing(listing_id: int, db: Session = Depends(get_db)):
     listing = db.query(Listing).filter(Listing.id == listing_id).first()
@@ -132,6 +228,16 @@ def get_listing(listing_id: int, db: Session = Depends(get_db)):
     return listing
 
 
+@router.get(
+    "/listings/{listing_id}/duplicates", response_model=List[DuplicateListingResponse]
+)
+def get_listing_duplicates(listing_id: int, db: Session = Depends(get_db)):
+    listing = db.query(Listing).filter(Listing.id == listing_id).first()
+    if not listing:
+        raise HTTPException(status_code=404, detail="Listing not found")
+    return dedupe_service.get_duplicates(db, listing_id)
+
+
 @router.post("/listings/{listing_id}/action")
 def mark_listing_action(
     listing_id: int, action: ListingActionRequest, db: Session = Depends(get_db)
@@ -149,20 +255,41 @@ def list_scrape_runs(db: Session = Depends(get_db)):
     return db.query(ScrapeRun).order_by(ScrapeRun.started_at.desc()).limit(50).all()
 
 
+@router.get("/search-targets", response_model=List[SearchTargetResponse])
+def list_search_targets(db: Session = Depends(get_db)):
+    return (
+        db.query(SearchTarget)
+        .order_by(SearchTarget.priority.desc(), SearchTarget.id.asc())
+        .all()
+    )
+
+
+@router.post("/search-targets", response_model=SearchTargetResponse)
+def create_search_target(request: SearchTargetRequest, db: Session = Depends(get_db)):
+    try:
+        target = listing_service.create_search_target(
+            db,
+            url=request.url,
+            name=request.name,
+            cadence_minutes=request.cadence_minutes,
+            priority=request.priority,
+            enabled=request.enabled,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    db.commit()
+    return target
+
+
 @router.get("/stats", response_model=StatsResponse)
 def get_stats(db: Session = Depends(get_db)):
-    total = db.query(Listing).count()
-    active = db.query(Listing).filter(Listing.is_active.is_(True)).count()
-    retirement = (
-        db.query(Listing).filter(Listing.is_retirement_listing.is_(True)).count()
-    )
     since = datetime.utcnow() - timedelta(days=1)
-    new_today = db.query(Listing).filter(Listing.first_seen_at >= since).count()
+    stats = listing_service.get_listing_stats(db, since)
     return StatsResponse(
-        total_listings=total,
-        active_listings=active,
-        retirement_listings=retirement,
-        new_today=new_today,
+        total_listings=stats["total_listings"],
+        active_listings=stats["active_listings"],
+        retirement_listings=stats["retirement_listings"],
+        new_today=stats["new_since"],
     )
 
 
@@ -180,3 +307,32 @@ def export_listings(
         active_only=active_only,
     )
     return ExportResponse(path=path)
+
+
+@router.get("/export/parquet", response_model=ParquetExportResponse)
+def export_listings_parquet(db: Session = Depends(get_db)):
+    output_dir = "bizbuysell_parquet"
+    try:
+        files = export_to_parquet(db, output_dir=output_dir)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    return ParquetExportResponse(path=output_dir, files=files)
+
+
+@router.post("/export/incremental", response_model=IncrementalExportResponse)
+def export_listings_incremental_endpoint(
+    destination: str = "default",
+    format: str = "csv",
+    db: Session = Depends(get_db),
+):
+    """Only listings changed since the destination's last export, plus a manifest."""
+    try:
+        result = export_listings_incremental(
+            db, destination=destination, output_dir="bizbuysell_incremental", fmt=format
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    db.commit()
+    return IncrementalExportResponse(**result)
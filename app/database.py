@@ -3,10 +3,12 @@
 import hashlib
 import json
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, List
 
 from sqlalchemy import (
     create_engine,
+    inspect,
     Column,
     Integer,
     String,
@@ -17,6 +19,7 @@ from sqlalchemy import (
     JSON,
     Float,
     Index,
+    LargeBinary,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
@@ -41,6 +44,11 @@ class Listing(Base):
     location_raw = Column(String(300), nullable=True)
     revenue = Column(String(100), nullable=True)
     cash_flow = Column(String(100), nullable=True)
+    # Numeric financials normalized from the raw strings above and the details
+    revenue_num = Column(Integer, nullable=True)
+    cash_flow_num = Column(Integer, nullable=True)
+    inventory_num = Column(Integer, nullable=True)
+    multiple = Column(Float, nullable=True)  # asking_price / cash_flow_num
     seller_reason_raw = Column(Text, nullable=True)
     url = Column(String(1000), nullable=False)
     content_hash = Column(String(64), nullable=False)
@@ -50,6 +58,8 @@ class Listing(Base):
     last_updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    # Moves only when the card, detail page or financial columns actually change
+    content_changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Status
     is_active = Column(Boolean, default=True, nullable=False)
@@ -66,6 +76,12 @@ class Listing(Base):
         Index("idx_listings_location", "location_state", "location_city"),
         Index("idx_listings_retirement", "is_retirement_listing", "is_active"),
         Index("idx_listings_updated", "last_updated_at"),
+        Index("idx_listings_changed", "content_changed_at"),
+        Index("idx_listings_first_seen", "first_seen_at"),
+        Index("idx_listings_cash_flow", "cash_flow_num"),
+        Index("idx_listings_revenue", "revenue_num"),
+        Index("idx_listings_inventory", "inventory_num"),
+        Index("idx_listings_multiple", "multiple"),
     )
 
 
@@ -120,6 +136,22 @@ class ListingSnapshot(Base):
     __table_args__ = (Index("idx_snapshots_listing_date", "listing_id", "created_at"),)
 
 
+class ListingDetailChange(Base):
+    """Detail page recrawl that found changed content (snapshots only cover the card)."""
+
+    __tablename__ = "listing_detail_changes"
+
+    id = Column(Integer, primary_key=True)
+    listing_id = Column(
+        Integer, ForeignKey("listings.id", ondelete="CASCADE"), nullable=False
+    )
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_listing_detail_changes_listing_date", "listing_id", "changed_at"),
+    )
+
+
 class UserAction(Base):
     """User actions on listings (viewed, interested, ignored)."""
 
@@ -146,6 +178,9 @@ class ScrapeRun(Base):
 
     id = Column(Integer, primary_key=True)
     run_type = Column(String(50), nullable=False)  # search, details
+    target_id = Column(
+        Integer, ForeignKey("search_targets.id", ondelete="SET NULL"), nullable=True
+    )
     started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
 
@@ -159,7 +194,244 @@ class ScrapeRun(Base):
     status = Column(String(50), default="running")  # running, completed, failed
     error_message = Column(Text, nullable=True)
 
-    __table_args__ = (Index("idx_scrape_runs_date", "started_at"),)
+    # Relationships
+    checkpoint = relationship("CrawlCheckpoint", back_populates="scrape_run", uselist=False)
+    target = relationship("SearchTarget", back_populates="scrape_runs")
+
+    __table_args__ = (
+        Index("idx_scrape_runs_date", "started_at"),
+        Index("idx_scrape_runs_target", "target_id", "started_at"),
+    )
+
+
+class SearchTarget(Base):
+    """Saved BizBuySell search to crawl on its own cadence."""
+
+    __tablename__ = "search_targets"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(200), nullable=True)
+    url = Column(String(1000), unique=True, nullable=False)
+    cadence_minutes = Column(Integer, default=1440, nullable=False)
+    # Set when a user chose cadence_minutes; the adaptive planner leaves it alone
+    cadence_override = Column(Boolean, default=False, nullable=False)
+    priority = Column(Integer, default=0, nullable=False)  # Higher = more priority
+    enabled = Column(Boolean, default=True, nullable=False)
+    last_run_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationship
+    scrape_runs = relationship("ScrapeRun", back_populates="target")
+
+    __table_args__ = (Index("idx_search_targets_enabled", "enabled", "priority"),)
+
+
+class CrawlCheckpoint(Base):
+    """Progress of a paginated search crawl, used to resume interrupted runs."""
+
+    __tablename__ = "crawl_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    scrape_run_id = Column(
+        Integer,
+        ForeignKey("scrape_runs.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    start_url = Column(String(1000), nullable=False)
+    last_completed_url = Column(String(1000), nullable=True)
+    next_url = Column(String(1000), nullable=True)  # None once pagination is done
+    visited_urls = Column(JSON, nullable=False, default=list)
+    pages_completed = Column(Integer, default=0)
+    stats = Column(JSON, nullable=True)  # partial ScrapeRun counters
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    # Relationship
+    scrape_run = relationship("ScrapeRun", back_populates="checkpoint")
+
+    __table_args__ = (Index("idx_crawl_checkpoints_start_url", "start_url"),)
+
+
+class ListingSignature(Base):
+    """MinHash signature of a listing's title and description text."""
+
+    __tablename__ = "listing_signatures"
+
+    id = Column(Integer, primary_key=True)
+    listing_id = Column(
+        Integer,
+        ForeignKey("listings.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    text_hash = Column(String(64), nullable=False)  # skips re-hashing unchanged text
+    minhash = Column(JSON, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+
+class ListingLshBucket(Base):
+    """LSH band bucket membership; bucket already encodes band and location block."""
+
+    __tablename__ = "listing_lsh_buckets"
+
+    id = Column(Integer, primary_key=True)
+    listing_id = Column(
+        Integer, ForeignKey("listings.id", ondelete="CASCADE"), nullable=False
+    )
+    bucket = Column(String(32), nullable=False)
+
+    __table_args__ = (
+        Index("idx_lsh_buckets_bucket", "bucket"),
+        Index("idx_lsh_buckets_listing", "listing_id"),
+    )
+
+
+class DuplicateCluster(Base):
+    """Near-duplicate cluster membership; cluster_id is the oldest member's listing id."""
+
+    __tablename__ = "duplicate_clusters"
+
+    id = Column(Integer, primary_key=True)
+    listing_id = Column(
+        Integer,
+        ForeignKey("listings.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    cluster_id = Column(Integer, nullable=False)
+    matched_listing_id = Column(Integer, nullable=True)
+    similarity = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (Index("idx_duplicate_clusters_cluster", "cluster_id"),)
+
+
+class ListingEmbedding(Base):
+    """Cached embedding of a listing's text for one embedding model."""
+
+    __tablename__ = "listing_embeddings"
+
+    id = Column(Integer, primary_key=True)
+    listing_id = Column(
+        Integer,
+        ForeignKey("listings.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    model = Column(String(200), nullable=False)
+    content_hash = Column(String(64), nullable=False)  # hash of the embedded text
+    vector = Column(LargeBinary, nullable=False)  # float32, L2-normalized
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    __table_args__ = (Index("idx_listing_embeddings_model", "model"),)
+
+
+class ExportWatermark(Base):
+    """Position of the last listing written to an incremental export destination."""
+
+    __tablename__ = "export_watermarks"
+
+    id = Column(Integer, primary_key=True)
+    destination = Column(String(200), unique=True, nullable=False)
+    last_changed_at = Column(DateTime, nullable=True)
+    last_id = Column(Integer, nullable=True)
+    rows_exported = Column(Integer, default=0, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+
+class IngestRun(Base):
+    """Log of leadgen ingest executions (one per query x location job)."""
+
+    __tablename__ = "ingest_runs"
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String(50), default="google_maps", nullable=False)
+    query = Column(String(300), nullable=False)
+    location = Column(String(300), nullable=False)
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    # Stats
+    records_fetched = Column(Integer, default=0)
+    new_leads = Column(Integer, default=0)
+    updated_leads = Column(Integer, default=0)
+
+    status = Column(String(50), default="running")  # running, completed, failed
+    error_message = Column(Text, nullable=True)
+
+    __table_args__ = (Index("idx_ingest_runs_date", "started_at"),)
+
+
+class Lead(Base):
+    """Business lead from Google Maps, one row per place_id."""
+
+    __tablename__ = "leads"
+
+    id = Column(Integer, primary_key=True)
+    place_id = Column(String(200), unique=True, nullable=False, index=True)
+    data_id = Column(String(200), nullable=True)
+    source = Column(String(50), default="google_maps", nullable=False)
+    name = Column(String(500), nullable=False)
+    niche = Column(String(300), nullable=True)  # query the lead was first found by
+    city = Column(String(200), nullable=True)
+    state = Column(String(50), nullable=True)
+    address = Column(String(500), nullable=True)
+    phone = Column(String(50), nullable=True)
+    website = Column(String(1000), nullable=True)
+    category = Column(String(200), nullable=True)
+    rating = Column(Float, nullable=True)
+    reviews = Column(Integer, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    source_url = Column(String(1000), nullable=True)
+    raw_data = Column(JSON, nullable=False)  # latest record as written by the ingest
+    content_hash = Column(String(64), nullable=False)
+    last_run_id = Column(
+        Integer, ForeignKey("ingest_runs.id", ondelete="SET NULL"), nullable=True
+    )
+
+    # Timestamps
+    first_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationship
+    observations = relationship("LeadObservation", back_populates="lead")
+
+    __table_args__ = (
+        Index("idx_leads_niche_city", "niche", "city"),
+        Index("idx_leads_updated", "last_updated_at"),
+    )
+
+
+class LeadObservation(Base):
+    """Rating and review count of a lead each time an ingest saw them change."""
+
+    __tablename__ = "lead_observations"
+
+    id = Column(Integer, primary_key=True)
+    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE"), nullable=False)
+    run_id = Column(
+        Integer, ForeignKey("ingest_runs.id", ondelete="SET NULL"), nullable=True
+    )
+    rating = Column(Float, nullable=True)
+    reviews = Column(Integer, nullable=True)
+    observed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationship
+    lead = relationship("Lead", back_populates="observations")
+
+    __table_args__ = (
+        Index("idx_lead_observations_lead_date", "lead_id", "observed_at"),
+    )
 
 
 class ScrapingQueue(Base):
@@ -183,6 +455,10 @@ class ScrapingQueue(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processed_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        Index("idx_scraping_queue_status", "status", "priority", "created_at"),
+    )
+
 
 # Database engine setup
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./bizbuysell_listings.db")
@@ -193,9 +469,34 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_REVISION = "0001"  # schema before migrations existed
+
+
+def migrate_database(bind=None) -> None:
+    """
+    Upgrade the database to the latest Alembic revision. Databases created
+    by create_all before migrations existed have tables but no
+    alembic_version, so they are stamped at the baseline first.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(PROJECT_ROOT / "migrations"))
+    config.set_main_option("path_separator", "os")
+    config.set_main_option("prepend_sys_path", str(PROJECT_ROOT))
+    with (bind or engine).begin() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "listings" in tables and "alembic_version" not in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+
+
 def init_db():
-    """Create all tables."""
-    Base.metadata.create_all(bind=engine)
+    """Create or upgrade tables by running migrations."""
+    migrate_database()
 
 
 def get_db():
@@ -0,0 +1,11 @@
+"""Leadgen enrichment stages."""
+
+__all__ = ["WebsiteEnricher", "enrich_records"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        from app.leadgen.enrich import website
+
+        return getattr(website, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
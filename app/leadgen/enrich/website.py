@@ -0,0 +1,333 @@
+"""Website enrichment for Google Maps leads: emails, social links, tech hints.
+
+Each lead's site is fetched at most once per run and once per cache TTL:
+leads are grouped by domain, domains are fetched over a bounded pool that
+shares one httpx client, requests to the same domain are spaced by a
+per-domain rate limit, and results are cached by domain in SQLite.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import urljoin, urlparse
+
+import httpx
+
+from app.leadgen.rate_limit import AsyncRateLimiter
+
+DEFAULT_CACHE_DB_PATH = "data/leadgen/cache.db"
+DEFAULT_CONCURRENCY = 50
+DEFAULT_TIMEOUT_SECONDS = 10.0
+MAX_PAGE_BYTES = 1_000_000
+USER_AGENT = "Mozilla/5.0 (compatible; LeadgenEnricher/1.0)"
+
+SOCIAL_NETWORKS = {
+    "facebook": ("facebook.com", "fb.com"),
+    "instagram": ("instagram.com",),
+    "linkedin": ("linkedin.com",),
+    "twitter": ("twitter.com", "x.com"),
+    "youtube": ("youtube.com",),
+    "tiktok": ("tiktok.com",),
+    "yelp": ("yelp.com",),
+}
+
+# Substrings in page HTML that identify a site builder or marketing tool.
+TECH_SIGNATURES = {
+    "wordpress": ("wp-content/", "wp-includes/"),
+    "shopify": ("cdn.shopify.com", "myshopify.com"),
+    "wix": ("static.wixstatic.com", "wix.com"),
+    "squarespace": ("squarespace.com", "sqsp.net"),
+    "godaddy": ("img1.wsimg.com",),
+    "webflow": ("webflow.com", "data-wf-site"),
+    "square_online": ("squareup.com", "square.site"),
+    "toast": ("toasttab.com",),
+    "google_analytics": ("google-analytics.com", "gtag/js"),
+    "google_tag_manager": ("googletagmanager.com/gtm.js",),
+    "facebook_pixel": ("connect.facebook.net",),
+    "hubspot": ("js.hs-scripts.com", "hs-analytics.net"),
+    "calendly": ("calendly.com",),
+    "opentable": ("opentable.com",),
+}
+
+_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,24}")
+_HREF = re.compile(r"""href\s*=\s*["']([^"'#]+)["']""", re.IGNORECASE)
+_EMAIL_NOISE = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", "sentry", "wixpress.com", "example.com")
+_SHARE_PATHS = ("sharer", "/share", "intent/", "/plugins/", "/dialog/")
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS website_enrichment (
+    domain TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+)
+"""
+
+
+def site_domain(website: str | None) -> str | None:
+    """Lowercased host without www., or None for a missing/invalid URL."""
+    if not website or not website.strip():
+        return None
+    url = website.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    host = (urlparse(url).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+def _network_for(host: str) -> str | None:
+    for network, domains in SOCIAL_NETWORKS.items():
+        if any(host == d or host.endswith(f".{d}") for d in domains):
+            return network
+    return None
+
+
+def extract_emails(html: str) -> list[str]:
+    found: dict[str, None] = {}
+    for match in _EMAIL.findall(html):
+        email = match.lower().strip(".")
+        if not any(noise in email for noise in _EMAIL_NOISE):
+            found[email] = None
+    return list(found)
+
+
+def extract_socials(html: str, base_url: str) -> dict[str, str]:
+    socials: dict[str, str] = {}
+    for href in _HREF.findall(html):
+        url = urljoin(base_url, href.strip())
+        network = _network_for(site_domain(url) or "")
+        if not network or network in socials:
+            continue
+        if any(part in url.lower() for part in _SHARE_PATHS):
+            continue
+        socials[network] = url
+    return socials
+
+
+def extract_tech(html: str) -> list[str]:
+    lowered = html.lower()
+    return [
+        name
+        for name, signatures in TECH_SIGNATURES.items()
+        if any(signature in lowered for signature in signatures)
+    ]
+
+
+def _contact_link(html: str, base_url: str, domain: str) -> str | None:
+    for href in _HREF.findall(html):
+        if "contact" in href.lower():
+            url = urljoin(base_url, href.strip())
+            if site_domain(url) == domain and url.startswith("http"):
+                return url
+    return None
+
+
+class EnrichmentCache:
+    """Per-domain enrichment results in SQLite (the leadgen cache file)."""
+
+    def __init__(self, db_path: str | Path | None = None, ttl_seconds: float | None = None) -> None:
+        self.db_path = Path(db_path or os.getenv("LEADGEN_CACHE_DB_PATH") or DEFAULT_CACHE_DB_PATH)
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("LEADGEN_CACHE_TTL_DAYS", "30")) * 24 * 60 * 60
+        self.ttl_seconds = ttl_seconds
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(_CACHE_SCHEMA)
+        self.conn.commit()
+
+    def get(self, domain: str) -> dict[str, Any] | None:
+        row = self.conn.execute(
+            "SELECT result, fetched_at FROM website_enrichment WHERE domain = ?", (domain,)
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def set(self, domain: str, result: dict[str, Any]) -> None:
+        self.set_many({domain: result})
+
+    def set_many(self, results: dict[str, dict[str, Any]]) -> None:
+        """Store several domains' results in one transaction."""
+        fetched_at = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO website_enrichment (domain, result, fetched_at) "
+                "VALUES (?, ?, ?)",
+                [(domain, json.dumps(result), fetched_at) for domain, result in results.items()],
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class WebsiteEnricher:
+    """
+    Adds record["enrichment"] = {domain, status, emails, socials, tech} to
+    Google Maps records. status is "ok", "no_website", "social_only" (the
+    listed website is itself a social profile) or "error: ...". Errors
+    are not cached, so timeouts are retried on the next run.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_domain_rate: float | None = None,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        max_bytes: int = MAX_PAGE_BYTES,
+        cache: EnrichmentCache | None = None,
+        use_cache: bool = True,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.per_domain_rate = per_domain_rate or float(
+            os.getenv("LEADGEN_ENRICHMENT_RATE_LIMIT", "5")
+        )
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.cache = (cache or EnrichmentCache()) if use_cache else None
+        self.transport = transport
+        self.stats = {"leads": 0, "domains": 0, "fetched": 0, "cached": 0, "errors": 0}
+        self._limiters: dict[str, AsyncRateLimiter] = {}
+
+    async def _get_html(self, client: httpx.AsyncClient, url: str, domain: str) -> tuple[str, str]:
+        limiter = self._limiters.setdefault(domain, AsyncRateLimiter(self.per_domain_rate))
+        await limiter.wait()
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if content_type and "html" not in content_type:
+                return "", str(response.url)
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) >= self.max_bytes:
+                    break
+            encoding = response.encoding or "utf-8"
+            return body.decode(encoding, errors="replace"), str(response.url)
+
+    async def _enrich_domain(
+        self, client: httpx.AsyncClient, domain: str, website: str
+    ) -> dict[str, Any]:
+        url = website.strip() if "://" in website else f"https://{website.strip()}"
+        network = _network_for(domain)
+        if network:
+            return {"domain": domain, "status": "social_only", "emails": [], "socials": {network: url}, "tech": []}
+
+        try:
+            html, final_url = await self._get_html(client, url, domain)
+            emails = extract_emails(html)
+            socials = extract_socials(html, final_url)
+            if not emails:
+                contact_url = _contact_link(html, final_url, site_domain(final_url) or domain)
+                if contact_url and contact_url != final_url:
+                    contact_html, _ = await self._get_html(client, contact_url, domain)
+                    emails = extract_emails(contact_html)
+                    socials = {**extract_socials(contact_html, contact_url), **socials}
+            result = {
+                "domain": domain,
+                "status": "ok",
+                "emails": emails,
+                "socials": socials,
+                "tech": extract_tech(html),
+            }
+        except Exception as exc:  # one bad site must not sink the batch
+            self.stats["errors"] += 1
+            result = {
+                "domain": domain,
+                "status": f"error: {type(exc).__name__}",
+                "emails": [],
+                "socials": {},
+                "tech": [],
+            }
+        self.stats["fetched"] += 1
+        return result
+
+    async def enrich(self, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Enrich records in place and return them."""
+        by_domain: dict[str, list[dict[str, Any]]] = {}
+        for record in records:
+            self.stats["leads"] += 1
+            raw = record.get("raw_data") or {}
+            domain = site_domain(raw.get("website"))
+            if domain is None:
+                record["enrichment"] = {"domain": None, "status": "no_website", "emails": [], "socials": {}, "tech": []}
+                continue
+            by_domain.setdefault(domain, []).append(record)
+        self.stats["domains"] += len(by_domain)
+
+        results: dict[str, dict[str, Any]] = {}
+        pending = []
+        for domain, domain_records in by_domain.items():
+            cached = self.cache.get(domain) if self.cache else None
+            if cached is not None:
+                self.stats["cached"] += 1
+                results[domain] = cached
+            else:
+                pending.append((domain, domain_records[0]["raw_data"]["website"]))
+
+        if pending:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            async with httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+                ),
+                transport=self.transport,
+            ) as client:
+
+                async def run(domain: str, website: str) -> None:
+                    async with semaphore:
+                        results[domain] = await self._enrich_domain(client, domain, website)
+
+                await asyncio.gather(*(run(domain, website) for domain, website in pending))
+
+            # One cache transaction after the fetches, not a commit per domain
+            # blocking the event loop while other requests are in flight
+            if self.cache:
+                self.cache.set_many(
+                    {
+                        domain: results[domain]
+                        for domain, _ in pending
+                        if not results[domain]["status"].startswith("error")
+                    }
+                )
+
+        for domain, domain_records in by_domain.items():
+            for record in domain_records:
+                record["enrichment"] = results[domain]
+        return records
+
+    def format_stats(self) -> str:
+        return (
+            f"{self.stats['leads']} leads, {self.stats['domains']} domains "
+            f"({self.stats['fetched']} fetched, {self.stats['cached']} cached, "
+            f"{self.stats['errors']} errors)"
+        )
+
+    def close(self) -> None:
+        if self.cache:
+            self.cache.close()
+
+
+async def enrich_records(
+    records: list[dict[str, Any]], enricher: WebsiteEnricher | None = None
+) -> list[dict[str, Any]]:
+    """Run the website enrichment stage over records (in place)."""
+    owned = enricher is None
+    enricher = enricher or WebsiteEnricher()
+    try:
+        return await enricher.enrich(records)
+    finally:
+        if owned:
+            enricher.close()
@@ -4,11 +4,15 @@ from app.leadgen.export.sheets import (
     GOOGLE_MAPS_COLUMNS,
     export_google_maps_records_to_csv,
     export_google_maps_records_to_sheet,
+    export_google_maps_stream_to_csv,
+    sync_google_maps_records_to_worksheet,
 )
 
 __all__ = [
     "GOOGLE_MAPS_COLUMNS",
     "export_google_maps_records_to_csv",
     "export_google_maps_records_to_sheet",
+    "export_google_maps_stream_to_csv",
+    "sync_google_maps_records_to_worksheet",
 ]
 
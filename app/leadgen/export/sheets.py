@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import csv
+import gzip
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, AsyncIterable, Callable, Iterable, Iterator, Sequence
 
 GOOGLE_MAPS_COLUMNS = [
     "source",
@@ -27,8 +29,21 @@ GOOGLE_MAPS_COLUMNS = [
     "query",
     "location",
     "fetched_at_utc",
+    # Website enrichment (app.leadgen.enrich); blank for unenriched records.
+    "emails",
+    "facebook",
+    "instagram",
+    "linkedin",
+    "twitter",
+    "tech_hints",
+    "enrichment_status",
+    # app.leadgen.scoring.rank_records; blank for unranked records.
+    "lead_score",
 ]
 
+# gzip's default level 9 is several times slower for ~10% smaller files.
+CSV_GZIP_LEVEL = 6
+
 
 def _safe_float(value: Any) -> float | None:
     try:
@@ -39,76 +54,315 @@ def _safe_float(value: Any) -> float | None:
         return None
 
 
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def google_maps_row(record: dict[str, Any], fetched_at_utc: str) -> tuple[Any, ...]:
+    """One record as a tuple in GOOGLE_MAPS_COLUMNS order."""
+    raw = record.get("raw_data")
+    if not isinstance(raw, dict):
+        raw = {}
+    gps = raw.get("gps_coordinates")
+    if not isinstance(gps, dict):
+        gps = {}
+    enrichment = record.get("enrichment")
+    if not isinstance(enrichment, dict):
+        enrichment = {}
+    socials = enrichment.get("socials") or {}
+    return (
+        record.get("source", "google_maps"),
+        record.get("vendor_name") or "",
+        record.get("contract_category") or raw.get("type") or "",
+        raw.get("address") or "",
+        record.get("city") or "",
+        record.get("state") or "TN",
+        raw.get("phone") or "",
+        raw.get("website") or "",
+        _safe_float(raw.get("rating")),
+        raw.get("reviews") or "",
+        raw.get("place_id") or "",
+        raw.get("data_id") or "",
+        raw.get("data_cid") or "",
+        _safe_float(gps.get("latitude")),
+        _safe_float(gps.get("longitude")),
+        record.get("source_url") or "",
+        raw.get("query") or "",
+        raw.get("location") or "",
+        fetched_at_utc,
+        "; ".join(enrichment.get("emails") or []),
+        socials.get("facebook") or "",
+        socials.get("instagram") or "",
+        socials.get("linkedin") or "",
+        socials.get("twitter") or "",
+        ", ".join(enrichment.get("tech") or []),
+        enrichment.get("status") or "",
+        record.get("lead_score", ""),
+    )
+
+
+def google_maps_rows(
+    records: Iterable[dict[str, Any]], fetched_at_utc: str | None = None
+) -> Iterator[tuple[Any, ...]]:
+    """
+    Column-ordered rows for CSV and Sheets exports. The timestamp is taken
+    once per export, so every row of a run shares it.
+    """
+    ts = fetched_at_utc or _utc_now()
+    for record in records:
+        yield google_maps_row(record, ts)
+
+
 def normalize_google_maps_record(
     record: dict[str, Any], fetched_at_utc: str | None = None
 ) -> dict[str, Any]:
-    raw = record.get("raw_data", {}) if isinstance(record.get("raw_data"), dict) else {}
-    gps = (
-        raw.get("gps_coordinates", {})
-        if isinstance(raw.get("gps_coordinates"), dict)
-        else {}
-    )
-    ts = fetched_at_utc or datetime.now(timezone.utc).isoformat()
-    return {
-        "source": record.get("source", "google_maps"),
-        "vendor_name": record.get("vendor_name") or "",
-        "category": record.get("contract_category") or raw.get("type") or "",
-        "address": raw.get("address") or "",
-        "city": record.get("city") or "",
-        "state": record.get("state") or "TN",
-        "phone": raw.get("phone") or "",
-        "website": raw.get("website") or "",
-        "rating": _safe_float(raw.get("rating")),
-        "reviews": raw.get("reviews") or "",
-        "place_id": raw.get("place_id") or "",
-        "data_id": raw.get("data_id") or "",
-        "data_cid": raw.get("data_cid") or "",
-        "latitude": _safe_float(gps.get("latitude")),
-        "longitude": _safe_float(gps.get("longitude")),
-        "source_url": record.get("source_url") or "",
-        "query": raw.get("query") or "",
-        "location": raw.get("location") or "",
-        "fetched_at_utc": ts,
-    }
+    return dict(zip(GOOGLE_MAPS_COLUMNS, google_maps_row(record, fetched_at_utc or _utc_now())))
 
 
 def build_google_maps_rows(
-    records: list[dict[str, Any]], fetched_at_utc: str | None = None
-) -> list[list[Any]]:
-    rows: list[list[Any]] = [GOOGLE_MAPS_COLUMNS]
-    for record in records:
-        normalized = normalize_google_maps_record(record, fetched_at_utc=fetched_at_utc)
-        rows.append([normalized.get(col, "") for col in GOOGLE_MAPS_COLUMNS])
-    return rows
+    records: Iterable[dict[str, Any]], fetched_at_utc: str | None = None
+) -> list[Sequence[Any]]:
+    return [GOOGLE_MAPS_COLUMNS, *google_maps_rows(records, fetched_at_utc)]
+
+
+def _open_csv(output_dir: str, filename: str, compress: bool) -> tuple[Path, IO[str]]:
+    if compress and not filename.endswith(".gz"):
+        filename = f"{filename}.gz"
+    output_path = Path(output_dir) / filename
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.suffix == ".gz":
+        return output_path, gzip.open(
+            output_path, "wt", compresslevel=CSV_GZIP_LEVEL, encoding="utf-8", newline=""
+        )
+    return output_path, output_path.open("w", encoding="utf-8", newline="")
 
 
 def export_google_maps_records_to_csv(
-    records: list[dict[str, Any]],
+    records: Iterable[dict[str, Any]],
     output_dir: str = "data/leadgen",
     filename: str = "google_maps_leads.csv",
     fetched_at_utc: str | None = None,
+    compress: bool = False,
 ) -> str:
-    output_path = Path(output_dir) / filename
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    """Write records as CSV; compress=True (or a .gz filename) gzips it."""
+    output_path, f = _open_csv(output_dir, filename, compress)
+    with f:
+        writer = csv.writer(f)
+        writer.writerow(GOOGLE_MAPS_COLUMNS)
+        writer.writerows(google_maps_rows(records, fetched_at_utc))
+    return str(output_path)
 
-    with output_path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=GOOGLE_MAPS_COLUMNS)
-        writer.writeheader()
-        for record in records:
-            writer.writerow(
-                normalize_google_maps_record(record, fetched_at_utc=fetched_at_utc)
-            )
+
+async def export_google_maps_stream_to_csv(
+    records: AsyncIterable[dict[str, Any]],
+    output_dir: str = "data/leadgen",
+    filename: str = "google_maps_leads.csv",
+    fetched_at_utc: str | None = None,
+    compress: bool = False,
+) -> str:
+    """CSV export that writes rows as records arrive, e.g. from GoogleMapsIngest.stream()."""
+    ts = fetched_at_utc or _utc_now()
+    output_path, f = _open_csv(output_dir, filename, compress)
+    with f:
+        writer = csv.writer(f)
+        writer.writerow(GOOGLE_MAPS_COLUMNS)
+        async for record in records:
+            writer.writerow(google_maps_row(record, ts))
     return str(output_path)
 
 
+SHEETS_CHUNK_ROWS = 500
+SHEETS_MAX_RETRIES = 5
+SHEETS_BACKOFF_SECONDS = 1.0
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def _column_letter(index: int) -> str:
+    """1 -> A, 27 -> AA."""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _with_backoff(
+    call: Callable[[], Any],
+    max_retries: int = SHEETS_MAX_RETRIES,
+    backoff_seconds: float = SHEETS_BACKOFF_SECONDS,
+) -> Any:
+    """Retry Sheets API calls that hit quota (429) or server errors."""
+    for attempt in range(max_retries + 1):
+        try:
+            return call()
+        except Exception as exc:
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+            if status not in _RETRY_STATUS or attempt == max_retries:
+                raise
+            time.sleep(backoff_seconds * 2**attempt)
+
+
+def _row_ranges(row_numbers: list[int]) -> list[tuple[int, int]]:
+    """Sorted row numbers grouped into (first, last) runs of consecutive rows."""
+    runs: list[tuple[int, int]] = []
+    for number in row_numbers:
+        if runs and number == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], number)
+        else:
+            runs.append((number, number))
+    return runs
+
+
+def _same_cell(sheet_value: Any, value: Any) -> bool:
+    """Compare a cell read back from Sheets with the value we would write."""
+    left = "" if sheet_value is None else sheet_value
+    right = "" if value is None else value
+    if str(left) == str(right):
+        return True
+    if left == "" or right == "":
+        return False
+    try:
+        return float(left) == float(right)
+    except (TypeError, ValueError):
+        return False
+
+
+def _row_changed(sheet_row: Sequence[Any], row: Sequence[Any], ignore: int) -> bool:
+    for index, value in enumerate(row):
+        if index == ignore:
+            continue
+        sheet_value = sheet_row[index] if index < len(sheet_row) else ""
+        if not _same_cell(sheet_value, value):
+            return True
+    return False
+
+
+def sync_google_maps_records_to_worksheet(
+    worksheet: Any,
+    records: Iterable[dict[str, Any]],
+    fetched_at_utc: str | None = None,
+    chunk_rows: int = SHEETS_CHUNK_ROWS,
+    max_retries: int = SHEETS_MAX_RETRIES,
+    backoff_seconds: float = SHEETS_BACKOFF_SECONDS,
+) -> dict[str, int]:
+    """
+    Upsert records into a worksheet keyed on place_id. The sheet's values
+    are read once; known places are only rewritten when a cell other than
+    fetched_at_utc differs, with batch_update (consecutive rows merged into
+    one range), and new places are appended with append_rows, both in
+    chunks of chunk_rows. When the rows carry a lead_score the sheet is
+    then sorted on it, so appended leads don't end up below worse ones.
+    Records without a place_id can't be matched and are skipped.
+    """
+    key_index = GOOGLE_MAPS_COLUMNS.index("place_id")
+    fetched_index = GOOGLE_MAPS_COLUMNS.index("fetched_at_utc")
+    score_index = GOOGLE_MAPS_COLUMNS.index("lead_score")
+    last_column = _column_letter(len(GOOGLE_MAPS_COLUMNS))
+
+    def call(fn: Callable[[], Any]) -> Any:
+        return _with_backoff(fn, max_retries, backoff_seconds)
+
+    values = call(lambda: worksheet.get_all_values(value_render_option="UNFORMATTED_VALUE"))
+    header = list(values[0]) if values else []
+    if header != GOOGLE_MAPS_COLUMNS:
+        if header and header != GOOGLE_MAPS_COLUMNS[: len(header)]:
+            raise ValueError(
+                "worksheet header does not match GOOGLE_MAPS_COLUMNS; run a full export"
+            )
+        call(lambda: worksheet.update("A1", [GOOGLE_MAPS_COLUMNS]))
+
+    sheet_rows = {
+        str(row[key_index]): (number, row)
+        for number, row in enumerate(values[1:], start=2)
+        if len(row) > key_index and row[key_index]
+    }
+
+    updates: dict[int, Sequence[Any]] = {}
+    inserts: dict[str, Sequence[Any]] = {}
+    skipped = unchanged = 0
+    scored = False
+    for row in google_maps_rows(records, fetched_at_utc):
+        key = row[key_index]
+        if not key:
+            skipped += 1
+            continue
+        if key in sheet_rows:
+            number, sheet_row = sheet_rows[key]
+            if not _row_changed(sheet_row, row, fetched_index):
+                unchanged += 1
+                continue
+            updates[number] = row
+        else:
+            inserts[key] = row
+        scored = scored or row[score_index] != ""
+
+    runs = _row_ranges(sorted(updates))
+    batch: list[dict[str, Any]] = []
+    batch_rows = 0
+    for first, last in runs:
+        for chunk_start in range(first, last + 1, chunk_rows):
+            chunk_end = min(last, chunk_start + chunk_rows - 1)
+            batch.append(
+                {
+                    "range": f"A{chunk_start}:{last_column}{chunk_end}",
+                    "values": [updates[n] for n in range(chunk_start, chunk_end + 1)],
+                }
+            )
+            batch_rows += chunk_end - chunk_start + 1
+            if batch_rows >= chunk_rows:
+                pending, batch, batch_rows = batch, [], 0
+                call(lambda: worksheet.batch_update(pending, value_input_option="RAW"))
+    if batch:
+        call(lambda: worksheet.batch_update(batch, value_input_option="RAW"))
+
+    new_rows = list(inserts.values())
+    for i in range(0, len(new_rows), chunk_rows):
+        chunk = new_rows[i : i + chunk_rows]
+        call(lambda: worksheet.append_rows(chunk, value_input_option="RAW"))
+
+    if scored:
+        last_row = max(len(values), 1) + len(new_rows)
+        call(
+            lambda: worksheet.sort(
+                (score_index + 1, "des"), range=f"A2:{last_column}{last_row}"
+            )
+        )
+
+    return {
+        "updated": len(updates),
+        "inserted": len(new_rows),
+        "unchanged": unchanged,
+        "skipped": skipped,
+    }
+
+
+def _get_or_add_worksheet(spreadsheet: Any, worksheet_name: str, required_rows: int) -> Any:
+    import gspread
+
+    try:
+        return spreadsheet.worksheet(worksheet_name)
+    except gspread.WorksheetNotFound:
+        return spreadsheet.add_worksheet(
+            title=worksheet_name,
+            rows=str(required_rows),
+            cols=str(max(26, len(GOOGLE_MAPS_COLUMNS) + 2)),
+        )
+
+
 def export_google_maps_records_to_sheet(
-    records: list[dict[str, Any]],
+    records: Iterable[dict[str, Any]],
     spreadsheet_id: str,
     credentials_path: str,
     worksheet_name: str = "Google Maps Leads",
     clear_first: bool = True,
     fetched_at_utc: str | None = None,
+    incremental: bool = False,
 ) -> str:
+    """
+    Write records to a worksheet, creating it if needed. By default the tab
+    is cleared and rewritten; incremental=True upserts by place_id instead
+    (see sync_google_maps_records_to_worksheet).
+    """
     if not spreadsheet_id:
         raise ValueError("spreadsheet_id is required")
     if not credentials_path:
@@ -118,23 +372,20 @@ def export_google_maps_records_to_sheet(
 
     client = gspread.service_account(filename=credentials_path)
     spreadsheet = client.open_by_key(spreadsheet_id)
+    sheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
 
-    rows = build_google_maps_rows(records, fetched_at_utc=fetched_at_utc)
-    required_rows = max(1000, len(rows) + 10)
-    required_cols = max(26, len(GOOGLE_MAPS_COLUMNS) + 2)
-
-    try:
-        worksheet = spreadsheet.worksheet(worksheet_name)
-    except gspread.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(
-            title=worksheet_name,
-            rows=str(required_rows),
-            cols=str(required_cols),
+    if incremental:
+        worksheet = _get_or_add_worksheet(spreadsheet, worksheet_name, 1000)
+        sync_google_maps_records_to_worksheet(
+            worksheet, records, fetched_at_utc=fetched_at_utc
         )
+        return sheet_url
+
+    rows = build_google_maps_rows(records, fetched_at_utc=fetched_at_utc)
+    worksheet = _get_or_add_worksheet(spreadsheet, worksheet_name, max(1000, len(rows) + 10))
 
     if clear_first:
         worksheet.clear()
 
     worksheet.update("A1", rows)
-    return f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
-
+    return sheet_url
@@ -0,0 +1,203 @@
+"""Geo-aware lead dedupe and map tiling for Google Maps searches.
+
+GeoDedupeIndex treats two records as the same business when they share a
+place_id/data_id, or when they sit within max_distance_m of each other
+and have similar names (or the same phone number). Points are bucketed
+into a grid of max_distance_m cells, so each lookup only compares against
+the 3x3 neighbourhood and a whole metro dedupes in near-linear time.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from difflib import SequenceMatcher
+from typing import Any
+
+METERS_PER_DEGREE = 111_320.0
+DEFAULT_MAX_DISTANCE_M = 75.0
+DEFAULT_NAME_THRESHOLD = 0.8
+MIN_ZOOM, MAX_ZOOM = 3, 21
+VIEWPORT_PIXELS = 1000
+
+_NAME_NOISE = {"the", "llc", "inc", "co", "company", "corp", "ltd", "and", "of"}
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str | None) -> str:
+    text = (name or "").lower().replace("&", " and ").replace("'", "")
+    return " ".join(t for t in _NON_ALNUM.sub(" ", text).split() if t not in _NAME_NOISE)
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Similarity of two normalize_name() outputs in [0, 1]."""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    shared = len(tokens_a & tokens_b)
+    # "Sunrise Coffee" vs "Sunrise Coffee Roasters": one name contains the other.
+    if min(len(tokens_a), len(tokens_b)) >= 2 and shared == min(len(tokens_a), len(tokens_b)):
+        return 1.0
+    jaccard = shared / len(tokens_a | tokens_b)
+    return max(jaccard, SequenceMatcher(None, a, b).ratio())
+
+
+def _phone_digits(phone: Any) -> str:
+    digits = re.sub(r"\D", "", str(phone or ""))
+    return digits[-10:] if len(digits) >= 10 else ""
+
+
+def _coordinates(raw: dict[str, Any]) -> tuple[float, float] | None:
+    gps = raw.get("gps_coordinates")
+    if not isinstance(gps, dict):
+        return None
+    try:
+        return float(gps["latitude"]), float(gps["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class GeoDedupeIndex:
+    """Incremental duplicate detection over Google Maps records."""
+
+    def __init__(
+        self,
+        max_distance_m: float = DEFAULT_MAX_DISTANCE_M,
+        name_threshold: float = DEFAULT_NAME_THRESHOLD,
+    ) -> None:
+        self.max_distance_m = max_distance_m
+        self.name_threshold = name_threshold
+        self._ids: dict[str, str] = {}
+        self._cells: dict[tuple[int, int], list[tuple[float, float, str, str, str]]] = {}
+
+    @staticmethod
+    def identity_keys(record: dict[str, Any]) -> list[str]:
+        """Exact keys: place_id and data_id, else name + address."""
+        raw = record.get("raw_data") or {}
+        keys = [
+            f"{field}:{str(raw[field]).strip().lower()}"
+            for field in ("place_id", "data_id")
+            if raw.get(field)
+        ]
+        if not keys:
+            address = _NON_ALNUM.sub(" ", str(raw.get("address") or "").lower()).strip()
+            keys.append(f"name:{normalize_name(record.get('vendor_name'))}|{address}")
+        return keys
+
+    def _row(self, lat: float) -> int:
+        return math.floor(lat * METERS_PER_DEGREE / self.max_distance_m)
+
+    def _column(self, row: int, lon: float) -> int:
+        """
+        Longitude cell within a latitude row. Each row is scaled by cos() at
+        its poleward edge, so cells stay at least max_distance_m wide however
+        far apart the locations sharing one index are.
+        """
+        size = self.max_distance_m / METERS_PER_DEGREE
+        edge = min(max(abs(row * size), abs((row + 1) * size)), 90.0)
+        scale = max(math.cos(math.radians(edge)), 0.01)
+        return math.floor(lon * scale / size)
+
+    def _distance_m(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        scale = math.cos(math.radians((lat1 + lat2) / 2))
+        dx = (lon2 - lon1) * scale * METERS_PER_DEGREE
+        dy = (lat2 - lat1) * METERS_PER_DEGREE
+        return math.hypot(dx, dy)
+
+    def match_or_add(self, record: dict[str, Any]) -> str | None:
+        """
+        Key of the already-indexed business this record duplicates, or None
+        after adding it as a new business.
+        """
+        keys = self.identity_keys(record)
+        for key in keys:
+            if key in self._ids:
+                return self._ids[key]
+
+        raw = record.get("raw_data") or {}
+        point = _coordinates(raw)
+        name = normalize_name(record.get("vendor_name"))
+        phone = _phone_digits(raw.get("phone"))
+        if point is not None and self.max_distance_m > 0:
+            lat, lon = point
+            row = self._row(lat)
+            for dr in (-1, 0, 1):
+                col = self._column(row + dr, lon)
+                for dc in (-1, 0, 1):
+                    for other_lat, other_lon, other_name, other_phone, other_key in self._cells.get(
+                        (row + dr, col + dc), ()
+                    ):
+                        if self._distance_m(lat, lon, other_lat, other_lon) > self.max_distance_m:
+                            continue
+                        if (phone and phone == other_phone) or name_similarity(
+                            name, other_name
+                        ) >= self.name_threshold:
+                            for key in keys:
+                                self._ids[key] = other_key
+                            return other_key
+            self._cells.setdefault((row, self._column(row, lon)), []).append(
+                (lat, lon, name, phone, keys[0])
+            )
+
+        for key in keys:
+            self._ids[key] = keys[0]
+        return None
+
+    def __len__(self) -> int:
+        return len(set(self._ids.values()))
+
+
+def dedupe_records(
+    records: list[dict[str, Any]],
+    max_distance_m: float = DEFAULT_MAX_DISTANCE_M,
+    name_threshold: float = DEFAULT_NAME_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """First record of each business, in input order."""
+    index = GeoDedupeIndex(max_distance_m, name_threshold)
+    return [record for record in records if index.match_or_add(record) is None]
+
+
+def parse_bbox(value: str) -> tuple[float, float, float, float]:
+    """'south,west,north,east' in decimal degrees."""
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must be south,west,north,east")
+    south, west, north, east = parts
+    if south >= north or west >= east:
+        raise ValueError("bbox must have south < north and west < east")
+    return south, west, north, east
+
+
+def tile_zoom(lat: float, tile_km: float) -> int:
+    """Map zoom at which a ~1000px viewport spans tile_km at latitude lat."""
+    meters_per_pixel = tile_km * 1000 / VIEWPORT_PIXELS
+    zoom = math.log2(156_543.03 * math.cos(math.radians(lat)) / meters_per_pixel)
+    return max(MIN_ZOOM, min(MAX_ZOOM, round(zoom)))
+
+
+def grid_tiles(
+    bbox: tuple[float, float, float, float], tile_km: float
+) -> list[str]:
+    """
+    SerpApi ll values ("@lat,lon,zoomz") for tile centres covering bbox, so
+    each tile is searched separately and the per-search result cap applies
+    per tile instead of to the whole area.
+    """
+    if tile_km <= 0:
+        raise ValueError("tile_km must be positive")
+    south, west, north, east = bbox
+    mid_lat = (south + north) / 2
+    lat_step = tile_km * 1000 / METERS_PER_DEGREE
+    lon_step = lat_step / max(math.cos(math.radians(mid_lat)), 0.01)
+    rows = max(1, math.ceil((north - south) / lat_step))
+    cols = max(1, math.ceil((east - west) / lon_step))
+    zoom = tile_zoom(mid_lat, tile_km)
+    tiles = []
+    for r in range(rows):
+        lat = south + (r + 0.5) * (north - south) / rows
+        for c in range(cols):
+            lon = west + (c + 0.5) * (east - west) / cols
+            tiles.append(f"@{lat:.6f},{lon:.6f},{zoom}z")
+    return tiles
@@ -1,6 +1,6 @@
 """Leadgen ingest modules."""
 
-__all__ = ["GoogleMapsIngest"]
+__all__ = ["GoogleMapsIngest", "run_batch_ingest"]
 
 
 def __getattr__(name: str):
@@ -8,4 +8,8 @@ def __getattr__(name: str):
         from app.leadgen.ingest.google_maps import GoogleMapsIngest
 
         return GoogleMapsIngest
+    if name == "run_batch_ingest":
+        from app.leadgen.ingest.batch import run_batch_ingest
+
+        return run_batch_ingest
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,174 @@
+"""Batch Google Maps ingest over many query x location combos."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.leadgen.enrich.website import WebsiteEnricher
+from app.leadgen.export.sheets import export_google_maps_records_to_csv
+from app.leadgen.geo import DEFAULT_MAX_DISTANCE_M, GeoDedupeIndex
+from app.leadgen.ingest.google_maps import DEFAULT_OUTPUT_DIR, GoogleMapsIngest
+from app.leadgen.jsonl import write_jsonl
+from app.leadgen.rate_limit import AsyncRateLimiter
+from app.leadgen.seen_ids import slugify
+
+DEFAULT_CONCURRENCY = 5
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+
+def read_lines(path: str) -> list[str]:
+    """Non-empty lines of a text file, skipping # comments."""
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+
+
+def _write_niche_outputs(
+    niche: str, records: list[dict[str, Any]], output_dir: str, compress: bool = False
+) -> dict[str, str]:
+    niche_dir = Path(output_dir) / slugify(niche)
+    niche_dir.mkdir(parents=True, exist_ok=True)
+    raw_path = niche_dir / ("google_maps_raw.jsonl.gz" if compress else "google_maps_raw.jsonl")
+    write_jsonl(raw_path, records)
+    csv_path = export_google_maps_records_to_csv(
+        records, output_dir=str(niche_dir), compress=compress
+    )
+    return {"jsonl": str(raw_path), "csv": csv_path}
+
+
+async def run_batch_ingest(
+    queries: list[str],
+    locations: list[str],
+    api_key: str | None = None,
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    limit: int = 100,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    dedupe_across_runs: bool = True,
+    seen_ids_db: str | None = None,
+    use_bloom: bool = False,
+    use_cache: bool = True,
+    enrich: bool = False,
+    tiles: list[str] | None = None,
+    geo_dedupe_meters: float = DEFAULT_MAX_DISTANCE_M,
+    compress: bool = False,
+) -> dict[str, Any]:
+    """
+    Run every query x location job over a bounded pool sharing one httpx
+    client and rate limiter. Results are merged in job order with global
+    dedupe, so a place found by two jobs is kept once (first job wins),
+    including near-duplicates without matching IDs (GeoDedupeIndex), then
+    written per niche to output_dir/<niche>/. A failed job is
+    reported in "jobs" without stopping the rest, and the pages it fetched
+    before failing are still written. Cross-run seen IDs go to
+    one SQLite store (seen_ids_db), namespaced per query x location.
+    With enrich, merged records pass through WebsiteEnricher before output.
+    With tiles (SerpApi ll values, see geo.grid_tiles), every query x
+    location job is split into one search per map tile. compress gzips
+    the per-niche JSONL and CSV files.
+    """
+    queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+    locations = list(dict.fromkeys(loc.strip() for loc in locations if loc.strip()))
+    if not queries:
+        raise ValueError("at least one query is required")
+    if not locations:
+        raise ValueError("at least one location is required")
+
+    seen_db = seen_ids_db or str(Path(output_dir) / "seen_ids.db")
+    if seen_db.endswith(".json"):
+        raise ValueError("batch ingest needs a SQLite seen-ID store, not a .json file")
+    tile_list: list[str | None] = list(tiles) if tiles else [None]
+    jobs = [
+        (query, location, tile)
+        for query in queries
+        for location in locations
+        for tile in tile_list
+    ]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    limiter = AsyncRateLimiter(requests_per_second)
+
+    async with httpx.AsyncClient(
+        timeout=30.0, limits=httpx.Limits(max_connections=max(1, concurrency))
+    ) as client:
+
+        async def run_job(
+            query: str, location: str, tile: str | None
+        ) -> tuple[GoogleMapsIngest | None, list[dict[str, Any]], str | None]:
+            """(ingest, records, error); a failed job keeps its earlier pages."""
+            ingest = None
+            records: list[dict[str, Any]] = []
+            async with semaphore:
+                try:
+                    ingest = GoogleMapsIngest(
+                        query=query,
+                        location=location,
+                        api_key=api_key,
+                        output_dir=output_dir,
+                        limit=limit,
+                        dedupe_across_runs=dedupe_across_runs,
+                        seen_ids_path=seen_db,
+                        use_bloom=use_bloom,
+                        use_cache=use_cache,
+                        client=client,
+                        rate_limiter=limiter,
+                        ll=tile,
+                        geo_dedupe_meters=geo_dedupe_meters,
+                    )
+                    # Seen IDs are stored only after the outputs are written.
+                    async for record in ingest.stream(save=False):
+                        records.append(record)
+                except Exception as exc:
+                    return ingest, records, str(exc) or type(exc).__name__
+            return ingest, records, None
+
+        results = await asyncio.gather(
+            *(run_job(query, location, tile) for query, location, tile in jobs)
+        )
+
+    index = GeoDedupeIndex(max_distance_m=geo_dedupe_meters)
+    by_niche: dict[str, list[dict[str, Any]]] = {query: [] for query in queries}
+    job_reports = []
+    for (query, location, tile), (_, records, error) in zip(jobs, results):
+        kept = 0
+        for record in records:
+            if index.match_or_add(record) is not None:
+                continue
+            by_niche[query].append(record)
+            kept += 1
+        job_reports.append(
+            {
+                "query": query,
+                "location": location,
+                "tile": tile,
+                "fetched": len(records),
+                "kept": kept,
+                "error": error,
+            }
+        )
+
+    enrichment = None
+    if enrich:
+        enricher = WebsiteEnricher(use_cache=use_cache)
+        try:
+            await enricher.enrich([r for records in by_niche.values() for r in records])
+        finally:
+            enricher.close()
+        enrichment = enricher.stats
+
+    outputs = {
+        niche: _write_niche_outputs(niche, records, output_dir, compress)
+        for niche, records in by_niche.items()
+    }
+    for ingest, records, _ in results:
+        if ingest is not None and records:
+            ingest.mark_seen(records)
+    return {
+        "records": [record for records in by_niche.values() for record in records],
+        "by_niche": by_niche,
+        "outputs": outputs,
+        "jobs": job_reports,
+        "enrichment": enrichment,
+    }
@@ -6,15 +6,29 @@ import argparse
 import asyncio
 import json
 import os
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Iterable
 
 import httpx
 from dotenv import load_dotenv
 from app.leadgen.export.sheets import (
     export_google_maps_records_to_csv,
     export_google_maps_records_to_sheet,
+    export_google_maps_stream_to_csv,
 )
+from app.leadgen.enrich.website import WebsiteEnricher
+from app.leadgen.geo import DEFAULT_MAX_DISTANCE_M, GeoDedupeIndex, grid_tiles, parse_bbox
+from app.leadgen.jsonl import append_jsonl, read_jsonl, repair_jsonl, write_jsonl
+from app.leadgen.rate_limit import AsyncRateLimiter
+from app.leadgen.scoring import (
+    DEFAULT_MAX_DISTANCE_KM,
+    parse_centroid,
+    parse_weights,
+    rank_records,
+)
+from app.leadgen.seen_ids import SeenIdStore, open_seen_id_store, slugify
+from app.services.serpapi_cache import SerpApiCache, get_serpapi_json, resolve_cache
 
 SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
 DEFAULT_OUTPUT_DIR = "data/leadgen"
@@ -37,6 +51,16 @@ class GoogleMapsIngest:
         gl: str = "us",
         dedupe_across_runs: bool = True,
         seen_ids_path: str | None = None,
+        client: httpx.AsyncClient | None = None,
+        rate_limiter: AsyncRateLimiter | None = None,
+        seen_store: SeenIdStore | None = None,
+        use_bloom: bool = False,
+        compress: bool = False,
+        resume: bool = False,
+        cache: SerpApiCache | None = None,
+        use_cache: bool = True,
+        ll: str | None = None,
+        geo_dedupe_meters: float = DEFAULT_MAX_DISTANCE_M,
     ) -> None:
         self.query = query.strip()
         self.location = location.strip()
@@ -46,10 +70,23 @@ class GoogleMapsIngest:
         self.hl = hl
         self.gl = gl
         self.dedupe_across_runs = dedupe_across_runs
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.seen_store = seen_store
+        self.use_bloom = use_bloom
+        self.compress = compress
+        self.resume = resume
+        self.records_fetched = 0
+        self.cache = cache
+        self.use_cache = use_cache
+        self.ll = ll
+        self.geo_dedupe_meters = geo_dedupe_meters
         if seen_ids_path:
             self.seen_ids_path = Path(seen_ids_path)
         else:
-            self.seen_ids_path = Path(output_dir) / "google_maps_seen_ids.json"
+            self.seen_ids_path = Path(
+                os.getenv("LEADGEN_SEEN_IDS_DB") or Path(output_dir) / "seen_ids.db"
+            )
 
         if not self.query:
             raise ValueError("query is required")
@@ -58,26 +95,16 @@ class GoogleMapsIngest:
         if not self.api_key:
             raise ValueError("SERPAPI_API_KEY is required")
 
-    def _load_seen_ids(self) -> set[str]:
-        if not self.dedupe_across_runs:
-            return set()
-        if not self.seen_ids_path.exists():
-            return set()
-        try:
-            data = json.loads(self.seen_ids_path.read_text(encoding="utf-8"))
-            if not isinstance(data, list):
-                return set()
-            return {str(item).strip().lower() for item in data if str(item).strip()}
-        except Exception:
-            return set()
-
-    def _save_seen_ids(self, seen_ids: set[str]) -> None:
+    def _open_seen_store(self) -> SeenIdStore | None:
+        """The caller's store, else one for this niche+city namespace."""
         if not self.dedupe_across_runs:
-            return
-        self.seen_ids_path.parent.mkdir(parents=True, exist_ok=True)
-        self.seen_ids_path.write_text(
-            json.dumps(sorted(seen_ids), indent=2),
-            encoding="utf-8",
+            return None
+        if self.seen_store is not None:
+            return self.seen_store
+        return open_seen_id_store(
+            self.seen_ids_path,
+            namespace=slugify(self.query, self.location),
+            use_bloom=self.use_bloom,
         )
 
     async def _search_page(self, start: int) -> dict[str, Any]:
@@ -90,10 +117,22 @@ class GoogleMapsIngest:
             "start": start,
             "api_key": self.api_key,
         }
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(SERPAPI_SEARCH_URL, params=params)
-            response.raise_for_status()
-            return response.json()
+        if self.ll:
+            # Tile search: the map viewport replaces "in <location>".
+            params["q"] = self.query
+            params["ll"] = self.ll
+        cache = resolve_cache(self.cache, self.use_cache)
+        if cache is not None:
+            cached = cache.get(SERPAPI_SEARCH_URL, params)
+            if cached is not None:
+                return cached
+        # Only requests that reach SerpApi count against the rate limit.
+        if self.rate_limiter:
+            await self.rate_limiter.wait()
+        payload = await get_serpapi_json(SERPAPI_SEARCH_URL, params, client=self.client)
+        if cache is not None and not payload.get("error"):
+            cache.set(SERPAPI_SEARCH_URL, params, payload)
+        return payload
 
     @staticmethod
     def _extract_city_state(address: str | None) -> tuple[str | None, str]:
@@ -155,58 +194,190 @@ class GoogleMapsIngest:
             },
         }
 
-    def save_intermediate(self, records: list[dict[str, Any]]) -> str:
-        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
-        output_path = Path(self.output_dir) / "google_maps_raw.json"
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(records, f, indent=2)
-        return str(output_path)
-
-    async def fetch(self) -> list[dict[str, Any]]:
-        records: list[dict[str, Any]] = []
-        seen_ids: set[str] = self._load_seen_ids()
-        start = 0
-
-        while len(records) < self.limit:
-            payload = await self._search_page(start=start)
-            rows = payload.get("local_results", [])
-            if not rows:
-                break
-
-            added = 0
-            for row in rows:
-                record = self._map_result_to_record(row)
-                if not record:
-                    continue
-
-                raw = record["raw_data"]
-                dedupe_key = (
-                    str(raw.get("place_id") or raw.get("data_id") or record["vendor_name"])
-                    .strip()
-                    .lower()
-                )
-                if dedupe_key in seen_ids:
-                    continue
-                seen_ids.add(dedupe_key)
-                records.append(record)
-                added += 1
-                if len(records) >= self.limit:
+    @property
+    def output_path(self) -> Path:
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        return Path(self.output_dir) / f"google_maps_raw{suffix}"
+
+    @property
+    def state_path(self) -> Path:
+        return Path(self.output_dir) / "google_maps_raw.state.json"
+
+    def save_intermediate(self, records: Iterable[dict[str, Any]]) -> str:
+        """Append records to the JSON Lines output."""
+        append_jsonl(self.output_path, records)
+        return str(self.output_path)
+
+    def _write_state(self, next_start: int, records: int, done: bool) -> None:
+        self.state_path.write_text(
+            json.dumps(
+                {
+                    "query": self.query,
+                    "location": self.location,
+                    "output": self.output_path.name,
+                    "next_start": next_start,
+                    "records": records,
+                    "done": done,
+                }
+            ),
+            encoding="utf-8",
+        )
+
+    def _resume_point(self, index: GeoDedupeIndex) -> tuple[int, int] | None:
+        """
+        (next start, records saved) of an unfinished run of the same
+        query+location, with its saved records added to index.
+        """
+        if not self.resume or not self.state_path.exists():
+            return None
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if (
+            state.get("done")
+            or state.get("query") != self.query
+            or state.get("location") != self.location
+            or state.get("output") != self.output_path.name
+        ):
+            return None
+
+        saved = repair_jsonl(self.output_path)
+        for record in read_jsonl(self.output_path):
+            index.match_or_add(record)
+        next_start = int(state.get("next_start", 0))
+        if saved > int(state.get("records", 0)):
+            # The crash came after a page was written but before its state.
+            next_start += PAGE_SIZE
+        return next_start, saved
+
+    @staticmethod
+    def dedupe_key(record: dict[str, Any]) -> str:
+        """place_id or data_id, else normalized name + address (not name alone,
+        which would collapse every location of a chain)."""
+        raw = record.get("raw_data") or {}
+        place = raw.get("place_id") or raw.get("data_id")
+        if place:
+            return str(place).strip().lower()
+        return GeoDedupeIndex.identity_keys(record)[0]
+
+    async def stream(self, save: bool = True) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield new records page by page. With save, each page is appended to
+        output_path and its seen IDs stored before its records are yielded,
+        so a crash keeps every completed page and resume=True continues
+        from the next one. records_fetched counts this run's records,
+        including any resumed ones. Within a run, records are also deduped
+        by GeoDedupeIndex (nearby + similar name), which catches the same
+        business listed without IDs or under a slightly different name.
+
+        Without save nothing is written, including seen IDs: the caller
+        persists the records and then calls mark_seen, so a run that fails
+        before its output is written doesn't hide those places next time.
+        """
+        index = GeoDedupeIndex(max_distance_m=self.geo_dedupe_meters)
+        resumed = self._resume_point(index) if save else None
+        start, count = resumed or (0, 0)
+        if save and resumed is None:
+            write_jsonl(self.output_path, [])
+        self.records_fetched = count
+        store = self._open_seen_store()
+
+        try:
+            while count < self.limit:
+                payload = await self._search_page(start=start)
+                rows = payload.get("local_results", [])
+                if not rows:
                     break
 
-            if added == 0:
-                break
-            start += PAGE_SIZE
+                page = [r for r in map(self._map_result_to_record, rows) if r]
+                keys = [self.dedupe_key(record) for record in page]
+                known = store.seen_among(keys) if store is not None else set()
+
+                new_records: list[dict[str, Any]] = []
+                for record, dedupe_key in zip(page, keys):
+                    if dedupe_key in known or index.match_or_add(record) is not None:
+                        continue
+                    new_records.append(record)
+                    if count + len(new_records) >= self.limit:
+                        break
+
+                if not new_records:
+                    break
+                start += PAGE_SIZE
+                count += len(new_records)
+                self.records_fetched = count
 
-        self.save_intermediate(records)
-        self._save_seen_ids(seen_ids)
-        return records
+                if save:
+                    self.save_intermediate(new_records)
+                    self._write_state(start, count, done=False)
+                if save and store is not None:
+                    store.add_many(self.dedupe_key(record) for record in new_records)
+                    store.flush()
+                for record in new_records:
+                    yield record
+
+            if save:
+                self._write_state(start, count, done=True)
+        finally:
+            if store is not None and store is not self.seen_store:
+                store.close()
+
+    async def fetch(self, save: bool = True) -> list[dict[str, Any]]:
+        return [record async for record in self.stream(save=save)]
+
+    def mark_seen(self, records: Iterable[dict[str, Any]]) -> None:
+        """Store records' seen IDs once the caller has written them out."""
+        store = self._open_seen_store()
+        if store is None:
+            return
+        try:
+            store.add_many(self.dedupe_key(record) for record in records)
+            store.flush()
+        finally:
+            if store is not self.seen_store:
+                store.close()
 
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Google Maps lead ingest")
-    parser.add_argument("--query", required=True, help="Business query, e.g. 'coffee shops'")
-    parser.add_argument("--location", required=True, help="Location, e.g. 'Memphis, Tennessee'")
-    parser.add_argument("--limit", type=int, default=100, help="Max leads to collect")
+    parser.add_argument("--query", help="Business query, e.g. 'coffee shops'")
+    parser.add_argument("--location", help="Location, e.g. 'Memphis, Tennessee'")
+    parser.add_argument(
+        "--queries-file",
+        default=None,
+        help="Batch mode: file with one query per line (combined with every location)",
+    )
+    parser.add_argument(
+        "--locations-file",
+        default=None,
+        help="Batch mode: file with one location per line (combined with every query)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=5, help="Batch mode: jobs run at once"
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=5.0,
+        help="Batch mode: SerpApi request rate shared by all jobs",
+    )
+    parser.add_argument(
+        "--bbox",
+        default=None,
+        help="Tile mode: south,west,north,east; each tile is searched separately "
+        "to get past the per-search result cap",
+    )
+    parser.add_argument(
+        "--tile-km", type=float, default=2.0, help="Tile mode: tile width in km"
+    )
+    parser.add_argument(
+        "--geo-dedupe-meters",
+        type=float,
+        default=DEFAULT_MAX_DISTANCE_M,
+        help="Treat similarly named places this close together as one lead (0 disables)",
+    )
+    parser.add_argument("--limit", type=int, default=100, help="Max leads to collect (per tile in tile mode)")
     parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Output directory")
     parser.add_argument(
         "--no-cross-run-dedupe",
@@ -216,13 +387,65 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--seen-ids-path",
         default=None,
-        help="Optional path to persisted dedupe IDs JSON file",
+        help="Seen-ID store: SQLite file (default output-dir/seen_ids.db) or legacy .json list",
+    )
+    parser.add_argument(
+        "--bloom",
+        action="store_true",
+        help="Prefilter seen-ID lookups with an in-memory Bloom filter",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Write the raw JSON Lines and CSV outputs gzip-compressed",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run of the same query and location",
+    )
+    parser.add_argument(
+        "--enrich",
+        action="store_true",
+        help="Fetch each lead's website for emails, social links and tech hints",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the SerpApi response cache (LEADGEN_CACHE_DB_PATH)",
+    )
+    parser.add_argument(
+        "--save-db",
+        action="store_true",
+        help="Upsert leads into the leads table (DATABASE_URL) and export Sheets from it",
     )
     parser.add_argument(
         "--to-sheets",
         action="store_true",
         help="Export fetched results to Google Sheets",
     )
+    parser.add_argument(
+        "--sheets-incremental",
+        action="store_true",
+        help="Upsert rows by place_id instead of clearing and rewriting the worksheet",
+    )
+    parser.add_argument(
+        "--score-weights",
+        default="",
+        help="Sheets rows are sorted by lead score; override feature weights, "
+        "e.g. 'rating=0.5,reviews=0.3,website=-0.2,category=0.1,distance=0.1'",
+    )
+    parser.add_argument(
+        "--score-centroid",
+        default=None,
+        help="lat,lng the distance score is measured from (default: median of the leads)",
+    )
+    parser.add_argument(
+        "--score-max-km",
+        type=float,
+        default=DEFAULT_MAX_DISTANCE_KM,
+        help="Distance at which the distance score reaches 0",
+    )
     parser.add_argument(
         "--worksheet-name",
         default="Google Maps Leads",
@@ -241,11 +464,160 @@ def _parse_args() -> argparse.Namespace:
         ),
         help="Service account JSON path (or set LEADGEN_SHEETS_CREDENTIALS_PATH)",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not (args.query or args.queries_file):
+        parser.error("--query or --queries-file is required")
+    if not (args.location or args.locations_file):
+        parser.error("--location or --locations-file is required")
+    if args.bbox:
+        try:
+            args.tiles = grid_tiles(parse_bbox(args.bbox), args.tile_km)
+        except ValueError as exc:
+            parser.error(f"--bbox: {exc}")
+    else:
+        args.tiles = None
+    try:
+        args.score_weights = parse_weights(args.score_weights)
+        if args.score_centroid:
+            args.score_centroid = parse_centroid(args.score_centroid)
+    except ValueError as exc:
+        parser.error(f"scoring: {exc}")
+    if (
+        args.sheets_incremental
+        and not args.save_db
+        and args.score_weights.get("distance")
+        and not args.score_centroid
+    ):
+        # Without the leads table only this run's records are scored, and
+        # their median would move the centroid the sheet is sorted by
+        parser.error("--sheets-incremental without --save-db needs --score-centroid")
+    return args
+
+
+def _rank(args: argparse.Namespace, records: list[dict[str, Any]], niche: str) -> list[dict[str, Any]]:
+    return rank_records(
+        records,
+        weights=args.score_weights,
+        category=niche,
+        centroid=args.score_centroid,
+        max_distance_km=args.score_max_km,
+    )
+
+
+def _stored_sheet_records(
+    args: argparse.Namespace, niche: str, saved_at: datetime
+) -> list[dict[str, Any]]:
+    """
+    Every stored lead of a niche, ranked together so each lead_score uses
+    the same centroid. With --sheets-incremental only the leads changed
+    since saved_at are returned, still in score order.
+    """
+    ranked = _rank(args, _lead_records(niche, None), niche)
+    if not args.sheets_incremental:
+        return ranked
+    changed = {GoogleMapsIngest.dedupe_key(record) for record in _lead_records(niche, saved_at)}
+    return [record for record in ranked if GoogleMapsIngest.dedupe_key(record) in changed]
+
+
+def _print_cache_stats(use_cache: bool) -> None:
+    cache = resolve_cache(use_cache=use_cache)
+    if cache is not None:
+        print(f"SerpApi cache: {cache.format_stats()}")
+
+
+def _save_leads(records: list[dict[str, Any]]) -> datetime:
+    """
+    Upsert records into the leads table, logging one ingest run per
+    query x location. Returns when saving started, for _lead_records.
+    """
+    from app.database import SessionLocal, init_db
+    from app.services import lead_service
+
+    init_db()
+    started = datetime.utcnow()
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for record in records:
+        raw = record.get("raw_data") or {}
+        groups.setdefault((raw.get("query") or "", raw.get("location") or ""), []).append(record)
+    db = SessionLocal()
+    try:
+        for (query, location), group in groups.items():
+            _, stats = lead_service.record_ingest(db, query, location, group)
+            print(
+                f"Saved leads for {query} | {location}: {stats['new']} new, "
+                f"{stats['updated']} updated, {stats['unchanged']} unchanged"
+            )
+        db.commit()
+    finally:
+        db.close()
+    return started
+
+
+def _lead_records(niche: str, updated_since: datetime | None) -> list[dict[str, Any]]:
+    """Every stored lead of a niche, or only those changed since a time."""
+    from app.database import SessionLocal
+    from app.services import lead_service
+
+    db = SessionLocal()
+    try:
+        return lead_service.get_lead_records(db, niche=niche, updated_since=updated_since)
+    finally:
+        db.close()
+
+
+async def _batch_main(args: argparse.Namespace) -> None:
+    from app.leadgen.ingest.batch import read_lines, run_batch_ingest
+
+    queries = read_lines(args.queries_file) if args.queries_file else [args.query]
+    locations = read_lines(args.locations_file) if args.locations_file else [args.location]
+    result = await run_batch_ingest(
+        queries=queries,
+        locations=locations,
+        output_dir=args.output_dir,
+        limit=args.limit,
+        concurrency=args.concurrency,
+        requests_per_second=args.requests_per_second,
+        dedupe_across_runs=not args.no_cross_run_dedupe,
+        seen_ids_db=args.seen_ids_path,
+        use_bloom=args.bloom,
+        use_cache=not args.no_cache,
+        enrich=args.enrich,
+        tiles=args.tiles,
+        geo_dedupe_meters=args.geo_dedupe_meters,
+        compress=args.gzip,
+    )
+    for job in result["jobs"]:
+        if job["error"]:
+            tile = f" @ {job['tile']}" if job["tile"] else ""
+            print(f"FAILED {job['query']} | {job['location']}{tile}: {job['error']}")
+    print(
+        f"Fetched {len(result['records'])} Google Maps leads "
+        f"from {len(result['jobs'])} search jobs"
+    )
+    _print_cache_stats(not args.no_cache)
+    saved_at = _save_leads(result["records"]) if args.save_db else None
+    for niche, paths in result["outputs"].items():
+        print(f"{niche}: {len(result['by_niche'][niche])} leads -> {paths['csv']}")
+        if args.to_sheets:
+            if saved_at is not None:
+                niche_records = _stored_sheet_records(args, niche, saved_at)
+            else:
+                niche_records = _rank(args, result["by_niche"][niche], niche)
+            sheet_url = export_google_maps_records_to_sheet(
+                records=niche_records,
+                spreadsheet_id=args.sheets_spreadsheet_id,
+                credentials_path=args.sheets_credentials_path,
+                worksheet_name=niche.title(),
+                incremental=args.sheets_incremental,
+            )
+            print(f"Exported to Google Sheets: {sheet_url}")
 
 
 async def _main() -> None:
     args = _parse_args()
+    if args.queries_file or args.locations_file or args.tiles:
+        await _batch_main(args)
+        return
     ingest = GoogleMapsIngest(
         query=args.query,
         location=args.location,
@@ -253,20 +625,55 @@ async def _main() -> None:
         output_dir=args.output_dir,
         dedupe_across_runs=not args.no_cross_run_dedupe,
         seen_ids_path=args.seen_ids_path,
+        use_bloom=args.bloom,
+        compress=args.gzip,
+        resume=args.resume,
+        use_cache=not args.no_cache,
+        geo_dedupe_meters=args.geo_dedupe_meters,
     )
-    records = await ingest.fetch()
-    print(f"Fetched {len(records)} Google Maps leads")
-    print(f"Saved to {Path(args.output_dir) / 'google_maps_raw.json'}")
-
-    csv_path = export_google_maps_records_to_csv(records, output_dir=args.output_dir)
+    records: list[dict[str, Any]] | None = None
+    if args.resume or args.enrich:
+        # The CSV must also cover records saved before an interruption,
+        # and enrichment needs every lead before export.
+        async for _ in ingest.stream():
+            pass
+        records = list(read_jsonl(ingest.output_path))
+        if args.enrich:
+            enricher = WebsiteEnricher(use_cache=not args.no_cache)
+            try:
+                await enricher.enrich(records)
+            finally:
+                enricher.close()
+            print(f"Enriched {enricher.format_stats()}")
+        csv_path = export_google_maps_records_to_csv(
+            records, output_dir=args.output_dir, compress=args.gzip
+        )
+    else:
+        csv_path = await export_google_maps_stream_to_csv(
+            ingest.stream(), output_dir=args.output_dir, compress=args.gzip
+        )
+    print(f"Fetched {ingest.records_fetched} Google Maps leads")
+    print(f"Saved to {ingest.output_path}")
     print(f"Saved CSV to {csv_path}")
+    _print_cache_stats(not args.no_cache)
 
+    if (args.to_sheets or args.save_db) and records is None:
+        records = list(read_jsonl(ingest.output_path))
+    if args.save_db:
+        saved_at = _save_leads(records)
+        if args.to_sheets:
+            # The table also holds leads from earlier runs, which cross-run
+            # dedupe keeps out of this run's records.
+            records = _stored_sheet_records(args, ingest.query, saved_at)
+    elif args.to_sheets:
+        records = _rank(args, records, ingest.query)
     if args.to_sheets:
         sheet_url = export_google_maps_records_to_sheet(
             records=records,
             spreadsheet_id=args.sheets_spreadsheet_id,
             credentials_path=args.sheets_credentials_path,
             worksheet_name=args.worksheet_name,
+            incremental=args.sheets_incremental,
         )
         print(f"Exported to Google Sheets: {sheet_url}")
 
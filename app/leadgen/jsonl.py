@@ -0,0 +1,86 @@
+"""JSON Lines files for leadgen records (plain or .gz)."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.name.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def append_jsonl(path: str | Path, records: Iterable[dict[str, Any]]) -> int:
+    """
+    Append records and close the file, so every call is durable on its
+    own. For .gz each call adds a complete gzip member.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with _open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def write_jsonl(path: str | Path, records: Iterable[dict[str, Any]]) -> int:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return append_jsonl(path, records)
+
+
+def _scan(path: Path) -> Iterator[tuple[dict[str, Any] | None, bool]]:
+    """(record, True) per valid line, then (None, False) if the tail is torn."""
+    try:
+        with _open(path, "r") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    yield None, False
+                    return
+                try:
+                    yield json.loads(line), True
+                except ValueError:
+                    yield None, False
+                    return
+    except (EOFError, OSError, zlib.error):
+        yield None, False
+
+
+def read_jsonl(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Stream records, stopping quietly at a torn last write."""
+    path = Path(path)
+    if not path.exists():
+        return
+    for record, ok in _scan(path):
+        if not ok:
+            return
+        yield record
+
+
+def repair_jsonl(path: str | Path) -> int:
+    """
+    Drop a torn tail left by a crash mid-write so appends stay readable.
+    Returns the number of valid records kept.
+    """
+    path = Path(path)
+    if not path.exists():
+        return 0
+    count = 0
+    for _, ok in _scan(path):
+        if not ok:
+            tmp = path.with_name("tmp-" + path.name)
+            kept = write_jsonl(tmp, read_jsonl(path))
+            os.replace(tmp, path)
+            return kept
+        count += 1
+    return count
@@ -0,0 +1,183 @@
+"""Lead scoring over normalize_google_maps_record() rows.
+
+Features are pulled out of the rows once into numpy arrays, so scoring is
+a handful of vector operations no matter how many leads there are. Each
+feature is scaled to [0, 1]:
+
+- rating: (rating - 1) / 4
+- reviews: log1p(reviews) / log1p(review_cap), capped at 1
+- website: 1 when the lead lists a website
+- category: 1 when the category contains one of the category terms
+- distance: 1 at the centroid, falling linearly to 0 at max_distance_km
+
+The score is the weighted sum divided by the sum of absolute weights.
+Negative weights favour the opposite, e.g. website=-1 ranks leads
+without a site first.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from app.leadgen.export.sheets import GOOGLE_MAPS_COLUMNS, google_maps_row
+
+FEATURES = ("rating", "reviews", "website", "category", "distance")
+DEFAULT_WEIGHTS = {
+    "rating": 0.35,
+    "reviews": 0.25,
+    "website": 0.15,
+    "category": 0.15,
+    "distance": 0.10,
+}
+DEFAULT_REVIEW_CAP = 500
+DEFAULT_MAX_DISTANCE_KM = 25.0
+EARTH_RADIUS_KM = 6371.0
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def parse_weights(spec: str) -> dict[str, float]:
+    """'rating=2,website=-1' -> DEFAULT_WEIGHTS with those features replaced."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, sep, value = part.partition("=")
+        name = name.strip()
+        if not sep or name not in FEATURES:
+            raise ValueError(f"expected feature=weight with feature in {', '.join(FEATURES)}")
+        weights[name] = float(value)
+    return weights
+
+
+def parse_centroid(value: str) -> tuple[float, float]:
+    """'lat,lng' in decimal degrees."""
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 2:
+        raise ValueError("centroid must be lat,lng")
+    return parts[0], parts[1]
+
+
+def category_terms(text: str) -> list[str]:
+    """Match terms for a query: 'coffee shops' -> ['coffee', 'shop']."""
+    return [
+        word[:-1] if len(word) > 3 and word.endswith("s") else word
+        for word in _WORD.findall(text.lower())
+    ]
+
+
+def _floats(values: Iterable[Any]) -> np.ndarray:
+    return np.array(
+        [value if isinstance(value, (int, float)) else np.nan for value in values],
+        dtype=np.float64,
+    )
+
+
+def _category_matches(categories: list[str], terms: Sequence[str]) -> np.ndarray:
+    if not terms:
+        return np.zeros(len(categories))
+    # Categories repeat heavily ("Coffee shop"), so match each distinct one once.
+    unique, inverse = np.unique(np.array(categories, dtype=str), return_inverse=True)
+    hits = np.array(
+        [any(term in category.lower() for term in terms) for category in unique], dtype=np.float64
+    )
+    return hits[inverse] if len(unique) else np.zeros(len(categories))
+
+
+def lead_features(
+    rows: Sequence[dict[str, Any]],
+    terms: Sequence[str] = (),
+    centroid: tuple[float, float] | None = None,
+    max_distance_km: float = DEFAULT_MAX_DISTANCE_KM,
+    review_cap: int = DEFAULT_REVIEW_CAP,
+) -> dict[str, np.ndarray]:
+    """
+    Feature arrays (one value per row, in [0, 1]) for normalized rows.
+    Missing values score 0. Without a centroid, the median coordinate of
+    the rows is used.
+    """
+    rating = _floats(row["rating"] for row in rows)
+    reviews = _floats(row["reviews"] for row in rows)
+    latitude = _floats(row["latitude"] for row in rows)
+    longitude = _floats(row["longitude"] for row in rows)
+
+    features = {
+        "rating": np.clip((np.nan_to_num(rating, nan=1.0) - 1.0) / 4.0, 0.0, 1.0),
+        "reviews": np.minimum(
+            np.log1p(np.nan_to_num(reviews, nan=0.0)) / np.log1p(review_cap), 1.0
+        ),
+        "website": np.array([bool(row["website"]) for row in rows], dtype=np.float64),
+        "category": _category_matches([row["category"] for row in rows], terms),
+    }
+
+    has_point = ~(np.isnan(latitude) | np.isnan(longitude))
+    if centroid is None and has_point.any():
+        centroid = (
+            float(np.median(latitude[has_point])),
+            float(np.median(longitude[has_point])),
+        )
+    if centroid is None:
+        features["distance"] = np.zeros(len(rows))
+    else:
+        lat1, lon1 = np.radians(centroid[0]), np.radians(centroid[1])
+        lat2, lon2 = np.radians(latitude), np.radians(longitude)
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        )
+        km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+        features["distance"] = np.nan_to_num(
+            np.clip(1.0 - km / max_distance_km, 0.0, 1.0), nan=0.0
+        )
+    return features
+
+
+def score_leads(
+    rows: Sequence[dict[str, Any]],
+    weights: dict[str, float] | None = None,
+    **feature_options: Any,
+) -> np.ndarray:
+    """Score per normalized row; feature_options go to lead_features."""
+    weights = weights or DEFAULT_WEIGHTS
+    unknown = set(weights) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"unknown score features: {', '.join(sorted(unknown))}")
+    total = sum(abs(weight) for weight in weights.values())
+    if not rows or not total:
+        return np.zeros(len(rows))
+    features = lead_features(rows, **feature_options)
+    scores = np.zeros(len(rows))
+    for name, weight in weights.items():
+        if weight:
+            scores += weight * features[name]
+    return scores / total
+
+
+def rank_records(
+    records: Iterable[dict[str, Any]],
+    weights: dict[str, float] | None = None,
+    category: str | None = None,
+    centroid: tuple[float, float] | None = None,
+    max_distance_km: float = DEFAULT_MAX_DISTANCE_KM,
+) -> list[dict[str, Any]]:
+    """
+    Records sorted best first, each with record["lead_score"] set. category
+    is the text to match categories against (usually the search query);
+    ties keep their input order.
+    """
+    records = list(records)
+    rows = [dict(zip(GOOGLE_MAPS_COLUMNS, google_maps_row(record, ""))) for record in records]
+    scores = score_leads(
+        rows,
+        weights,
+        terms=category_terms(category or ""),
+        centroid=centroid,
+        max_distance_km=max_distance_km,
+    )
+    for record, score in zip(records, scores):
+        record["lead_score"] = round(float(score), 4)
+    order = np.argsort(-scores, kind="stable")
+    return [records[i] for i in order]
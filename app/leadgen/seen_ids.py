@@ -0,0 +1,252 @@
+"""Seen-ID stores for cross-run Google Maps dedupe.
+
+SqliteSeenIdStore is the default: one indexed table keyed by
+(namespace, key), where the namespace is the niche+city slug. Lookups are
+batched per page, inserts are buffered and written in one transaction,
+and WAL mode lets concurrent runs share the file. JsonSeenIdStore keeps
+the original one-list-per-file format for explicit .json paths.
+
+Migrate the legacy files with:
+python -m app.leadgen.seen_ids --json-dir data/leadgen/seen_ids
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable
+
+DEFAULT_JSON_DIR = "data/leadgen/seen_ids"
+DEFAULT_DB_PATH = "data/leadgen/seen_ids.db"
+INSERT_BATCH_SIZE = 1000
+LOOKUP_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_ids (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    first_seen_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+
+def slugify(*parts: str) -> str:
+    """Same naming as data/leadgen/seen_ids/{niche}_{city}.json."""
+    return "_".join(part.strip() for part in parts).lower().replace(" ", "_")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenIdStore(ABC):
+    """Interface: which keys were seen before, and record new ones."""
+
+    @abstractmethod
+    def seen_among(self, keys: Iterable[str]) -> set[str]:
+        ...
+
+    @abstractmethod
+    def add_many(self, keys: Iterable[str]) -> None:
+        ...
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class JsonSeenIdStore(SeenIdStore):
+    """Legacy format: the whole history as one sorted JSON list."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.ids = self._load()
+        self._dirty = False
+
+    def _load(self) -> set[str]:
+        if not self.path.exists():
+            return set()
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return set()
+        if not isinstance(data, list):
+            return set()
+        return {str(item).strip().lower() for item in data if str(item).strip()}
+
+    def seen_among(self, keys: Iterable[str]) -> set[str]:
+        return self.ids.intersection(keys)
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        before = len(self.ids)
+        self.ids.update(keys)
+        self._dirty = self._dirty or len(self.ids) != before
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(sorted(self.ids), indent=2), encoding="utf-8")
+        self._dirty = False
+
+
+class SqliteSeenIdStore(SeenIdStore):
+    """
+    Seen IDs for one namespace in a shared SQLite file. With use_bloom the
+    namespace's keys are loaded into a Bloom filter once, so keys that were
+    never seen (most of a fresh page) skip the database entirely.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = DEFAULT_DB_PATH,
+        namespace: str = "default",
+        use_bloom: bool = False,
+        bloom_error_rate: float = 0.001,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.namespace = namespace
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+        self._pending: set[str] = set()
+        self.bloom: BloomFilter | None = None
+        if use_bloom:
+            self._load_bloom(bloom_error_rate)
+
+    def _load_bloom(self, error_rate: float) -> None:
+        count = self.conn.execute(
+            "SELECT COUNT(*) FROM seen_ids WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        self.bloom = BloomFilter(max(10_000, count * 2), error_rate)
+        cursor = self.conn.execute(
+            "SELECT key FROM seen_ids WHERE namespace = ?", (self.namespace,)
+        )
+        for (key,) in cursor:
+            self.bloom.add(key)
+
+    def __len__(self) -> int:
+        self.flush()
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM seen_ids WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+    def seen_among(self, keys: Iterable[str]) -> set[str]:
+        keys = set(keys)
+        found = keys & self._pending
+        candidates = list(keys - found)
+        if self.bloom is not None:
+            candidates = [key for key in candidates if key in self.bloom]
+        for i in range(0, len(candidates), LOOKUP_BATCH_SIZE):
+            chunk = candidates[i : i + LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key FROM seen_ids WHERE namespace = ? AND key IN ({placeholders})",
+                (self.namespace, *chunk),
+            )
+            found.update(key for (key,) in rows)
+        return found
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._pending.add(key)
+            if self.bloom is not None:
+                self.bloom.add(key)
+        if len(self._pending) >= INSERT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        rows = [(self.namespace, key) for key in self._pending]
+        with self.conn:
+            for i in range(0, len(rows), INSERT_BATCH_SIZE):
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen_ids (namespace, key) VALUES (?, ?)",
+                    rows[i : i + INSERT_BATCH_SIZE],
+                )
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+
+def open_seen_id_store(
+    path: str | Path, namespace: str, use_bloom: bool = False
+) -> SeenIdStore:
+    """JSON store for .json paths (legacy), SQLite store for anything else."""
+    if str(path).endswith(".json"):
+        return JsonSeenIdStore(path)
+    return SqliteSeenIdStore(path, namespace=namespace, use_bloom=use_bloom)
+
+
+def migrate_json_seen_ids(
+    json_dir: str | Path = DEFAULT_JSON_DIR, db_path: str | Path = DEFAULT_DB_PATH
+) -> dict[str, int]:
+    """
+    Import every {namespace}.json list in json_dir into the SQLite store.
+    Safe to rerun; the JSON files are left in place.
+    """
+    counts: dict[str, int] = {}
+    for path in sorted(Path(json_dir).glob("*.json")):
+        ids = JsonSeenIdStore(path).ids
+        store = SqliteSeenIdStore(db_path, namespace=path.stem)
+        try:
+            store.add_many(ids)
+            store.flush()
+            counts[path.stem] = len(store)
+        finally:
+            store.close()
+    return counts
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Migrate legacy JSON seen-ID files into the SQLite store"
+    )
+    parser.add_argument("--json-dir", default=DEFAULT_JSON_DIR, help="Directory of *.json lists")
+    parser.add_argument("--db-path", default=DEFAULT_DB_PATH, help="SQLite seen-ID store")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    counts = migrate_json_seen_ids(args.json_dir, args.db_path)
+    for namespace, count in counts.items():
+        print(f"{namespace}: {count} IDs")
+    print(f"Migrated {len(counts)} namespaces into {args.db_path}")
+
+
+if __name__ == "__main__":
+    main()
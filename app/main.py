@@ -10,6 +10,7 @@ from fastapi import FastAPI
 from app.agents.orchestrator import orchestrator_agent
 from app.database import init_db
 from app.scheduler.scrape_job import start_scheduler
+from app.api.analytics import router as analytics_router
 from app.api.listings import router as listings_router
 
 
@@ -17,7 +18,9 @@ async def main():
     print("🤖 Agent System Initialized. Type 'exit' to quit.")
 
     init_db()
-    start_scheduler()
+    # Set EMBEDDED_SCHEDULER=false when scraping runs in `python -m app.scheduler.worker`
+    if os.getenv("EMBEDDED_SCHEDULER", "true").strip().lower() not in {"0", "false", "no", "off"}:
+        start_scheduler()
 
     context = None
 
@@ -48,3 +51,4 @@ if __name__ == "__main__":
 
 app = FastAPI(title="BizBuySell Listings API")
 app.include_router(listings_router)
+app.include_router(analytics_router)
@@ -7,9 +7,11 @@ import secrets
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlencode, urljoin, urlparse, urlunparse
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, Tag
 import httpx
 
+from app.parsers.financials import parse_money
+
 
 BIZBUYSELL_BASE_URL = "https://www.bizbuysell.com"
 RETIREMENT_KEYWORDS = [
@@ -158,10 +160,24 @@ class BizBuySellParser:
         self, html: str, base_url: Optional[str] = None
     ) -> List[Dict]:
         """Parse BizBuySell search results page."""
-        if base_url is None:
-            base_url = self.base_url
-
         soup = BeautifulSoup(html, "html.parser")
+        return self._parse_search_soup(soup, base_url or self.base_url)
+
+    def parse_search_page(
+        self, html: str, current_url: str, base_url: Optional[str] = None
+    ) -> Dict:
+        """
+        Parse listings and the next page URL from one search page.
+        Builds the soup once and returns only plain dicts/strings, so the
+        result is cheap to pickle back from a parse process pool.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        return {
+            "listings": self._parse_search_soup(soup, base_url or self.base_url),
+            "next_url": self._find_next_page_url_in_soup(soup, current_url),
+        }
+
+    def _parse_search_soup(self, soup: BeautifulSoup, base_url: str) -> List[Dict]:
         listings: List[Dict] = []
 
         listing_selectors = ["a.diamond", "a.showcase", "a.basic"]
@@ -212,13 +228,16 @@ class BizBuySellParser:
             soup, [".location", ".location-title", "#location", ".cityState"]
         )
 
+        label_index = _LabelIndex(soup)
         reason_for_selling = _extract_labeled_value(
-            soup, ["Reason for Selling", "Reason for sale", "Reason for Selling?"]
+            soup,
+            ["Reason for Selling", "Reason for sale", "Reason for Selling?"],
+            index=label_index,
         )
         if not reason_for_selling:
             reason_for_selling = json_reason
 
-        kv_pairs = _extract_key_value_pairs(soup)
+        kv_pairs = _extract_key_value_pairs(soup, index=label_index)
         financial_details = kv_pairs or None
 
         years_in_business = _find_kv_value(
@@ -251,6 +270,11 @@ class BizBuySellParser:
     def find_next_page_url(self, html: str, current_url: str) -> Optional[str]:
         """Detect the next page URL from pagination controls."""
         soup = BeautifulSoup(html, "html.parser")
+        return self._find_next_page_url_in_soup(soup, current_url)
+
+    def _find_next_page_url_in_soup(
+        self, soup: BeautifulSoup, current_url: str
+    ) -> Optional[str]:
         next_link = (
             soup.select_one("a[rel='next']")
             or soup.select_one("a.next")
@@ -262,7 +286,7 @@ class BizBuySellParser:
             if isinstance(next_href, list):
                 next_href = next_href[0] if next_href else ""
             if next_href:
-                return urljoin(self.base_url, next_href)
+                return urljoin(self.base_url, str(next_href))
 
         parsed = urlparse(current_url)
         query = parse_qs(parsed.query)
@@ -390,27 +414,7 @@ class BizBuySellParser:
 
     def _parse_price(self, price_text: str) -> Optional[int]:
         """Parse price string to integer."""
-        if not price_text:
-            return None
-
-        price_text = price_text.strip()
-        if "million" in price_text.lower():
-            match = re.search(r"[\d.]+", price_text)
-            if match:
-                return int(float(match.group()) * 1_000_000)
-
-        if "k" in price_text.lower():
-            match = re.search(r"[\d.]+", price_text)
-            if match:
-                return int(float(match.group()) * 1_000)
-
-        cleaned = re.sub(r"[^\d.]", "", price_text)
-        if cleaned:
-            try:
-                return int(float(cleaned))
-            except ValueError:
-                return None
-        return None
+        return parse_money(price_text)
 
     def _parse_location(self, location_text: str) -> Tuple[str, str]:
         """Parse location string into city and state."""
@@ -563,43 +567,92 @@ def _extract_text_from_candidates(
     return None
 
 
-def _extract_labeled_value(soup: BeautifulSoup, labels: List[str]) -> Optional[str]:
-    for label in labels:
-        label_elements = soup.find_all(text=re.compile(re.escape(label), re.I))
-        for element in label_elements:
-            parent = element.parent
-            if not parent:
-                continue
-            value = parent.find_next_sibling()
-            if value:
-                text = value.get_text(" ", strip=True)
-                if text:
-                    return text
-    return None
+class _LabelIndex:
+    """
+    Text nodes and key/value containers of a document, collected in one walk.
+    Replaces a regex find_all over the whole tree per label; lookups return
+    exactly what those scans returned.
+    """
+
+    def __init__(self, soup: BeautifulSoup):
+        self.text_nodes: List[Tuple[str, Any]] = []
+        self.detail_rows: List[Tag] = []
+        self.definition_lists: List[Tag] = []
+        self._values: Dict[int, Optional[str]] = {}
+        self._pairs: Optional[Dict[str, str]] = None
+
+        for node in soup.descendants:
+            if isinstance(node, NavigableString):
+                self.text_nodes.append((str(node).lower(), node))
+            elif isinstance(node, Tag):
+                if node.name == "dl":
+                    self.definition_lists.append(node)
+                elif "row" in (node.get("class") or []) and node.find_parent(
+                    class_="listing-details"
+                ):
+                    self.detail_rows.append(node)
+
+    def labeled_value(self, labels: List[str]) -> Optional[str]:
+        """Text of the element after the first node containing a label."""
+        for label in labels:
+            needle = label.lower()
+            for text, node in self.text_nodes:
+                if needle not in text:
+                    continue
+                value = self._value_after(node)
+                if value:
+                    return value
+        return None
+
+    def _value_after(self, node: Any) -> Optional[str]:
+        key = id(node)
+        if key not in self._values:
+            text = None
+            parent = node.parent
+            if parent:
+                value = parent.find_next_sibling()
+                if value:
+                    text = value.get_text(" ", strip=True) or None
+            self._values[key] = text
+        return self._values[key]
+
+    def key_value_pairs(self) -> Dict[str, str]:
+        if self._pairs is not None:
+            return dict(self._pairs)
+
+        pairs: Dict[str, str] = {}
+        for row in self.detail_rows:
+            label = row.select_one(".label, .detail-label")
+            value = row.select_one(".value, .detail-value")
+            if label and value:
+                key = label.get_text(" ", strip=True)
+                val = value.get_text(" ", strip=True)
+                if key and val:
+                    pairs[key] = val
+
+        for dl in self.definition_lists:
+            dts = dl.find_all("dt")
+            dds = dl.find_all("dd")
+            for dt, dd in zip(dts, dds):
+                key = dt.get_text(" ", strip=True)
+                val = dd.get_text(" ", strip=True)
+                if key and val:
+                    pairs.setdefault(key, val)
+
+        self._pairs = pairs
+        return dict(pairs)
+
+
+def _extract_labeled_value(
+    soup: BeautifulSoup, labels: List[str], index: Optional[_LabelIndex] = None
+) -> Optional[str]:
+    return (index or _LabelIndex(soup)).labeled_value(labels)
 
 
-def _extract_key_value_pairs(soup: BeautifulSoup) -> Dict[str, str]:
-    pairs: Dict[str, str] = {}
-
-    for row in soup.select(".listing-details .row"):
-        label = row.select_one(".label, .detail-label")
-        value = row.select_one(".value, .detail-value")
-        if label and value:
-            key = label.get_text(" ", strip=True)
-            val = value.get_text(" ", strip=True)
-            if key and val:
-                pairs[key] = val
-
-    for dl in soup.find_all("dl"):
-        dts = dl.find_all("dt")
-        dds = dl.find_all("dd")
-        for dt, dd in zip(dts, dds):
-            key = dt.get_text(" ", strip=True)
-            val = dd.get_text(" ", strip=True)
-            if key and val:
-                pairs.setdefault(key, val)
-
-    return pairs
+def _extract_key_value_pairs(
+    soup: BeautifulSoup, index: Optional[_LabelIndex] = None
+) -> Dict[str, str]:
+    return (index or _LabelIndex(soup)).key_value_pairs()
 
 
 def _extract_json_ld(soup: BeautifulSoup) -> List[Dict]:
@@ -0,0 +1,124 @@
+"""Normalize BizBuySell money strings into numbers for indexed columns."""
+
+import re
+from typing import Any, Dict, List, Optional
+
+
+NOT_AVAILABLE = {
+    "n/a",
+    "na",
+    "none",
+    "not disclosed",
+    "undisclosed",
+    "not available",
+    "not applicable",
+    "tbd",
+    "call",
+    "-",
+    "--",
+}
+
+_MULTIPLIERS = {
+    "": 1,
+    "k": 1_000,
+    "thousand": 1_000,
+    "m": 1_000_000,
+    "mm": 1_000_000,
+    "mil": 1_000_000,
+    "million": 1_000_000,
+    "b": 1_000_000_000,
+    "billion": 1_000_000_000,
+}
+_MONEY_TOKEN = re.compile(
+    r"(\d[\d,]*(?:\.\d+)?|\.\d+)\s*(k|mm|m|mil|b|thousand|million|billion)?\b", re.I
+)
+# A sign or opening parenthesis right against the number or its "$"
+_NEGATIVE_PREFIX = re.compile(r"(?:[-(]\$\s*|\$?[-(])$")
+_YEAR = re.compile(r"^(?:19|20)\d\d$")
+_RANGE = re.compile(r"^(?P<low>.*?\d.*?)\s*(?:-|–|—|\bto\b)\s*(?P<high>\$?\s*\d.*)$", re.I)
+
+REVENUE_LABELS = ["Gross Revenue", "Revenue", "Annual Revenue", "Gross Sales", "Sales"]
+CASH_FLOW_LABELS = ["Cash Flow", "SDE", "Seller's Discretionary Earnings"]
+INVENTORY_LABELS = ["Inventory", "Inventory Value"]
+
+
+def _money_token(text: str) -> Optional[re.Match]:
+    """
+    The amount in text: the first number with a "$", else the first number
+    that is not a bare year ("SDE (2023): ..." is not 2023 dollars).
+    """
+    fallback = None
+    for match in _MONEY_TOKEN.finditer(text):
+        if text[: match.start()].rstrip().endswith("$"):
+            return match
+        number, suffix = match.groups()
+        if fallback is None and (suffix or not _YEAR.match(number)):
+            fallback = match
+    return fallback
+
+
+def _parse_single(text: str) -> Optional[float]:
+    match = _money_token(text)
+    if not match:
+        return None
+    number, suffix = match.groups()
+    value = float(number.replace(",", "")) * _MULTIPLIERS[(suffix or "").lower()]
+    sign = _NEGATIVE_PREFIX.search(text[: match.start()])
+    if sign and (
+        "(" not in sign.group() or text[match.end() :].lstrip().startswith(")")
+    ):
+        value = -value
+    return value
+
+
+def parse_money(text: Any) -> Optional[int]:
+    """
+    Parse "$1,200,000", "$1.2M", "950K", "$1.5 million" or "(12,000)" to an int.
+    Ranges such as "$100K - $200K" resolve to their midpoint, and a suffix on
+    the upper bound applies to a bare lower bound ("$1 - 2M"). A value is only
+    negative when "-" or "(" touches the number or its "$", and bare years
+    are not amounts. Placeholders like "N/A" or "Not Disclosed" return None.
+    """
+    if text is None or isinstance(text, bool):
+        return None
+    if isinstance(text, (int, float)):
+        return int(text)
+
+    cleaned = str(text).strip()
+    if not cleaned or cleaned.lower().strip(" .:*") in NOT_AVAILABLE:
+        return None
+
+    range_match = _RANGE.match(cleaned)
+    if range_match and not cleaned.lstrip().startswith("-"):
+        low_text, high_text = range_match.group("low"), range_match.group("high")
+        low = _parse_single(low_text)
+        high = _parse_single(high_text)
+        if low is not None and high is not None:
+            low_match = _money_token(low_text)
+            high_match = _money_token(high_text)
+            if low_match and high_match and not low_match.group(2) and high_match.group(2):
+                low *= _MULTIPLIERS[high_match.group(2).lower()]
+            return int(round((low + high) / 2))
+
+    value = _parse_single(cleaned)
+    return int(round(value)) if value is not None else None
+
+
+def find_money(values: Optional[Dict[str, Any]], labels: List[str]) -> Optional[int]:
+    """First parseable money value among labels (case-insensitive keys)."""
+    if not values:
+        return None
+    lowered = {str(key).strip().lower().rstrip(":"): value for key, value in values.items()}
+    for label in labels:
+        parsed = parse_money(lowered.get(label.lower()))
+        if parsed is not None:
+            return parsed
+    return None
+
+
+def price_to_cash_flow_multiple(
+    asking_price: Optional[int], cash_flow: Optional[int]
+) -> Optional[float]:
+    if not asking_price or not cash_flow or cash_flow <= 0:
+        return None
+    return round(asking_price / cash_flow, 2)
@@ -0,0 +1,53 @@
+"""Optional process pool for CPU-bound HTML parsing in scraping jobs."""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+
+_executor: Optional[Executor] = None
+_configured = False
+
+
+def default_parse_processes() -> int:
+    value = os.getenv("SCRAPE_PARSE_PROCESSES")
+    if value is not None and value.strip():
+        return max(0, int(value))
+    return min(4, os.cpu_count() or 1)
+
+
+def configure_parse_pool(processes: int) -> None:
+    """Parse in a pool of `processes` workers; 0 parses inline on the event loop."""
+    shutdown_parse_pool()
+    global _executor, _configured
+    if processes > 0:
+        _executor = ProcessPoolExecutor(max_workers=processes)
+    _configured = True
+
+
+def ensure_parse_pool() -> None:
+    """Create the default pool on first use unless one was configured."""
+    if not _configured:
+        configure_parse_pool(default_parse_processes())
+
+
+def shutdown_parse_pool() -> None:
+    global _executor, _configured
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    _configured = False
+
+
+async def run_parse(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a parse function in the configured pool, or inline without one.
+    func and its arguments must be picklable when a pool is configured
+    (module-level functions or methods of BizBuySellParser).
+    """
+    if _executor is None:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args))
@@ -1,87 +1,164 @@
 """Scheduler job for BizBuySell daily scraping."""
 
 import asyncio
+import os
 from datetime import datetime
-from typing import List, cast
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, cast
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.database import init_db, SessionLocal
 from app.parsers.bizbuysell import BizBuySellParser
-from app.services import listing_service
+from app.scheduler.parsing import ensure_parse_pool, run_parse
+from app.services import cadence_service, listing_service
 
 
+TARGET_MAX_CONCURRENCY = 4
+TARGET_MAX_PAGES = 50
+TARGET_POLL_MINUTES = 15
+PLANNING_CYCLES_PER_DAY = 24
+FETCH_BUDGET_PER_DAY = int(os.getenv("SCRAPE_FETCH_BUDGET_PER_DAY", "500"))
+
 TARGET_URL = "https://www.bizbuysell.com/retiring-owner-businesses-for-sale/?q=bGM9SmtjOU16QW1RejFWVXlaVFBWUk9KbFE5TXpVNE9UVS9Ka2M5TXpBbVF6MVZVeVpUUFZSWUpsUTlOVE14Tmo4bVJ6MHpNQ1pEUFZWVEpsTTlWRmdtVkQwMk1EWXlQeVpIUFRNd0prTTlWVk1tVXoxVVRpWlVQVFk0TURNPQ%3D%3D"
 
 
-async def run_search_scrape() -> None:
-    init_db()
-    parser = BizBuySellParser()
-    db = SessionLocal()
-    run = listing_service.create_scrape_run(db, run_type="search")
-    db.commit()
+SEARCH_STAT_KEYS = ("listings_found", "new_listings", "updated_listings", "errors")
+
+
+def _save_search_listings(
+    db: Any, page_listings: List[Dict], stats: Dict[str, int], seen: Optional[set] = None
+) -> None:
+    """
+    Upsert one search page and queue new or changed listings for details.
+    External ids already in seen (saved earlier in the same pass) are skipped.
+    """
+    for listing_data in page_listings:
+        if seen is not None:
+            external_id = listing_data.get("external_id")
+            if external_id in seen:
+                continue
+            seen.add(external_id)
+        try:
+            listing, is_new, is_updated = listing_service.save_or_update_listing(
+                db, listing_data
+            )
+            if is_new:
+                stats["new_listings"] += 1
+                listing_service.queue_listing_for_details(db, listing.id, priority=10)
+            elif is_updated:
+                stats["updated_listings"] += 1
+                listing_service.queue_listing_for_details(db, listing.id, priority=5)
+        except Exception:
+            stats["errors"] += 1
+
+
+def _start_search_run(
+    db: Any, start_url: str, resume: bool, target_id: Optional[int] = None
+) -> Tuple[int, Dict[str, int], Optional[str], set]:
+    """
+    Continue the interrupted run for start_url when resume is set and one
+    exists, otherwise create a new run. Returns (run_id, stats, next_url,
+    visited_urls). The caller commits.
+    """
+    run = listing_service.get_resumable_search_run(db, start_url) if resume else None
+    if run is None:
+        run = listing_service.create_scrape_run(db, run_type="search", target_id=target_id)
+        return cast(int, run.id), dict.fromkeys(SEARCH_STAT_KEYS, 0), start_url, set()
+
     run_id = cast(int, run.id)
+    checkpoint = run.checkpoint
+    saved = dict(checkpoint.stats or {})
+    listing_service.update_scrape_run(
+        db,
+        run_id,
+        {"status": "running", "error_message": None, "completed_at": None},
+    )
+    print(f"Resuming search run {run_id} at {checkpoint.next_url}")
+    return (
+        run_id,
+        {key: int(saved.get(key, 0)) for key in SEARCH_STAT_KEYS},
+        cast(Optional[str], checkpoint.next_url),
+        set(checkpoint.visited_urls or []),
+    )
 
-    listings_found = 0
-    new_listings = 0
-    updated_listings = 0
-    errors = 0
+
+async def _crawl_search(
+    db: Any,
+    parser: BizBuySellParser,
+    start_url: str,
+    resume: bool,
+    target_id: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    seen: Optional[set] = None,
+) -> bool:
+    """
+    Crawl search result pages from start_url, upserting and checkpointing
+    each page in one commit so an interrupted run can resume. Records the
+    outcome on the scrape run and returns whether the crawl completed.
+    """
+    run_id, stats, next_url, visited_urls = _start_search_run(
+        db, start_url, resume, target_id
+    )
+    db.commit()
 
     try:
-        next_url = TARGET_URL
-        visited_urls = set()
         while next_url and next_url not in visited_urls:
-            visited_urls.add(next_url)
-            html = await parser.fetch_page(next_url)
-            page_listings = parser.parse_search_results(html)
-            listings_found += len(page_listings)
-
-            for listing_data in page_listings:
-                try:
-                    listing, is_new, is_updated = (
-                        listing_service.save_or_update_listing(db, listing_data)
-                    )
-                    if is_new:
-                        new_listings += 1
-                        listing_service.queue_listing_for_details(
-                            db, listing.id, priority=10
-                        )
-                    elif is_updated:
-                        updated_listings += 1
-                        listing_service.queue_listing_for_details(
-                            db, listing.id, priority=5
-                        )
-                except Exception:
-                    errors += 1
-            db.commit()
+            if max_pages is not None and len(visited_urls) >= max_pages:
+                break
+            current_url = next_url
+            visited_urls.add(current_url)
+            html = await parser.fetch_page(current_url)
+            page = await run_parse(parser.parse_search_page, html, current_url)
+            page_listings = page["listings"]
+            stats["listings_found"] += len(page_listings)
+            _save_search_listings(db, page_listings, stats, seen)
 
-            next_url = parser.find_next_page_url(html, next_url)
-
-        listing_service.update_scrape_run(
-            db,
-            run_id,  # type: ignore[arg-type]
-            {
-                "listings_found": listings_found,
-                "new_listings": new_listings,
-                "updated_listings": updated_listings,
-                "errors": errors,
-                "status": "completed",
-                "completed_at": datetime.utcnow(),
-            },
-        )
-        db.commit()
+            next_url = page["next_url"] if page_listings else None
+            listing_service.save_crawl_checkpoint(
+                db,
+                run_id,
+                start_url=start_url,
+                last_completed_url=current_url,
+                next_url=next_url if next_url not in visited_urls else None,
+                visited_urls=sorted(visited_urls),
+                stats=stats,
+            )
+            db.commit()
     except Exception as exc:
+        db.rollback()
         listing_service.update_scrape_run(
             db,
-            run_id,  # type: ignore[arg-type]
-            {
-                "errors": errors + 1,
-                "status": "failed",
-                "error_message": str(exc),
-                "completed_at": datetime.utcnow(),
-            },
+            run_id,
+            dict(
+                stats,
+                errors=stats["errors"] + 1,
+                status="failed",
+                error_message=str(exc),
+                completed_at=datetime.utcnow(),
+            ),
         )
         db.commit()
+        return False
+
+    listing_service.update_scrape_run(
+        db, run_id, dict(stats, status="completed", completed_at=datetime.utcnow())
+    )
+    db.commit()
+    return True
+
+
+async def run_search_scrape(resume: bool = False, start_url: str = TARGET_URL) -> None:
+    """
+    Crawl search result pages starting at start_url.
+    With resume=True an interrupted run for the same start_url is continued
+    from its last checkpoint instead of refetching from page 1.
+    """
+    init_db()
+    ensure_parse_pool()
+    parser = BizBuySellParser()
+    db = SessionLocal()
+    try:
+        await _crawl_search(db, parser, start_url, resume)
     finally:
         db.close()
 
@@ -90,6 +167,7 @@ async def run_detail_scrape(
     batch_size: int = 25, request_timeout: float = 90.0
 ) -> None:
     init_db()
+    ensure_parse_pool()
     parser = BizBuySellParser()
     db = SessionLocal()
     run = listing_service.create_scrape_run(db, run_type="details")
@@ -119,7 +197,7 @@ async def run_detail_scrape(
                 html, _meta = await parser.fetch_page_with_metadata(
                     str(listing.url), timeout=request_timeout
                 )
-                detail_data = parser.parse_detail_page(html)
+                detail_data = await run_parse(parser.parse_detail_page, html)
                 listing_service.save_listing_detail(
                     db,
                     cast(int, listing.id),
@@ -160,13 +238,142 @@ async def run_detail_scrape(
         db.close()
 
 
-def start_scheduler() -> AsyncIOScheduler:
+async def run_target_scrapes(
+    max_concurrency: int = TARGET_MAX_CONCURRENCY, only_due: bool = True
+) -> None:
+    """
+    Crawl every due SearchTarget concurrently. Each target checkpoints and
+    upserts page by page like run_search_scrape, and resumes its own
+    interrupted run. A target is only marked as run when its crawl
+    completes, so a failed one is retried on the next poll instead of a
+    full cadence later. Listings that appear in several searches are saved
+    once per pass, credited to the target that reached them first.
+    """
+    init_db()
+    db = SessionLocal()
+    try:
+        if not listing_service.get_enabled_search_targets(
+            db
+        ) and not listing_service.get_search_target_by_url(db, TARGET_URL):
+            listing_service.create_search_target(
+                db, TARGET_URL, name="Retiring owners (default)"
+            )
+            db.commit()
+
+        targets = (
+            listing_service.get_due_search_targets(db)
+            if only_due
+            else listing_service.get_enabled_search_targets(db)
+        )
+        if not targets:
+            return
+
+        ensure_parse_pool()
+        parser = BizBuySellParser()
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        seen: set = set()
+
+        # One session is shared: every DB step runs between awaits and ends
+        # in a commit, so the crawls never interleave inside a transaction.
+        async def crawl(target_id: int, url: str) -> None:
+            async with semaphore:
+                completed = await _crawl_search(
+                    db,
+                    parser,
+                    url,
+                    resume=True,
+                    target_id=target_id,
+                    max_pages=TARGET_MAX_PAGES,
+                    seen=seen,
+                )
+            if completed:
+                listing_service.mark_search_target_run(db, target_id)
+                db.commit()
+
+        await asyncio.gather(
+            *(crawl(cast(int, target.id), str(target.url)) for target in targets)
+        )
+    finally:
+        db.close()
+
+
+async def run_adaptive_planning(
+    fetch_budget_per_day: int = FETCH_BUDGET_PER_DAY,
+) -> None:
+    """
+    Re-derive target cadences, queue due detail recrawls and scrape one
+    detail batch sized by the plan, so new-listing and recrawl detail
+    fetches together stay within the daily budget.
+    """
+    init_db()
+    db = SessionLocal()
+    try:
+        plan = cadence_service.plan_crawl_cadence(
+            db,
+            fetch_budget_per_day=fetch_budget_per_day,
+            cycles_per_day=PLANNING_CYCLES_PER_DAY,
+        )
+        cadence_service.apply_crawl_plan(db, plan)
+        db.commit()
+        print(
+            f"Crawl plan: {len(plan['targets'])} targets "
+            f"({plan['search_fetches_per_day']:.0f} fetches/day), "
+            f"{plan['listing_fetches_per_cycle']} detail fetches this cycle "
+            f"({len(plan['listings'])} recrawls queued)"
+        )
+    finally:
+        db.close()
+
+    batch_size = plan["listing_fetches_per_cycle"]
+    if batch_size > 0:
+        await run_detail_scrape(batch_size=batch_size)
+
+
+def build_scheduler(
+    adaptive: bool = True,
+    job_runner: Optional[Callable[..., Awaitable[None]]] = None,
+) -> AsyncIOScheduler:
+    """
+    Register the scraping jobs on a new (not yet started) scheduler.
+    job_runner, if given, is called as job_runner(job_func) for every run so
+    a worker can throttle and track jobs.
+    """
     scheduler = AsyncIOScheduler()
-    scheduler.add_job(run_search_scrape, "cron", hour=8, minute=0)
-    scheduler.add_job(run_detail_scrape, "cron", hour=8, minute=30)
+
+    def add_job(func: Callable[..., Awaitable[None]], trigger: str, **kwargs: Any):
+        if job_runner is None:
+            scheduler.add_job(func, trigger, id=func.__name__, **kwargs)
+        else:
+            scheduler.add_job(
+                job_runner, trigger, args=[func], id=func.__name__, **kwargs
+            )
+
+    add_job(
+        run_target_scrapes,
+        "interval",
+        minutes=TARGET_POLL_MINUTES,
+        max_instances=1,
+        coalesce=True,
+    )
+    if adaptive:
+        # Also runs the detail scrape, with the batch size the plan allows
+        add_job(
+            run_adaptive_planning,
+            "interval",
+            minutes=24 * 60 // PLANNING_CYCLES_PER_DAY,
+            max_instances=1,
+            coalesce=True,
+        )
+    else:
+        add_job(run_detail_scrape, "cron", hour=8, minute=30)
+    return scheduler
+
+
+def start_scheduler(adaptive: bool = True) -> AsyncIOScheduler:
+    scheduler = build_scheduler(adaptive=adaptive)
     scheduler.start()
     return scheduler
 
 
-def run_now():
-    asyncio.run(run_search_scrape())
+def run_now(resume: bool = False):
+    asyncio.run(run_search_scrape(resume=resume))
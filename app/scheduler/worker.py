@@ -0,0 +1,142 @@
+"""Standalone worker process for BizBuySell scraping jobs.
+
+Run with: python -m app.scheduler.worker
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+from typing import Awaitable, Callable, Optional, Set
+
+from app.database import init_db
+from app.scheduler.parsing import (
+    configure_parse_pool,
+    default_parse_processes,
+    shutdown_parse_pool,
+)
+from app.scheduler.scrape_job import build_scheduler
+
+
+class ScrapeWorker:
+    """Run scheduled scraping jobs until told to stop, then drain them."""
+
+    def __init__(
+        self,
+        max_concurrent_jobs: int = 2,
+        parse_processes: int = 0,
+        adaptive: bool = True,
+        shutdown_timeout: float = 300.0,
+    ) -> None:
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.parse_processes = max(0, parse_processes)
+        self.adaptive = adaptive
+        self.shutdown_timeout = shutdown_timeout
+        self._job_slots: Optional[asyncio.Semaphore] = None
+        self._running: Set[asyncio.Task] = set()
+        self._stop_event: Optional[asyncio.Event] = None
+
+    async def run_job(self, job_func: Callable[[], Awaitable[None]]) -> None:
+        """Scheduler entry point: run one job inside a concurrency slot."""
+        assert self._job_slots is not None
+        if self._stop_event is not None and self._stop_event.is_set():
+            return
+        task = asyncio.current_task()
+        if task is not None:
+            self._running.add(task)
+        try:
+            async with self._job_slots:
+                print(f"Worker: starting {job_func.__name__}")
+                await job_func()
+                print(f"Worker: finished {job_func.__name__}")
+        except Exception as exc:
+            print(f"Worker: {job_func.__name__} failed: {exc}")
+        finally:
+            if task is not None:
+                self._running.discard(task)
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def run(self) -> None:
+        init_db()
+        self._job_slots = asyncio.Semaphore(self.max_concurrent_jobs)
+        self._stop_event = asyncio.Event()
+        configure_parse_pool(self.parse_processes)
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows event loops have no signal handler support
+                pass
+
+        scheduler = build_scheduler(adaptive=self.adaptive, job_runner=self.run_job)
+        scheduler.start()
+        print(
+            f"Worker started: {self.max_concurrent_jobs} concurrent jobs, "
+            f"{self.parse_processes or 'inline'} parse processes"
+        )
+        try:
+            await self._stop_event.wait()
+        finally:
+            print("Worker: shutting down, waiting for running jobs")
+            scheduler.shutdown(wait=False)
+            await self._drain()
+            shutdown_parse_pool()
+            print("Worker stopped")
+
+    async def _drain(self) -> None:
+        running = list(self._running)
+        if not running:
+            return
+        _done, pending = await asyncio.wait(running, timeout=self.shutdown_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="BizBuySell scraping worker")
+    parser.add_argument(
+        "--max-concurrent-jobs",
+        type=int,
+        default=int(os.getenv("SCRAPE_WORKER_CONCURRENT_JOBS", "2")),
+        help="Scheduler jobs allowed to run at the same time",
+    )
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=default_parse_processes(),
+        help="Process pool size for HTML parsing (0 parses on the event loop)",
+    )
+    parser.add_argument(
+        "--fixed-schedule",
+        action="store_true",
+        help="Use the fixed daily detail scrape instead of adaptive cadence",
+    )
+    parser.add_argument(
+        "--shutdown-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds to wait for running jobs on shutdown before cancelling",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    worker = ScrapeWorker(
+        max_concurrent_jobs=args.max_concurrent_jobs,
+        parse_processes=args.parse_processes,
+        adaptive=not args.fixed_schedule,
+        shutdown_timeout=args.shutdown_timeout,
+    )
+    asyncio.run(worker.run())
+
+
+if __name__ == "__main__":
+    main()
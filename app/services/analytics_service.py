@@ -0,0 +1,261 @@
+"""Columnar in-memory analytics over the listings table."""
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import Listing, ScrapeRun
+
+
+NUMERIC_COLUMNS = {
+    "asking_price": Listing.asking_price,
+    "cash_flow": Listing.cash_flow_num,
+    "revenue": Listing.revenue_num,
+    "inventory": Listing.inventory_num,
+    "multiple": Listing.multiple,
+}
+GROUP_COLUMNS = {
+    "state": Listing.location_state,
+    "city": Listing.location_city,
+    "category": Listing.business_category,
+}
+FLAG_COLUMNS = {
+    "is_retirement_listing": Listing.is_retirement_listing,
+    "is_active": Listing.is_active,
+}
+# Booleans aggregate as 0/1, so mean() of a flag is a share
+METRICS = list(NUMERIC_COLUMNS) + ["is_retirement_listing"]
+AGGREGATIONS = ["count", "sum", "mean", "median", "min", "max", "p10", "p25", "p75", "p90"]
+
+
+class ListingFrame:
+    """
+    Listings loaded column-by-column into NumPy arrays.
+    Numeric columns are float64 with NaN for missing values; group columns
+    are encoded to integer codes on first use and cached.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], token: Tuple[Any, ...]):
+        self.columns = columns
+        self.token = token
+        self.size = len(columns["id"])
+        self._codes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def load(cls, db: Session, token: Tuple[Any, ...] = ()) -> "ListingFrame":
+        names = ["id"] + list(NUMERIC_COLUMNS) + list(GROUP_COLUMNS) + list(FLAG_COLUMNS)
+        selected = (
+            [Listing.id]
+            + list(NUMERIC_COLUMNS.values())
+            + list(GROUP_COLUMNS.values())
+            + list(FLAG_COLUMNS.values())
+        )
+        rows = db.query(*selected).all()
+        raw = list(zip(*rows)) if rows else [() for _ in names]
+
+        columns: Dict[str, np.ndarray] = {}
+        for name, values in zip(names, raw):
+            if name == "id":
+                columns[name] = np.asarray(values, dtype=np.int64)
+            elif name in NUMERIC_COLUMNS:
+                columns[name] = np.array(
+                    [np.nan if value is None else value for value in values],
+                    dtype=np.float64,
+                )
+            elif name in GROUP_COLUMNS:
+                columns[name] = np.array(
+                    [(value or "").strip() or "Unknown" for value in values],
+                    dtype=object,
+                )
+            else:
+                columns[name] = np.array([bool(value) for value in values], dtype=bool)
+        columns["is_retirement_listing_num"] = columns["is_retirement_listing"].astype(
+            np.float64
+        )
+        return cls(columns, token)
+
+    def mask(self, active_only: bool = True, retirement_only: bool = False) -> np.ndarray:
+        selected = np.ones(self.size, dtype=bool)
+        if active_only:
+            selected &= self.columns["is_active"]
+        if retirement_only:
+            selected &= self.columns["is_retirement_listing"]
+        return selected
+
+    def metric(self, name: str) -> np.ndarray:
+        if name == "is_retirement_listing":
+            return self.columns["is_retirement_listing_num"]
+        return self.columns[name]
+
+    def group_codes(self, by: str) -> Tuple[np.ndarray, np.ndarray]:
+        if by not in self._codes:
+            labels, codes = np.unique(self.columns[by], return_inverse=True)
+            self._codes[by] = (labels, codes.astype(np.int64))
+        return self._codes[by]
+
+
+def _aggregate_sorted(values: np.ndarray, agg: str) -> float:
+    if values.size == 0:
+        return float("nan")
+    if agg == "sum":
+        return float(values.sum())
+    if agg == "mean":
+        return float(values.mean())
+    if agg == "min":
+        return float(values[0])
+    if agg == "max":
+        return float(values[-1])
+    if agg == "median":
+        return float(np.median(values))
+    return float(np.percentile(values, int(agg[1:])))
+
+
+def group_by(
+    frame: ListingFrame,
+    by: str,
+    metric: str,
+    aggs: Sequence[str],
+    active_only: bool = True,
+    retirement_only: bool = False,
+    min_count: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate metric per group. Rows are sorted once by (group, value), so
+    every group is a contiguous, already ordered slice and percentiles need
+    no per-group sort.
+    """
+    labels, codes = frame.group_codes(by)
+    values = frame.metric(metric)
+    selected = frame.mask(active_only, retirement_only) & ~np.isnan(values)
+    group_codes = codes[selected]
+    group_values = values[selected]
+
+    order = np.lexsort((group_values, group_codes))
+    group_codes = group_codes[order]
+    group_values = group_values[order]
+    boundaries = np.flatnonzero(np.diff(group_codes)) + 1
+    starts = np.concatenate(([0], boundaries)) if group_codes.size else np.array([], int)
+    ends = np.concatenate((boundaries, [group_codes.size])) if group_codes.size else starts
+
+    results = []
+    for start, end in zip(starts, ends):
+        if end - start < min_count:
+            continue
+        slice_values = group_values[start:end]
+        row: Dict[str, Any] = {"group": str(labels[group_codes[start]])}
+        for agg in aggs:
+            if agg == "count":
+                row[agg] = int(slice_values.size)
+            else:
+                row[agg] = _json_number(_aggregate_sorted(slice_values, agg))
+        results.append(row)
+    results.sort(key=lambda row: row.get("count", 0) or 0, reverse=True)
+    return results
+
+
+def percentiles(
+    frame: ListingFrame,
+    metric: str,
+    quantiles: Sequence[float],
+    active_only: bool = True,
+    retirement_only: bool = False,
+) -> Dict[str, Any]:
+    values = frame.metric(metric)
+    values = values[frame.mask(active_only, retirement_only) & ~np.isnan(values)]
+    result: Dict[str, Any] = {"count": int(values.size)}
+    if values.size:
+        computed = np.percentile(values, list(quantiles))
+        for quantile, value in zip(quantiles, computed):
+            result[f"p{quantile:g}"] = _json_number(float(value))
+    return result
+
+
+def histogram(
+    frame: ListingFrame,
+    metric: str,
+    bins: int = 20,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    active_only: bool = True,
+    retirement_only: bool = False,
+) -> Dict[str, Any]:
+    """Either bound may be given alone; the other edge follows the data."""
+    values = frame.metric(metric)
+    values = values[frame.mask(active_only, retirement_only) & ~np.isnan(values)]
+    if min_value is not None:
+        values = values[values >= min_value]
+    if max_value is not None:
+        values = values[values <= max_value]
+    if not values.size:
+        return {"count": 0, "edges": [], "counts": []}
+    value_range = (
+        values.min() if min_value is None else min_value,
+        values.max() if max_value is None else max_value,
+    )
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    return {
+        "count": int(values.size),
+        "edges": [float(edge) for edge in edges],
+        "counts": [int(count) for count in counts],
+    }
+
+
+def _json_number(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(value, 4)
+
+
+_frame: Optional[ListingFrame] = None
+_frame_lock = threading.Lock()
+
+
+def _refresh_token(db: Session) -> Tuple[Any, ...]:
+    """
+    Changes whenever a scrape run completes, any listing is written, or a
+    detail page or financial backfill changes a listing's content.
+    """
+    last_run = (
+        db.query(func.max(ScrapeRun.completed_at))
+        .filter(ScrapeRun.status == "completed")
+        .scalar()
+    )
+    last_update = db.query(func.max(Listing.last_updated_at)).scalar()
+    last_change = db.query(func.max(Listing.content_changed_at)).scalar()
+    return (last_run, last_update, last_change)
+
+
+def get_listing_frame(db: Session) -> ListingFrame:
+    """Cached frame, reloaded when the refresh token moves."""
+    global _frame
+    token = _refresh_token(db)
+    frame = _frame
+    if frame is not None and frame.token == token:
+        return frame
+    with _frame_lock:
+        if _frame is None or _frame.token != token:
+            _frame = ListingFrame.load(db, token)
+        return _frame
+
+
+def invalidate_listing_frame() -> None:
+    global _frame
+    _frame = None
+
+
+def frame_info(frame: ListingFrame) -> Dict[str, Any]:
+    last_run, last_update, last_change = (
+        frame.token if len(frame.token) == 3 else (None, None, None)
+    )
+    return {
+        "rows": frame.size,
+        "last_completed_run_at": _iso(last_run),
+        "last_listing_update_at": _iso(last_update),
+        "last_content_change_at": _iso(last_change),
+    }
+
+
+def _iso(value: Any) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
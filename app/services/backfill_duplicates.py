@@ -0,0 +1,32 @@
+"""Build near-duplicate signatures and clusters for existing listings.
+
+Run with: python -m app.services.backfill_duplicates
+"""
+
+import argparse
+
+from app.database import SessionLocal, init_db
+from app.services import dedupe_service
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Index listings for duplicate detection")
+    parser.add_argument("--batch-size", type=int, default=500, help="Listings per commit")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    init_db()
+    db = SessionLocal()
+    try:
+        processed = dedupe_service.index_all_listings(
+            db, batch_size=max(1, args.batch_size)
+        )
+    finally:
+        db.close()
+    print(f"Indexed {processed} listings for duplicate detection")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Backfill numeric financial columns on existing listings.
+
+Run with: python -m app.services.backfill_financials
+"""
+
+import argparse
+
+from app.database import SessionLocal, init_db
+from app.services import listing_service
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill listing financial columns")
+    parser.add_argument("--batch-size", type=int, default=500, help="Listings per commit")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    init_db()
+    db = SessionLocal()
+    try:
+        processed = listing_service.backfill_financial_fields(
+            db, batch_size=max(1, args.batch_size)
+        )
+    finally:
+        db.close()
+    print(f"Backfilled financial fields for {processed} listings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Adaptive recrawl cadence for search targets and listing detail pages."""
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, cast
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import (
+    Listing,
+    ListingDetail,
+    ListingDetailChange,
+    ListingSnapshot,
+    ScrapeRun,
+)
+from app.services import listing_service
+
+
+HISTORY_DAYS = 30
+SEARCH_RESULTS_PER_PAGE = 30
+SEARCH_BUDGET_SHARE = 0.6
+
+TARGET_MIN_INTERVAL = timedelta(hours=1)
+TARGET_MAX_INTERVAL = timedelta(days=1)
+LISTING_MIN_INTERVAL = timedelta(days=1)
+LISTING_MAX_INTERVAL = timedelta(days=7)
+
+# One pseudo-change per pseudo-day, so entities without history start at a
+# daily rate instead of zero (which would never be recrawled)
+PRIOR_CHANGES = 1.0
+PRIOR_DAYS = 1.0
+
+RECRAWL_QUEUE_PRIORITY = 1
+
+
+def estimate_change_rate(changes: float, observed_days: float) -> float:
+    """Smoothed changes-per-day estimate."""
+    return (max(changes, 0.0) + PRIOR_CHANGES) / (max(observed_days, 0.0) + PRIOR_DAYS)
+
+
+def interval_for_rate(
+    rate_per_day: float, min_interval: timedelta, max_interval: timedelta
+) -> timedelta:
+    """Recrawl roughly once per expected change, clamped to [min, max]."""
+    if rate_per_day <= 0:
+        return max_interval
+    interval = timedelta(days=1 / rate_per_day)
+    return max(min_interval, min(max_interval, interval))
+
+
+def _target_stats(db: Session, since: datetime) -> Dict[int, Dict[str, Any]]:
+    rows = (
+        db.query(
+            ScrapeRun.target_id,
+            func.count(ScrapeRun.id),
+            func.sum(ScrapeRun.new_listings + ScrapeRun.updated_listings),
+            func.avg(ScrapeRun.listings_found),
+            func.min(ScrapeRun.started_at),
+        )
+        .filter(ScrapeRun.run_type == "search")
+        .filter(ScrapeRun.status == "completed")
+        .filter(ScrapeRun.target_id.isnot(None))
+        .filter(ScrapeRun.started_at >= since)
+        .group_by(ScrapeRun.target_id)
+        .all()
+    )
+    return {
+        int(target_id): {
+            "runs": int(runs),
+            "changes": float(changes or 0),
+            "avg_found": float(avg_found or 0),
+            "first_run_at": first_run_at,
+        }
+        for target_id, runs, changes, avg_found, first_run_at in rows
+    }
+
+
+def plan_target_cadence(
+    db: Session, now: Optional[datetime] = None, fetch_budget_per_day: int = 500
+) -> List[Dict[str, Any]]:
+    """
+    Derive a recrawl interval per enabled SearchTarget from the new/updated
+    counts of its recent runs (each one produced a ListingSnapshot).
+    Targets with a user-set cadence (cadence_override) keep it. If the
+    adaptive targets' fetch rate exceeds what those leave of the search
+    share of the budget, their intervals are stretched by the same factor;
+    if the overrides leave nothing, adaptive targets fall back to at most
+    one crawl per TARGET_MAX_INTERVAL.
+    """
+    now = now or datetime.utcnow()
+    stats = _target_stats(db, now - timedelta(days=HISTORY_DAYS))
+
+    plans: List[Dict[str, Any]] = []
+    for target in listing_service.get_enabled_search_targets(db):
+        target_id = cast(int, target.id)
+        target_stats = stats.get(target_id)
+        if target_stats:
+            observed_days = (now - target_stats["first_run_at"]).total_seconds() / 86400
+            rate = estimate_change_rate(target_stats["changes"], observed_days)
+            pages = max(1, math.ceil(target_stats["avg_found"] / SEARCH_RESULTS_PER_PAGE))
+        else:
+            rate = estimate_change_rate(0, 0)
+            pages = 1
+        override = bool(target.cadence_override)
+        if override:
+            interval = timedelta(minutes=max(1, int(cast(Any, target.cadence_minutes))))
+        else:
+            interval = interval_for_rate(rate, TARGET_MIN_INTERVAL, TARGET_MAX_INTERVAL)
+        plans.append(
+            {
+                "target_id": target_id,
+                "change_rate": rate,
+                "pages_per_crawl": pages,
+                "interval": interval,
+                "override": override,
+            }
+        )
+
+    adaptive = [plan for plan in plans if not plan["override"]]
+    available = fetch_budget_per_day * SEARCH_BUDGET_SHARE - sum(
+        _fetches_per_day(plan) for plan in plans if plan["override"]
+    )
+    planned = sum(_fetches_per_day(plan) for plan in adaptive)
+    if available <= 0:
+        for plan in adaptive:
+            plan["interval"] = max(plan["interval"], TARGET_MAX_INTERVAL)
+    elif planned > available:
+        stretch = planned / available
+        for plan in adaptive:
+            plan["interval"] = plan["interval"] * stretch
+
+    for plan in plans:
+        plan["fetches_per_day"] = _fetches_per_day(plan)
+    return plans
+
+
+def _fetches_per_day(plan: Dict[str, Any]) -> float:
+    return plan["pages_per_crawl"] * timedelta(days=1) / plan["interval"]
+
+
+def plan_listing_recrawls(
+    db: Session,
+    now: Optional[datetime] = None,
+    max_fetches: int = 100,
+) -> List[Dict[str, Any]]:
+    """
+    Pick active listings whose detail page is due for a recrawl.
+    The interval comes from how often the listing changed: new search card
+    snapshots plus detail page recrawls that found changed content. Due
+    listings are ranked by change rate and capped at max_fetches.
+    """
+    now = now or datetime.utcnow()
+    since = now - timedelta(days=HISTORY_DAYS)
+    snapshot_counts = (
+        db.query(
+            ListingSnapshot.listing_id.label("listing_id"),
+            func.count(ListingSnapshot.id).label("snapshots"),
+        )
+        .filter(ListingSnapshot.created_at >= since)
+        .group_by(ListingSnapshot.listing_id)
+        .subquery()
+    )
+    detail_counts = (
+        db.query(
+            ListingDetailChange.listing_id.label("listing_id"),
+            func.count(ListingDetailChange.id).label("changes"),
+        )
+        .filter(ListingDetailChange.changed_at >= since)
+        .group_by(ListingDetailChange.listing_id)
+        .subquery()
+    )
+    rows = (
+        db.query(
+            Listing.id,
+            Listing.first_seen_at,
+            ListingDetail.scraped_at,
+            snapshot_counts.c.snapshots,
+            detail_counts.c.changes,
+        )
+        .join(ListingDetail, ListingDetail.listing_id == Listing.id)
+        .outerjoin(snapshot_counts, snapshot_counts.c.listing_id == Listing.id)
+        .outerjoin(detail_counts, detail_counts.c.listing_id == Listing.id)
+        .filter(Listing.is_active.is_(True))
+        .all()
+    )
+
+    due: List[Dict[str, Any]] = []
+    for listing_id, first_seen_at, scraped_at, snapshots, detail_changes in rows:
+        observed_from = max(first_seen_at, since)
+        changes = float(snapshots or 0)
+        if first_seen_at >= since and changes:
+            changes -= 1  # the first snapshot records the listing, not a change
+        changes += float(detail_changes or 0)
+        observed_days = (now - observed_from).total_seconds() / 86400
+        rate = estimate_change_rate(changes, observed_days)
+        interval = interval_for_rate(rate, LISTING_MIN_INTERVAL, LISTING_MAX_INTERVAL)
+        if scraped_at is None or scraped_at + interval <= now:
+            due.append(
+                {"listing_id": int(listing_id), "change_rate": rate, "interval": interval}
+            )
+
+    due.sort(key=lambda item: item["change_rate"], reverse=True)
+    return due[: max(0, max_fetches)]
+
+
+def plan_crawl_cadence(
+    db: Session,
+    now: Optional[datetime] = None,
+    fetch_budget_per_day: int = 500,
+    cycles_per_day: int = 24,
+) -> Dict[str, Any]:
+    """
+    Split the daily fetch budget between search targets and detail pages.
+    Search targets are planned first; what they leave unused is spread over
+    the planning cycles as listing_fetches_per_cycle, the detail batch size.
+    Detail pages already queued (new and changed listings from the search
+    crawls) use that batch first, and recrawls only fill what is left.
+    """
+    now = now or datetime.utcnow()
+    targets = plan_target_cadence(db, now, fetch_budget_per_day)
+    search_fetches = sum(plan["fetches_per_day"] for plan in targets)
+    listing_budget = max(0.0, fetch_budget_per_day - search_fetches)
+    per_cycle = int(listing_budget / max(1, cycles_per_day))
+    pending = listing_service.count_pending_detail_scrapes(db)
+    listings = plan_listing_recrawls(db, now, max_fetches=per_cycle - pending)
+    return {
+        "targets": targets,
+        "listings": listings,
+        "search_fetches_per_day": search_fetches,
+        "listing_fetches_per_cycle": per_cycle,
+        "pending_detail_fetches": pending,
+    }
+
+
+def apply_crawl_plan(db: Session, plan: Dict[str, Any]) -> None:
+    """
+    Store adaptive target intervals as cadence_minutes (user-set cadences are
+    left alone) and queue due detail recrawls.
+    """
+    for target_plan in plan["targets"]:
+        if target_plan["override"]:
+            continue
+        minutes = max(1, int(target_plan["interval"].total_seconds() // 60))
+        listing_service.update_search_target(
+            db, target_plan["target_id"], {"cadence_minutes": minutes}
+        )
+    for listing_plan in plan["listings"]:
+        listing_service.queue_listing_for_details(
+            db, listing_plan["listing_id"], priority=RECRAWL_QUEUE_PRIORITY
+        )
+    db.flush()
@@ -0,0 +1,343 @@
+"""Near-duplicate listing detection with MinHash signatures and LSH buckets.
+
+BizBuySell relists businesses under new ids, so external_id uniqueness does
+not catch them. Each listing's title + description is shingled and MinHashed;
+the signature is split into bands and each band is hashed together with the
+listing's state into a bucket row. New listings only compare against listings
+sharing a bucket, then confirm on estimated Jaccard similarity and asking price.
+
+Listings are only indexed once their detail page description is saved: titles
+alone are too short to tell a relisting from a similarly named business.
+"""
+
+import hashlib
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+
+import numpy as np
+from sqlalchemy.orm import Session, joinedload
+
+from app.database import (
+    DuplicateCluster,
+    Listing,
+    ListingDetail,
+    ListingLshBucket,
+    ListingSignature,
+)
+
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.7
+PRICE_TOLERANCE = 0.3  # max relative asking price difference when both are known
+MAX_CANDIDATES = 200
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_rng = np.random.RandomState(20240301)
+# a < 2**31 keeps a * hash + b below 2**64, so uint64 arithmetic never wraps
+_PERM_A = _rng.randint(1, 2**31, size=(NUM_PERM, 1)).astype(np.uint64)
+_PERM_B = _rng.randint(0, 2**32, size=(NUM_PERM, 1), dtype=np.int64).astype(np.uint64)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def listing_text(listing: Listing, detail: Optional[ListingDetail] = None) -> str:
+    """Normalized title + description, or "" until a description is known."""
+    listing_any = cast(Any, listing)
+    detail_any = cast(Any, detail if detail is not None else listing_any.details)
+    if detail_any is None or not detail_any.full_description:
+        return ""
+    return normalize_text(f"{listing_any.title or ''} {detail_any.full_description}")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """NUM_PERM minimum hashes of the text's character shingles, or None if empty."""
+    tokens = shingles(text)
+    if not tokens:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(token.encode("utf-8")) for token in tokens),
+        dtype=np.uint64,
+        count=len(tokens),
+    )
+    return ((_PERM_A * hashes[np.newaxis, :] + _PERM_B) % _PRIME).min(axis=1)
+
+
+def estimate_similarity(left: np.ndarray, right: np.ndarray) -> float:
+    """Estimated Jaccard similarity: share of matching MinHash positions."""
+    return float(np.count_nonzero(left == right)) / float(left.size)
+
+
+def block_key(listing: Listing) -> str:
+    return (cast(Any, listing).location_state or "").strip().lower()
+
+
+def band_buckets(signature: np.ndarray, block: str) -> List[str]:
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        key = f"{block}|{band}|{','.join(str(int(value)) for value in rows)}"
+        buckets.append(hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest())
+    return buckets
+
+
+def prices_compatible(left: Optional[int], right: Optional[int]) -> bool:
+    if not left or not right:
+        return True
+    return abs(left - right) / max(left, right) <= PRICE_TOLERANCE
+
+
+def index_listing(
+    db: Session, listing: Listing, detail: Optional[ListingDetail] = None
+) -> List[Tuple[int, float]]:
+    """
+    Update the listing's signature and buckets, then record any near
+    duplicates among listings already indexed. Changed text first takes the
+    listing out of its cluster, so a rewritten listing only stays clustered
+    if it still matches; listings without a description are not indexed.
+    Unchanged text is a no-op. Returns the (listing_id, similarity) matches
+    found. Flushes; the caller commits.
+    """
+    listing_any = cast(Any, listing)
+    text = listing_text(listing, detail)
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    stored = (
+        db.query(ListingSignature)
+        .filter(ListingSignature.listing_id == listing_any.id)
+        .first()
+    )
+    if stored is not None and stored.text_hash == text_hash:
+        return []
+
+    signature = minhash_signature(text)
+    if stored is None and signature is None:
+        return []
+    db.query(ListingLshBucket).filter(
+        ListingLshBucket.listing_id == listing_any.id
+    ).delete(synchronize_session=False)
+    _leave_cluster(db, cast(int, listing_any.id))
+    if signature is None:
+        if stored is not None:
+            db.delete(stored)
+        db.flush()
+        return []
+
+    values = [int(value) for value in signature]
+    if stored is None:
+        db.add(
+            ListingSignature(
+                listing_id=listing_any.id, text_hash=text_hash, minhash=values
+            )
+        )
+    else:
+        stored_any = cast(Any, stored)
+        stored_any.text_hash = text_hash
+        stored_any.minhash = values
+
+    buckets = band_buckets(signature, block_key(listing))
+    matches = _find_matches(db, listing, signature, buckets)
+    db.add_all(
+        [ListingLshBucket(listing_id=listing_any.id, bucket=bucket) for bucket in buckets]
+    )
+    if matches:
+        _merge_cluster(db, cast(int, listing_any.id), matches)
+    db.flush()
+    return matches
+
+
+def _find_matches(
+    db: Session, listing: Listing, signature: np.ndarray, buckets: List[str]
+) -> List[Tuple[int, float]]:
+    listing_any = cast(Any, listing)
+    candidate_ids = [
+        row[0]
+        for row in db.query(ListingLshBucket.listing_id)
+        .filter(
+            ListingLshBucket.bucket.in_(buckets),
+            ListingLshBucket.listing_id != listing_any.id,
+        )
+        .distinct()
+        .limit(MAX_CANDIDATES)
+        .all()
+    ]
+    if not candidate_ids:
+        return []
+
+    rows = (
+        db.query(ListingSignature.listing_id, ListingSignature.minhash, Listing.asking_price)
+        .join(Listing, Listing.id == ListingSignature.listing_id)
+        .filter(ListingSignature.listing_id.in_(candidate_ids))
+        .all()
+    )
+    matches = []
+    for candidate_id, minhash, asking_price in rows:
+        if not prices_compatible(listing_any.asking_price, asking_price):
+            continue
+        similarity = estimate_similarity(signature, np.asarray(minhash, dtype=np.uint64))
+        if similarity >= SIMILARITY_THRESHOLD:
+            matches.append((candidate_id, round(similarity, 4)))
+    matches.sort(key=lambda match: match[1], reverse=True)
+    return matches
+
+
+def _leave_cluster(db: Session, listing_id: int) -> None:
+    """
+    Drop the listing's membership and re-check the members it was paired
+    with: they stay only if another member is still similar enough. The
+    cluster is re-rooted at its oldest remaining member, or dissolved once a
+    single member is left.
+    """
+    membership = (
+        db.query(DuplicateCluster).filter(DuplicateCluster.listing_id == listing_id).first()
+    )
+    if membership is None:
+        return
+    cluster_id = membership.cluster_id
+    db.delete(membership)
+    db.flush()
+
+    rest = db.query(DuplicateCluster).filter(DuplicateCluster.cluster_id == cluster_id).all()
+    signatures = {
+        row.listing_id: np.asarray(row.minhash, dtype=np.uint64)
+        for row in db.query(ListingSignature)
+        .filter(ListingSignature.listing_id.in_([row.listing_id for row in rest]))
+        .all()
+    }
+    kept = []
+    for row in rest:
+        row_any = cast(Any, row)
+        if row_any.matched_listing_id != listing_id:
+            kept.append(row)
+            continue
+        own = signatures.get(row_any.listing_id)
+        scored = [
+            (other.listing_id, round(estimate_similarity(own, signatures[other.listing_id]), 4))
+            for other in rest
+            if other is not row and own is not None and other.listing_id in signatures
+        ]
+        best = max(scored, key=lambda match: match[1], default=None)
+        if best is not None and best[1] >= SIMILARITY_THRESHOLD:
+            row_any.matched_listing_id, row_any.similarity = best
+            kept.append(row)
+        else:
+            db.delete(row)
+
+    if len(kept) < 2:
+        for row in kept:
+            db.delete(row)
+    else:
+        root = min(cast(int, row.listing_id) for row in kept)
+        for row in kept:
+            cast(Any, row).cluster_id = root
+    db.flush()
+
+
+def _merge_cluster(db: Session, listing_id: int, matches: List[Tuple[int, float]]) -> None:
+    """Union the listing, its matches and their existing clusters under the lowest id."""
+    member_ids = [listing_id] + [match_id for match_id, _similarity in matches]
+    memberships = {
+        row.listing_id: row
+        for row in db.query(DuplicateCluster)
+        .filter(DuplicateCluster.listing_id.in_(member_ids))
+        .all()
+    }
+    cluster_ids = {cast(int, row.cluster_id) for row in memberships.values()}
+    root = min(cluster_ids | set(member_ids))
+
+    stale = cluster_ids - {root}
+    if stale:
+        db.query(DuplicateCluster).filter(DuplicateCluster.cluster_id.in_(stale)).update(
+            {DuplicateCluster.cluster_id: root}, synchronize_session=False
+        )
+    for row in memberships.values():
+        cast(Any, row).cluster_id = root
+
+    best_id, best_similarity = matches[0]
+    pairings = {listing_id: (best_id, best_similarity)}
+    for match_id, similarity in matches:
+        pairings[match_id] = (listing_id, similarity)
+    for member_id, (matched_id, similarity) in pairings.items():
+        if member_id not in memberships:
+            db.add(
+                DuplicateCluster(
+                    listing_id=member_id,
+                    cluster_id=root,
+                    matched_listing_id=matched_id,
+                    similarity=similarity,
+                )
+            )
+
+
+def get_duplicates(db: Session, listing_id: int) -> List[Dict[str, Any]]:
+    """Other members of the listing's cluster, most similar first."""
+    membership = (
+        db.query(DuplicateCluster).filter(DuplicateCluster.listing_id == listing_id).first()
+    )
+    if membership is None:
+        return []
+    member_ids = [
+        row[0]
+        for row in db.query(DuplicateCluster.listing_id)
+        .filter(
+            DuplicateCluster.cluster_id == membership.cluster_id,
+            DuplicateCluster.listing_id != listing_id,
+        )
+        .all()
+    ]
+    signatures = {
+        row.listing_id: np.asarray(row.minhash, dtype=np.uint64)
+        for row in db.query(ListingSignature)
+        .filter(ListingSignature.listing_id.in_(member_ids + [listing_id]))
+        .all()
+    }
+    own = signatures.get(listing_id)
+    results = []
+    for listing in db.query(Listing).filter(Listing.id.in_(member_ids)).all():
+        other = signatures.get(cast(int, listing.id))
+        similarity = (
+            round(estimate_similarity(own, other), 4)
+            if own is not None and other is not None
+            else None
+        )
+        results.append(
+            {"cluster_id": membership.cluster_id, "listing": listing, "similarity": similarity}
+        )
+    results.sort(key=lambda row: row["similarity"] or 0, reverse=True)
+    return results
+
+
+def index_all_listings(db: Session, batch_size: int = 500) -> int:
+    """
+    Index every listing in id order, so cluster roots are the oldest listings.
+    Commits after each batch. Returns the number of listings processed.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        batch = (
+            db.query(Listing)
+            .options(joinedload(Listing.details))
+            .filter(Listing.id > last_id)
+            .order_by(Listing.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return processed
+        for listing in batch:
+            index_listing(db, listing)
+        db.commit()
+        processed += len(batch)
+        last_id = cast(int, batch[-1].id)
@@ -0,0 +1,391 @@
+"""Local embeddings and on-disk ANN search over BizBuySell listings.
+
+Listing + detail text is encoded in batches by a pluggable model and cached in
+listing_embeddings keyed by a hash of the embedded text, so a sync only
+encodes listings whose text changed. Vectors are mirrored into an on-disk
+index: hnswlib when installed, otherwise an exact NumPy index. Searches share
+one loaded index per process until a sync rewrites the file.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+
+from app.database import Listing, ListingEmbedding
+from app.services import listing_service
+
+
+DEFAULT_MODEL = "hashing"
+MAX_TEXT_CHARS = 4000
+SYNC_BATCH_SIZE = 256
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedder:
+    """
+    Dependency-free baseline: signed feature hashing of word unigrams and
+    bigrams. Matches on shared vocabulary only, but needs no model download.
+    """
+
+    def __init__(self, dim: int = 512) -> None:
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def encode(self, texts: Sequence[str], batch_size: int = 64) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _WORD.findall(text.lower())
+            for token in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                hashed = zlib.crc32(token.encode("utf-8"))
+                vectors[row, hashed % self.dim] += 1.0 if hashed & 0x80000000 else -1.0
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """Any sentence-transformers model, e.g. all-MiniLM-L6-v2, run locally."""
+
+    def __init__(self, model_name: str) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except Exception as exc:
+            raise RuntimeError(
+                "sentence-transformers not installed. Run: pip install sentence-transformers"
+            ) from exc
+        self.name = model_name
+        self._model = SentenceTransformer(model_name)
+        self.dim = int(self._model.get_sentence_embedding_dimension())
+
+    def encode(self, texts: Sequence[str], batch_size: int = 64) -> np.ndarray:
+        vectors = self._model.encode(
+            list(texts), batch_size=batch_size, normalize_embeddings=True
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+_models: Dict[str, Any] = {}
+
+
+def get_embedding_model(name: Optional[str] = None) -> Any:
+    """Model named by EMBEDDING_MODEL ("hashing" or a sentence-transformers name)."""
+    name = name or os.getenv("EMBEDDING_MODEL", DEFAULT_MODEL)
+    if name not in _models:
+        if name == DEFAULT_MODEL:
+            _models[name] = HashingEmbedder()
+        else:
+            _models[name] = SentenceTransformerEmbedder(name)
+    return _models[name]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class ExactIndex:
+    """Brute-force cosine index stored as ids + matrix in one .npz file."""
+
+    def __init__(self, path: Path, dim: int) -> None:
+        self.path = path.parent / f"{path.name}.npz"
+        self.dim = dim
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        if self.path.exists():
+            data = np.load(self.path)
+            self._ids, self._vectors = data["ids"], data["vectors"]
+
+    def __len__(self) -> int:
+        return int(self._ids.size)
+
+    def upsert(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        positions = {int(listing_id): row for row, listing_id in enumerate(self._ids)}
+        appended_ids, appended = [], []
+        for listing_id, vector in zip(ids, vectors):
+            row = positions.get(int(listing_id))
+            if row is None:
+                appended_ids.append(int(listing_id))
+                appended.append(vector)
+            else:
+                self._vectors[row] = vector
+        if appended_ids:
+            self._ids = np.concatenate([self._ids, np.asarray(appended_ids, dtype=np.int64)])
+            self._vectors = np.vstack([self._vectors, np.asarray(appended, dtype=np.float32)])
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        if not len(self):
+            return []
+        scores = self._vectors @ vector
+        k = min(k, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[row]), float(scores[row])) for row in top]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "wb") as handle:
+            np.savez(handle, ids=self._ids, vectors=self._vectors)
+
+
+class HnswIndex:
+    """hnswlib cosine index; listing ids are the labels, re-adding a label updates it."""
+
+    def __init__(self, path: Path, dim: int) -> None:
+        import hnswlib
+
+        self.path = path.parent / f"{path.name}.hnsw"
+        self.dim = dim
+        self._index = hnswlib.Index(space="cosine", dim=dim)
+        if self.path.exists():
+            self._index.load_index(str(self.path))
+        else:
+            self._index.init_index(max_elements=1024, ef_construction=200, M=16)
+        self._index.set_ef(64)
+
+    def __len__(self) -> int:
+        return int(self._index.get_current_count())
+
+    def upsert(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        if not len(ids):
+            return
+        needed = len(self) + len(ids)
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, self._index.get_max_elements() * 2))
+        self._index.add_items(vectors, np.asarray(ids, dtype=np.int64))
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        if not len(self):
+            return []
+        k = min(k, len(self))
+        self._index.set_ef(max(64, k))
+        labels, distances = self._index.knn_query(vector.reshape(1, -1), k=k)
+        return [
+            (int(label), 1.0 - float(distance))
+            for label, distance in zip(labels[0], distances[0])
+        ]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._index.save_index(str(self.path))
+
+
+def open_vector_index(model: Any, index_dir: Optional[str] = None) -> Any:
+    directory = Path(index_dir or os.getenv("EMBEDDING_INDEX_DIR", "data/embeddings"))
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model.name)
+    path = directory / f"listings-{slug}"
+    try:
+        import hnswlib  # noqa: F401
+    except ImportError:
+        return ExactIndex(path, model.dim)
+    return HnswIndex(path, model.dim)
+
+
+# (model name, dim, index_dir) -> (version, index) for searches in this process
+_open_indexes: Dict[Tuple[str, int, str], Tuple[Any, Any]] = {}
+_open_indexes_lock = threading.Lock()
+_index_generation = 0  # bumped by sync_embeddings in this process
+
+
+def _file_version(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def cached_vector_index(model: Any, index_dir: Optional[str] = None) -> Any:
+    """
+    open_vector_index, loaded once per process and reused by searches. It is
+    reloaded after a sync in this process, or when the index file's mtime or
+    size changes (a sync run elsewhere).
+    """
+    key = (model.name, model.dim, str(index_dir or ""))
+    with _open_indexes_lock:
+        cached = _open_indexes.get(key)
+        if cached is not None:
+            version, index = cached
+            # Stat before reloading, so a write during the load is seen next time
+            current = (_index_generation, _file_version(index.path))
+            if current == version:
+                return index
+        index = open_vector_index(model, index_dir)
+        if cached is None:
+            current = (_index_generation, _file_version(index.path))
+        _open_indexes[key] = (current, index)
+        return index
+
+
+def embedding_text(listing: Listing) -> str:
+    listing_any = cast(Any, listing)
+    detail = listing_any.details
+    parts = [
+        listing_any.title,
+        listing_any.business_category,
+        listing_any.location_raw
+        or ", ".join(filter(None, [listing_any.location_city, listing_any.location_state])),
+        listing_any.seller_reason_raw,
+    ]
+    if detail is not None:
+        parts += [detail.full_description, detail.reason_for_selling]
+    return "\n".join(part for part in parts if part)[:MAX_TEXT_CHARS]
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _rebuild_index(db: Session, model: Any, index: Any, batch_size: int) -> None:
+    """Load cached vectors into an index that lost track of them (no re-encoding)."""
+    last_id = 0
+    while True:
+        rows = (
+            db.query(ListingEmbedding.listing_id, ListingEmbedding.vector)
+            .filter(ListingEmbedding.model == model.name, ListingEmbedding.listing_id > last_id)
+            .order_by(ListingEmbedding.listing_id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return
+        index.upsert(
+            [row[0] for row in rows],
+            np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows]),
+        )
+        last_id = rows[-1][0]
+
+
+def sync_embeddings(
+    db: Session,
+    model: Any = None,
+    index_dir: Optional[str] = None,
+    batch_size: int = SYNC_BATCH_SIZE,
+    encode_batch_size: int = 64,
+) -> Dict[str, Any]:
+    """
+    Embed listings whose text changed since their cached embedding and update
+    the on-disk index. Each batch saves the index before committing its rows,
+    so after a crash the index is never behind the DB: a batch that did not
+    commit is still stale there and is encoded again. Returns counts of
+    listings scanned and encoded.
+    """
+    model = model or get_embedding_model()
+    index = open_vector_index(model, index_dir)
+    cached = (
+        db.query(func.count(ListingEmbedding.id))
+        .filter(ListingEmbedding.model == model.name)
+        .scalar()
+    )
+    if len(index) != cached:
+        _rebuild_index(db, model, index, batch_size)
+        index.save()
+
+    scanned = encoded = 0
+    last_id = 0
+    while True:
+        batch = (
+            db.query(Listing)
+            .options(joinedload(Listing.details))
+            .filter(Listing.id > last_id)
+            .order_by(Listing.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        ids = [cast(int, listing.id) for listing in batch]
+        existing = {
+            row.listing_id: row
+            for row in db.query(ListingEmbedding)
+            .filter(ListingEmbedding.listing_id.in_(ids))
+            .all()
+        }
+
+        stale: List[Tuple[int, str, str]] = []
+        for listing in batch:
+            text = embedding_text(listing)
+            text_hash = _text_hash(text)
+            row = existing.get(cast(int, listing.id))
+            if row is None or row.content_hash != text_hash or row.model != model.name:
+                stale.append((cast(int, listing.id), text, text_hash))
+
+        if stale:
+            vectors = model.encode([text for _id, text, _hash in stale], encode_batch_size)
+            for (listing_id, _text, text_hash), vector in zip(stale, vectors):
+                payload = np.asarray(vector, dtype=np.float32).tobytes()
+                row = existing.get(listing_id)
+                if row is None:
+                    db.add(
+                        ListingEmbedding(
+                            listing_id=listing_id,
+                            model=model.name,
+                            content_hash=text_hash,
+                            vector=payload,
+                        )
+                    )
+                else:
+                    row_any = cast(Any, row)
+                    row_any.model = model.name
+                    row_any.content_hash = text_hash
+                    row_any.vector = payload
+            index.upsert([listing_id for listing_id, _text, _hash in stale], vectors)
+            index.save()
+        db.commit()
+
+        scanned += len(batch)
+        encoded += len(stale)
+        last_id = ids[-1]
+
+    global _index_generation
+    with _open_indexes_lock:
+        _index_generation += 1
+    return {"model": model.name, "scanned": scanned, "encoded": encoded, "indexed": len(index)}
+
+
+def search_listings(
+    db: Session,
+    query: str,
+    limit: int = 10,
+    active_only: bool = True,
+    model: Any = None,
+    index_dir: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Listings closest to the query text, best first, as {"listing", "score"}."""
+    model = model or get_embedding_model()
+    index = cached_vector_index(model, index_dir)
+    vector = model.encode([query])[0]
+    # Over-fetch so inactive listings filtered below don't shrink the page
+    hits = index.search(vector, limit * 3 if active_only else limit)
+    if not hits:
+        return []
+    listings = {
+        listing.id: listing
+        for listing in db.query(Listing).filter(Listing.id.in_([hit[0] for hit in hits])).all()
+    }
+    results = []
+    for listing_id, score in hits:
+        listing = listings.get(listing_id)
+        if listing is None or (active_only and not listing.is_active):
+            continue
+        results.append({"listing": listing, "score": round(score, 4)})
+        if len(results) >= limit:
+            break
+    return results
+
+
+def index_info(model: Any = None, index_dir: Optional[str] = None) -> Dict[str, Any]:
+    model = model or get_embedding_model()
+    index = cached_vector_index(model, index_dir)
+    return {"model": model.name, "dim": model.dim, "indexed": len(index), "path": str(index.path)}
+
+
+def compact_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Small JSON-safe dict for agent tool output."""
+    return {**listing_service.compact_listing(result["listing"]), "score": result["score"]}
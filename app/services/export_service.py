@@ -1,12 +1,20 @@
-"""Export listings from SQLite to CSV."""
+"""Export listings from SQLite to CSV and Parquet."""
 
 import csv
-from datetime import datetime
-from typing import Optional
+import json
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
-from app.database import Listing
+from app.database import ExportWatermark, Listing, ListingDetail, ListingSnapshot
+
+PARQUET_BATCH_SIZE = 5000
+INCREMENTAL_FORMATS = ("csv", "parquet")
+_DESTINATION_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
 
 
 def export_listings_to_csv(
@@ -21,7 +29,7 @@ def export_listings_to_csv(
     if only_retirement:
         query = query.filter(Listing.is_retirement_listing.is_(True))
 
-    rows = query.order_by(Listing.last_updated_at.desc()).all()
+    rows = query.order_by(Listing.last_updated_at.desc()).yield_per(1000)
 
     fieldnames = [
         "external_id",
@@ -66,3 +74,334 @@ def export_listings_to_csv(
             )
 
     return output_path
+
+
+# Columns per table as (name, arrow type name); JSON columns are written as strings
+PARQUET_TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "listings": [
+        ("id", "int64"),
+        ("external_id", "string"),
+        ("title", "string"),
+        ("business_category", "string"),
+        ("asking_price", "int64"),
+        ("asking_price_raw", "string"),
+        ("location_city", "string"),
+        ("location_state", "string"),
+        ("location_raw", "string"),
+        ("revenue", "string"),
+        ("cash_flow", "string"),
+        ("revenue_num", "int64"),
+        ("cash_flow_num", "int64"),
+        ("inventory_num", "int64"),
+        ("multiple", "float64"),
+        ("seller_reason_raw", "string"),
+        ("url", "string"),
+        ("content_hash", "string"),
+        ("first_seen_at", "timestamp"),
+        ("last_updated_at", "timestamp"),
+        ("content_changed_at", "timestamp"),
+        ("is_active", "bool"),
+        ("is_retirement_listing", "bool"),
+    ],
+    "listing_details": [
+        ("id", "int64"),
+        ("listing_id", "int64"),
+        ("full_description", "string"),
+        ("financial_details", "json"),
+        ("years_in_business", "string"),
+        ("employees", "string"),
+        ("real_estate_included", "bool"),
+        ("inventory_value", "string"),
+        ("training_included", "bool"),
+        ("detailed_location", "string"),
+        ("reason_for_selling", "string"),
+        ("scraped_at", "timestamp"),
+        ("scrape_status", "string"),
+    ],
+    "listing_snapshots": [
+        ("id", "int64"),
+        ("listing_id", "int64"),
+        ("data_json", "json"),
+        ("content_hash", "string"),
+        ("created_at", "timestamp"),
+    ],
+}
+PARQUET_MODELS = {
+    "listings": Listing,
+    "listing_details": ListingDetail,
+    "listing_snapshots": ListingSnapshot,
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except Exception as exc:
+        raise RuntimeError("pyarrow not installed. Run: pip install pyarrow") from exc
+    return pyarrow, pyarrow.parquet
+
+
+def _arrow_schema(pa, table: str):
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "json": pa.string(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("us"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in PARQUET_TABLES[table]])
+
+
+def _column_batches(
+    rows: Iterable[Tuple], columns: List[Tuple[str, str]], batch_size: int
+) -> Iterable[Dict[str, List[Any]]]:
+    """Regroup row tuples into column lists of at most batch_size rows."""
+    json_positions = [i for i, (_name, kind) in enumerate(columns) if kind == "json"]
+    batch: Dict[str, List[Any]] = {name: [] for name, _kind in columns}
+    size = 0
+    for row in rows:
+        values = list(row)
+        for position in json_positions:
+            if values[position] is not None:
+                values[position] = json.dumps(values[position], default=str)
+        for (name, _kind), value in zip(columns, values):
+            batch[name].append(value)
+        size += 1
+        if size >= batch_size:
+            yield batch
+            batch = {name: [] for name, _kind in columns}
+            size = 0
+    if size:
+        yield batch
+
+
+class _PartitionWriter:
+    """Parquet writer that opens one file per snapshot_date partition."""
+
+    def __init__(self, pa, pq, schema, table_dir: Path, compression: str):
+        self.pa = pa
+        self.pq = pq
+        self.schema = schema
+        self.table_dir = table_dir
+        self.compression = compression
+        self.paths: List[str] = []
+        self._writers: Dict[str, Any] = {}
+
+    def write(self, partition: str, columns: Dict[str, List[Any]]) -> None:
+        writer = self._writers.get(partition)
+        if writer is None:
+            partition_dir = self.table_dir / f"snapshot_date={partition}"
+            partition_dir.mkdir(parents=True, exist_ok=True)
+            path = partition_dir / "part-0.parquet"
+            writer = self.pq.ParquetWriter(
+                str(path), self.schema, compression=self.compression
+            )
+            self._writers[partition] = writer
+            self.paths.append(str(path))
+        batch = self.pa.RecordBatch.from_pydict(columns, schema=self.schema)
+        writer.write_batch(batch)
+
+    def close(self, partition: Optional[str] = None) -> None:
+        partitions = [partition] if partition else list(self._writers)
+        for name in partitions:
+            writer = self._writers.pop(name, None)
+            if writer is not None:
+                writer.close()
+
+
+def export_to_parquet(
+    db: Session,
+    output_dir: str,
+    batch_size: int = PARQUET_BATCH_SIZE,
+    snapshot_date: Optional[date] = None,
+    compression: str = "zstd",
+) -> Dict[str, List[str]]:
+    """
+    Write listings, listing_details and listing_snapshots as Parquet datasets
+    under output_dir/<table>/snapshot_date=YYYY-MM-DD/.
+    Listings and details are partitioned by the export date (snapshot_date);
+    snapshots by the date they were recorded. Rows are streamed with
+    yield_per and written as Arrow record batches, so memory stays bounded
+    by batch_size. Returns the written file paths per table.
+    """
+    pa, pq = _require_pyarrow()
+    export_date = (snapshot_date or datetime.utcnow().date()).isoformat()
+    written: Dict[str, List[str]] = {}
+
+    for table, model in PARQUET_MODELS.items():
+        columns = PARQUET_TABLES[table]
+        schema = _arrow_schema(pa, table)
+        writer = _PartitionWriter(pa, pq, schema, Path(output_dir) / table, compression)
+        query = db.query(*[getattr(model, name) for name, _kind in columns])
+        try:
+            if table == "listing_snapshots":
+                rows = query.order_by(
+                    ListingSnapshot.created_at.asc(), ListingSnapshot.id.asc()
+                ).yield_per(batch_size)
+                _write_snapshot_partitions(writer, rows, columns, batch_size)
+            else:
+                rows = query.order_by(model.id.asc()).yield_per(batch_size)
+                for batch in _column_batches(rows, columns, batch_size):
+                    writer.write(export_date, batch)
+        finally:
+            writer.close()
+        written[table] = writer.paths
+
+    return written
+
+
+def _write_snapshot_partitions(
+    writer: _PartitionWriter,
+    rows: Iterable[Tuple],
+    columns: List[Tuple[str, str]],
+    batch_size: int,
+) -> None:
+    """Split rows ordered by created_at into one partition per calendar day."""
+    created_position = [name for name, _kind in columns].index("created_at")
+    current_day: Optional[str] = None
+    pending: List[Tuple] = []
+
+    def flush() -> None:
+        if current_day is not None and pending:
+            for batch in _column_batches(pending, columns, batch_size):
+                writer.write(current_day, batch)
+        pending.clear()
+
+    for row in rows:
+        day = row[created_position].date().isoformat()
+        if day != current_day:
+            flush()
+            if current_day is not None:
+                writer.close(current_day)
+            current_day = day
+        pending.append(tuple(row))
+        if len(pending) >= batch_size:
+            flush()
+    flush()
+
+
+def get_export_watermark(db: Session, destination: str) -> Optional[ExportWatermark]:
+    return (
+        db.query(ExportWatermark)
+        .filter(ExportWatermark.destination == destination)
+        .first()
+    )
+
+
+def reset_export_watermark(db: Session, destination: str) -> None:
+    """Make the next incremental export for destination a full dump."""
+    watermark = get_export_watermark(db, destination)
+    if watermark is not None:
+        db.delete(watermark)
+        db.flush()
+
+
+def export_listings_incremental(
+    db: Session,
+    destination: str,
+    output_dir: str,
+    fmt: str = "csv",
+    batch_size: int = 1000,
+) -> Dict[str, Any]:
+    """
+    Write listings changed since the destination's watermark to a new append
+    file plus a JSON upsert manifest (keyed on external_id), then advance the
+    watermark. Rows are read in (content_changed_at, id) order so the
+    watermark is a keyset position; content_changed_at only moves when the
+    card, detail page or financial columns change, so a recrawl that finds
+    nothing new exports nothing. Inactive listings are included so downstream
+    can apply deactivations. The caller commits: if that fails the same rows are
+    exported again next time, which is safe for an upsert consumer.
+    """
+    if fmt not in INCREMENTAL_FORMATS:
+        raise ValueError(f"fmt must be one of {', '.join(INCREMENTAL_FORMATS)}")
+    if not _DESTINATION_NAME.match(destination):
+        raise ValueError("destination may only contain letters, digits, '.', '_' and '-'")
+
+    watermark = get_export_watermark(db, destination)
+    if watermark is None:
+        watermark = ExportWatermark(destination=destination, rows_exported=0)
+        db.add(watermark)
+        db.flush()
+    since_at, since_id = watermark.last_changed_at, watermark.last_id
+
+    columns = PARQUET_TABLES["listings"]
+    query = db.query(*[getattr(Listing, name) for name, _kind in columns])
+    if since_at is not None:
+        query = query.filter(
+            Listing.content_changed_at >= since_at,
+            or_(Listing.content_changed_at > since_at, Listing.id > (since_id or 0)),
+        )
+    rows = query.order_by(Listing.content_changed_at.asc(), Listing.id.asc()).yield_per(
+        batch_size
+    )
+
+    created_at = datetime.utcnow()
+    target_dir = Path(output_dir) / destination
+    target_dir.mkdir(parents=True, exist_ok=True)
+    file_path = target_dir / f"listings-{created_at:%Y%m%dT%H%M%S%f}.{fmt}"
+
+    names = [name for name, _kind in columns]
+    changed_position, id_position = names.index("content_changed_at"), names.index("id")
+    last_row: Optional[Tuple] = None
+    count = 0
+
+    def tracked(source: Iterable[Tuple]) -> Iterable[Tuple]:
+        nonlocal count, last_row
+        for row in source:
+            last_row = row
+            count += 1
+            yield row
+
+    if fmt == "csv":
+        with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(names)
+            for batch in _column_batches(tracked(rows), columns, batch_size):
+                writer.writerows(zip(*batch.values()))
+    else:
+        pa, pq = _require_pyarrow()
+        schema = _arrow_schema(pa, "listings")
+        with pq.ParquetWriter(str(file_path), schema, compression="zstd") as writer:
+            for batch in _column_batches(tracked(rows), columns, batch_size):
+                writer.write_batch(pa.RecordBatch.from_pydict(batch, schema=schema))
+
+    if count == 0:
+        file_path.unlink()
+        return {"destination": destination, "rows": 0, "file": None, "manifest": None}
+
+    assert last_row is not None
+    watermark_to = {
+        "last_changed_at": last_row[changed_position],
+        "last_id": last_row[id_position],
+    }
+    manifest = {
+        "destination": destination,
+        "table": "listings",
+        "mode": "upsert",
+        "key": "external_id",
+        "format": fmt,
+        "file": file_path.name,
+        "rows": count,
+        "created_at": created_at,
+        "watermark_from": {"last_changed_at": since_at, "last_id": since_id},
+        "watermark_to": watermark_to,
+    }
+    manifest_path = file_path.with_name(file_path.stem + ".manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, default=str)
+
+    watermark_any = cast(Any, watermark)
+    watermark_any.last_changed_at = watermark_to["last_changed_at"]
+    watermark_any.last_id = watermark_to["last_id"]
+    watermark_any.rows_exported = (watermark_any.rows_exported or 0) + count
+    db.flush()
+
+    return {
+        "destination": destination,
+        "rows": count,
+        "file": str(file_path),
+        "manifest": str(manifest_path),
+    }
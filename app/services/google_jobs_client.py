@@ -1,13 +1,21 @@
 from typing import Any
 import os
-import httpx
+
+from app.services.serpapi_cache import SerpApiCache, get_serpapi_json, resolve_cache
 
 
 class GoogleJobsClient:
     """Client for SerpAPI Google Jobs search service."""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache: SerpApiCache | None = None,
+        use_cache: bool = True,
+    ):
         self.api_key = api_key or os.getenv("SERPAPI_API_KEY")
+        self.cache = cache
+        self.use_cache = use_cache
         if not self.api_key:
             raise ValueError("SERPAPI_API_KEY not provided or found in environment")
         self.base_url = "https://serpapi.com/search"
@@ -50,10 +58,9 @@ class GoogleJobsClient:
         if next_page_token:
             params["next_page_token"] = next_page_token
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(self.base_url, params=params)
-            response.raise_for_status()
-            return response.json()
+        return await get_serpapi_json(
+            self.base_url, params, cache=resolve_cache(self.cache, self.use_cache)
+        )
 
     async def search_jobs_with_filters(
         self,
@@ -0,0 +1,246 @@
+"""EXPLAIN QUERY PLAN checks for the SQL behind listing_service and the API.
+
+Each hot path runs against a session while every SELECT it issues is
+recorded; the statements are then explained and any full table scan is
+reported. A SCAN counts as one unless it walks an index, the statement
+stops at a LIMIT and nothing is filtered through a non-sargable LIKE or
+lower(): a keyword that matches few rows still reads every row before the
+LIMIT is reached. Paths in KNOWN_FULL_SCANS are reported but tolerated.
+SQLite only.
+
+Run with: python -m app.services.index_advisor
+"""
+
+import argparse
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import DATABASE_URL, Listing, ScrapeRun
+from app.services import (
+    analytics_service,
+    dedupe_service,
+    export_service,
+    lead_service,
+    listing_service,
+)
+
+
+_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(?P<table>\w+)(?P<rest>.*)$")
+_LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+_NON_SARGABLE = re.compile(r"\bLIKE\b|\blower\(", re.IGNORECASE)
+_SINCE = datetime(2024, 1, 1)
+
+_SAMPLE_LISTING = {
+    "external_id": "advisor-0",
+    "title": "Index Advisor Sample HVAC Company",
+    "url": "https://www.bizbuysell.com/business-opportunity/advisor-0/",
+    "asking_price": 500_000,
+    "location_state": "TN",
+}
+
+_SAMPLE_LEAD = {
+    "vendor_name": "Index Advisor Sample Coffee",
+    "city": "Memphis",
+    "raw_data": {"query": "coffee shops", "place_id": "advisor-place-0", "rating": 4.5},
+}
+
+# Queries run on every scrape, page view or agent turn. Whole-table
+# reporting (stats counts, exports, analytics frame loads) is left out.
+HOT_PATHS: Dict[str, Callable[[Session], Any]] = {
+    "save_or_update_listing": lambda db: listing_service.save_or_update_listing(
+        db, dict(_SAMPLE_LISTING)
+    ),
+    "get_listing_by_external_id": lambda db: listing_service.get_listing_by_external_id(
+        db, "advisor-0"
+    ),
+    "get_listing_by_id": lambda db: listing_service.get_listing_by_id(db, 1),
+    "queue_listing_for_details": lambda db: listing_service.queue_listing_for_details(db, 1),
+    "get_pending_detail_scrapes": lambda db: listing_service.get_pending_detail_scrapes(db),
+    "get_crawl_checkpoint": lambda db: listing_service.get_crawl_checkpoint(db, 1),
+    "get_resumable_search_run": lambda db: listing_service.get_resumable_search_run(
+        db, "https://www.bizbuysell.com/tennessee-businesses-for-sale/"
+    ),
+    "get_due_search_targets": lambda db: listing_service.get_due_search_targets(db),
+    "search_listings_by_state": lambda db: listing_service.search_listings(
+        db, {"is_active": True, "state": "TN"}, limit=25
+    ),
+    "search_listings_by_price": lambda db: listing_service.search_listings(
+        db, {"min_price": 100_000, "max_price": 900_000}, sort_by="asking_price", limit=25
+    ),
+    "search_listings_by_cash_flow": lambda db: listing_service.search_listings(
+        db, {"min_cash_flow": 200_000}, sort_by="cash_flow", limit=25
+    ),
+    "search_listings_by_multiple": lambda db: listing_service.search_listings(
+        db, {"max_multiple": 3.0}, sort_by="multiple", descending=False, limit=25
+    ),
+    # GET /listings fetches one row past the page for X-Next-Offset
+    "list_listings_default": lambda db: listing_service.search_listings(
+        db, {"is_active": True}, limit=101
+    ),
+    # listing_tools.search_listings fetches one row past the page for has_more
+    "listing_tools_keyword_search": lambda db: listing_service.search_listings(
+        db, {"is_active": True, "keyword": "HVAC"}, limit=11
+    ),
+    "listing_tools_category_search": lambda db: listing_service.search_listings(
+        db, {"is_active": True, "category": "restaurant"}, limit=11
+    ),
+    "get_new_listings": lambda db: listing_service.get_new_listings(db, _SINCE, limit=25),
+    "get_price_history": lambda db: listing_service.get_price_history(db, 1),
+    "get_duplicates": lambda db: dedupe_service.get_duplicates(db, 1),
+    "analytics_refresh_token": lambda db: analytics_service._refresh_token(db),
+    "get_export_watermark": lambda db: export_service.get_export_watermark(db, "default"),
+    "incremental_export_scan": lambda db: db.query(Listing.id)
+    .filter(Listing.content_changed_at >= _SINCE)
+    .order_by(Listing.content_changed_at.asc(), Listing.id.asc())
+    .limit(1000)
+    .all(),
+    "upsert_leads": lambda db: lead_service.upsert_leads(db, [dict(_SAMPLE_LEAD)]),
+    "get_leads_by_niche_city": lambda db: lead_service.get_leads(
+        db, niche="coffee shops", city="Memphis", limit=25
+    ),
+    "get_leads_updated_since": lambda db: lead_service.get_leads(
+        db, updated_since=_SINCE, limit=25
+    ),
+    "get_lead_history": lambda db: lead_service.get_lead_history(db, 1),
+    "recent_scrape_runs": lambda db: db.query(ScrapeRun)
+    .order_by(ScrapeRun.started_at.desc())
+    .limit(50)
+    .all(),
+}
+
+# Hot paths that still read the whole table, with the follow-up that fixes them
+KNOWN_FULL_SCANS: Dict[str, str] = {
+    "listing_tools_keyword_search": "ilike on title; needs an FTS5 index over titles",
+    "listing_tools_category_search": "ilike on category; needs an FTS5 index or a category lookup",
+}
+
+
+@contextmanager
+def record_selects(engine: Engine) -> Iterator[List[Tuple[str, Any]]]:
+    """Collect (statement, parameters) for every SELECT run on engine."""
+    recorded: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            recorded.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield recorded
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(db: Session, statement: str, parameters: Any = ()) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for one statement."""
+    rows = db.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters or ()
+    )
+    return [str(row[-1]) for row in rows]
+
+
+def full_scans(plan: List[str], statement: str = "") -> List[str]:
+    """
+    Tables the statement may read in full: every SCAN, unless it walks an
+    index in the order the statement needs, a LIMIT stops it early and no
+    LIKE or lower() filter can reject row after row first.
+    SEARCH lines (index lookups and ranges) are fine.
+    """
+    bounded = (
+        bool(_LIMIT.search(statement))
+        and not _NON_SARGABLE.search(statement)
+        and not any("USE TEMP B-TREE" in line for line in plan)
+    )
+    tables = []
+    for line in plan:
+        match = _FULL_SCAN.match(line.strip())
+        if match and not (bounded and "USING" in match.group("rest")):
+            tables.append(match.group("table"))
+    return tables
+
+
+def analyze_hot_paths(
+    db: Session, hot_paths: Dict[str, Callable[[Session], Any]] = HOT_PATHS
+) -> List[Dict[str, Any]]:
+    """
+    Run each hot path, explain the SELECTs it issued and roll back.
+    Returns one report per statement with its plan and full scans.
+    """
+    engine = db.get_bind()
+    reports = []
+    for name, run in hot_paths.items():
+        with record_selects(engine) as recorded:
+            run(db)
+        for statement, parameters in recorded:
+            plan = explain(db, statement, parameters)
+            reports.append(
+                {
+                    "path": name,
+                    "statement": " ".join(statement.split()),
+                    "plan": plan,
+                    "full_scans": full_scans(plan, statement),
+                    "known": KNOWN_FULL_SCANS.get(name),
+                }
+            )
+        db.rollback()
+    return reports
+
+
+def _copy_sqlite_database(url: str) -> Engine:
+    """In-memory copy of a SQLite database, so analysis never writes to it."""
+    source_path = url.split("sqlite:///", 1)[1]
+    memory = sqlite3.connect(":memory:", check_same_thread=False)
+    source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+    try:
+        source.backup(memory)
+    finally:
+        source.close()
+    memory.execute("ANALYZE")
+    return create_engine("sqlite://", creator=lambda: memory, poolclass=StaticPool)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check hot-path query plans for full scans")
+    parser.add_argument("--database-url", default=DATABASE_URL, help="SQLite database URL")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if not args.database_url.startswith("sqlite:///"):
+        raise SystemExit("The index advisor only supports file-backed SQLite databases")
+    engine = _copy_sqlite_database(args.database_url)
+    db = sessionmaker(bind=engine)()
+    try:
+        reports = analyze_hot_paths(db)
+    finally:
+        db.close()
+
+    problems = [r for r in reports if r["full_scans"] and not r["known"]]
+    known = [r for r in reports if r["full_scans"] and r["known"]]
+    for report in reports:
+        if args.verbose or report["full_scans"]:
+            print(f"[{report['path']}] {report['statement']}")
+            if report["full_scans"] and report["known"]:
+                print(f"    known full scan: {report['known']}")
+            for line in report["plan"]:
+                print(f"    {line}")
+    print(
+        f"{len(reports)} statements checked, {len(problems)} with full table scans"
+        f" ({len(known)} known)"
+    )
+    if problems:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
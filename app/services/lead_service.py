@@ -0,0 +1,212 @@
+"""Database operations for leadgen leads (Google Maps places)."""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, cast
+
+from sqlalchemy.orm import Session
+
+from app.database import IngestRun, Lead, LeadObservation, compute_content_hash
+
+LOOKUP_BATCH_SIZE = 500
+
+
+def _number(value: Any, kind: type) -> Any:
+    try:
+        return kind(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def lead_values(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Lead column values for an ingest record (see GoogleMapsIngest)."""
+    raw = record.get("raw_data") or {}
+    gps = raw.get("gps_coordinates") or {}
+    return {
+        "data_id": raw.get("data_id"),
+        "source": record.get("source") or "google_maps",
+        "name": record.get("vendor_name") or "",
+        "city": record.get("city"),
+        "state": record.get("state"),
+        "address": raw.get("address"),
+        "phone": raw.get("phone"),
+        "website": raw.get("website"),
+        "category": raw.get("type") or record.get("contract_category"),
+        "rating": _number(raw.get("rating"), float),
+        "reviews": _number(raw.get("reviews"), int),
+        "latitude": _number(gps.get("latitude"), float),
+        "longitude": _number(gps.get("longitude"), float),
+        "source_url": record.get("source_url"),
+        "raw_data": record,
+    }
+
+
+def create_ingest_run(
+    db: Session, query: str, location: str, source: str = "google_maps"
+) -> IngestRun:
+    run = IngestRun(source=source, query=query, location=location)
+    db.add(run)
+    db.flush()
+    return run
+
+
+def complete_ingest_run(
+    db: Session, run: IngestRun, stats: Dict[str, Any], error: Optional[str] = None
+) -> None:
+    run_any = cast(Any, run)
+    for key in ("records_fetched", "new_leads", "updated_leads"):
+        if key in stats:
+            setattr(run_any, key, stats[key])
+    run_any.completed_at = datetime.utcnow()
+    run_any.status = "failed" if error else "completed"
+    run_any.error_message = error
+    db.flush()
+
+
+def _existing_leads(db: Session, place_ids: List[str]) -> Dict[str, Lead]:
+    found: Dict[str, Lead] = {}
+    for i in range(0, len(place_ids), LOOKUP_BATCH_SIZE):
+        batch = place_ids[i : i + LOOKUP_BATCH_SIZE]
+        for lead in db.query(Lead).filter(Lead.place_id.in_(batch)):
+            found[str(lead.place_id)] = lead
+    return found
+
+
+def upsert_leads(
+    db: Session,
+    records: Iterable[Dict[str, Any]],
+    run: Optional[IngestRun] = None,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    Insert or update leads by place_id. Every seen lead gets last_seen_at;
+    changed records also get last_updated_at, and a rating/review change
+    (or a new lead) adds a LeadObservation. Records without a place_id
+    are skipped. Returns {new, updated, unchanged, skipped}.
+    """
+    now = now or datetime.utcnow()
+    run_id = run.id if run is not None else None
+    keyed: Dict[str, Dict[str, Any]] = {}
+    stats = {"new": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+    for record in records:
+        place_id = str((record.get("raw_data") or {}).get("place_id") or "").strip()
+        if not place_id:
+            stats["skipped"] += 1
+            continue
+        keyed[place_id] = record  # a later copy of the same place wins
+
+    existing = _existing_leads(db, list(keyed))
+    for place_id, record in keyed.items():
+        values = lead_values(record)
+        content_hash = compute_content_hash(record)
+        lead = existing.get(place_id)
+        if lead is None:
+            lead = Lead(
+                place_id=place_id,
+                niche=(record.get("raw_data") or {}).get("query"),
+                content_hash=content_hash,
+                last_run_id=run_id,
+                first_seen_at=now,
+                last_seen_at=now,
+                last_updated_at=now,
+                **values,
+            )
+            db.add(lead)
+            db.flush()
+            db.add(
+                LeadObservation(
+                    lead_id=lead.id,
+                    run_id=run_id,
+                    rating=values["rating"],
+                    reviews=values["reviews"],
+                    observed_at=now,
+                )
+            )
+            stats["new"] += 1
+            continue
+
+        lead_any = cast(Any, lead)
+        lead_any.last_seen_at = now
+        lead_any.last_run_id = run_id
+        if str(lead.content_hash) == content_hash:
+            stats["unchanged"] += 1
+            continue
+        if (lead_any.rating, lead_any.reviews) != (values["rating"], values["reviews"]):
+            db.add(
+                LeadObservation(
+                    lead_id=lead.id,
+                    run_id=run_id,
+                    rating=values["rating"],
+                    reviews=values["reviews"],
+                    observed_at=now,
+                )
+            )
+        for key, value in values.items():
+            setattr(lead_any, key, value)
+        lead_any.content_hash = content_hash
+        lead_any.last_updated_at = now
+        stats["updated"] += 1
+    db.flush()
+    return stats
+
+
+def record_ingest(
+    db: Session, query: str, location: str, records: List[Dict[str, Any]]
+) -> tuple[IngestRun, Dict[str, int]]:
+    """Log an ingest run and upsert its records in one step."""
+    run = create_ingest_run(db, query, location)
+    stats = upsert_leads(db, records, run=run)
+    complete_ingest_run(
+        db,
+        run,
+        {
+            "records_fetched": len(records),
+            "new_leads": stats["new"],
+            "updated_leads": stats["updated"],
+        },
+    )
+    return run, stats
+
+
+def get_leads(
+    db: Session,
+    niche: Optional[str] = None,
+    city: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Lead]:
+    query = db.query(Lead)
+    if niche is not None:
+        query = query.filter(Lead.niche == niche)
+    if city is not None:
+        query = query.filter(Lead.city == city)
+    if updated_since is not None:
+        query = query.filter(Lead.last_updated_at >= updated_since).order_by(
+            Lead.last_updated_at.asc(), Lead.id.asc()
+        )
+    else:
+        query = query.order_by(Lead.id.asc())
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def get_lead_records(db: Session, **filters: Any) -> List[Dict[str, Any]]:
+    """Latest ingest records of get_leads(**filters), ready for the exporters."""
+    return [cast(Dict[str, Any], lead.raw_data) for lead in get_leads(db, **filters)]
+
+
+def get_lead_history(db: Session, lead_id: int) -> List[Dict[str, Any]]:
+    """Oldest-first rating / review count observations of a lead."""
+    rows = (
+        db.query(LeadObservation.observed_at, LeadObservation.rating, LeadObservation.reviews)
+        .filter(LeadObservation.lead_id == lead_id)
+        .order_by(LeadObservation.observed_at.asc(), LeadObservation.id.asc())
+        .all()
+    )
+    return [
+        {"date": observed_at.isoformat(), "rating": rating, "reviews": reviews}
+        for observed_at, rating, reviews in rows
+    ]
@@ -1,19 +1,78 @@
 """Database operations for BizBuySell listings."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, cast
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 
 from app.database import (
+    CrawlCheckpoint,
     Listing,
     ListingDetail,
+    ListingDetailChange,
     ListingSnapshot,
     ScrapingQueue,
     ScrapeRun,
+    SearchTarget,
     UserAction,
     compute_content_hash,
 )
+from app.parsers.financials import (
+    CASH_FLOW_LABELS,
+    INVENTORY_LABELS,
+    REVENUE_LABELS,
+    find_money,
+    parse_money,
+    price_to_cash_flow_multiple,
+)
+from app.services import dedupe_service
+
+
+FINANCIAL_COLUMNS = ("revenue_num", "cash_flow_num", "inventory_num", "multiple")
+DETAIL_CONTENT_FIELDS = (
+    "full_description",
+    "financial_details",
+    "years_in_business",
+    "employees",
+    "real_estate_included",
+    "inventory_value",
+    "training_included",
+    "detailed_location",
+    "reason_for_selling",
+)
+
+
+def apply_financial_fields(
+    listing: Listing, detail: Optional[ListingDetail] = None
+) -> bool:
+    """
+    Fill the numeric financial columns from the raw listing strings, falling
+    back to the detail page's financial_details for values the search card
+    does not show. Returns whether any of the columns changed.
+    """
+    listing_any = cast(Any, listing)
+    detail_any = cast(Any, detail)
+    financial_details = detail_any.financial_details if detail is not None else None
+
+    revenue = parse_money(listing_any.revenue)
+    if revenue is None:
+        revenue = find_money(financial_details, REVENUE_LABELS)
+    cash_flow = parse_money(listing_any.cash_flow)
+    if cash_flow is None:
+        cash_flow = find_money(financial_details, CASH_FLOW_LABELS)
+    inventory = parse_money(detail_any.inventory_value) if detail is not None else None
+    if inventory is None:
+        inventory = find_money(financial_details, INVENTORY_LABELS)
+
+    before = [getattr(listing_any, name) for name in FINANCIAL_COLUMNS]
+    listing_any.revenue_num = revenue
+    listing_any.cash_flow_num = cash_flow
+    listing_any.inventory_num = inventory
+    listing_any.multiple = price_to_cash_flow_multiple(
+        listing_any.asking_price, cash_flow
+    )
+    return before != [getattr(listing_any, name) for name in FINANCIAL_COLUMNS]
 
 
 def get_listing_by_external_id(db: Session, external_id: str) -> Optional[Listing]:
@@ -50,6 +109,7 @@ def save_or_update_listing(
             content_hash=content_hash,
             is_retirement_listing=listing_data.get("is_retirement_listing", False),
         )
+        apply_financial_fields(listing)
         db.add(listing)
         db.flush()
 
@@ -59,6 +119,7 @@ def save_or_update_listing(
             content_hash=content_hash,
         )
         db.add(snapshot)
+        dedupe_service.index_listing(db, listing)
         return listing, True, False
 
     if str(existing.content_hash) != content_hash:
@@ -91,8 +152,10 @@ def save_or_update_listing(
         existing_any.is_retirement_listing = listing_data.get(
             "is_retirement_listing", existing_any.is_retirement_listing
         )
+        apply_financial_fields(existing, existing_any.details)
         existing_any.content_hash = content_hash  # type: ignore[assignment]
         existing_any.last_updated_at = datetime.utcnow()  # type: ignore[assignment]
+        existing_any.content_changed_at = existing_any.last_updated_at
 
         snapshot = ListingSnapshot(
             listing_id=existing.id,
@@ -100,6 +163,7 @@ def save_or_update_listing(
             content_hash=content_hash,
         )
         db.add(snapshot)
+        dedupe_service.index_listing(db, existing)
         return existing, False, True
 
     existing_any = cast(Any, existing)
@@ -138,6 +202,10 @@ def get_pending_detail_scrapes(db: Session, limit: int = 50) -> List[ScrapingQue
     )
 
 
+def count_pending_detail_scrapes(db: Session) -> int:
+    return db.query(ScrapingQueue).filter(ScrapingQueue.status == "pending").count()
+
+
 def get_listing_by_id(db: Session, listing_id: int) -> Optional[Listing]:
     return db.query(Listing).filter(Listing.id == listing_id).first()
 
@@ -148,27 +216,66 @@ def save_listing_detail(
     existing = (
         db.query(ListingDetail).filter(ListingDetail.listing_id == listing_id).first()
     )
+    changed = existing is None
     if existing:
         existing_any = cast(Any, existing)
         for key, value in detail_data.items():
             if hasattr(existing_any, key):
+                if key in DETAIL_CONTENT_FIELDS and getattr(existing_any, key) != value:
+                    changed = True
                 setattr(existing_any, key, value)
         existing_any.scrape_status = "completed"  # type: ignore[assignment]
         existing_any.scraped_at = datetime.utcnow()  # type: ignore[assignment]
-        db.flush()
-        return existing
+        detail = existing
+    else:
+        detail = ListingDetail(
+            listing_id=listing_id,
+            scrape_status="completed",
+            scraped_at=datetime.utcnow(),
+            **detail_data,
+        )
+        db.add(detail)
 
-    detail = ListingDetail(
-        listing_id=listing_id,
-        scrape_status="completed",
-        scraped_at=datetime.utcnow(),
-        **detail_data,
-    )
-    db.add(detail)
+    if changed and existing is not None:
+        db.add(ListingDetailChange(listing_id=listing_id))
+
+    listing = get_listing_by_id(db, listing_id)
+    if listing:
+        if apply_financial_fields(listing, detail) or changed:
+            cast(Any, listing).content_changed_at = datetime.utcnow()
     db.flush()
+    if listing:
+        dedupe_service.index_listing(db, listing, detail)
     return detail
 
 
+def backfill_financial_fields(db: Session, batch_size: int = 500) -> int:
+    """
+    Recompute numeric financial columns for every listing in id order.
+    Commits after each batch so large tables are not held in one transaction.
+    Returns the number of listings processed.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        batch = (
+            db.query(Listing)
+            .options(joinedload(Listing.details))
+            .filter(Listing.id > last_id)
+            .order_by(Listing.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return processed
+        for listing in batch:
+            if apply_financial_fields(listing, listing.details):
+                cast(Any, listing).content_changed_at = datetime.utcnow()
+        db.commit()
+        processed += len(batch)
+        last_id = cast(int, batch[-1].id)
+
+
 def mark_queue_processing(db: Session, queue_item: ScrapingQueue) -> None:
     queue_any = cast(Any, queue_item)
     queue_any.status = "processing"  # type: ignore[assignment]
@@ -191,8 +298,10 @@ def mark_queue_failed(db: Session, queue_item: ScrapingQueue, error: str) -> Non
     db.flush()
 
 
-def create_scrape_run(db: Session, run_type: str) -> ScrapeRun:
-    run = ScrapeRun(run_type=run_type)
+def create_scrape_run(
+    db: Session, run_type: str, target_id: Optional[int] = None
+) -> ScrapeRun:
+    run = ScrapeRun(run_type=run_type, target_id=target_id)
     db.add(run)
     db.flush()
     return run
@@ -209,8 +318,298 @@ def update_scrape_run(db: Session, run_id: int, stats: Dict) -> None:
     db.flush()
 
 
-def get_new_listings(db: Session, since_date: datetime) -> List[Listing]:
-    return db.query(Listing).filter(Listing.first_seen_at >= since_date).all()
+def get_crawl_checkpoint(db: Session, run_id: int) -> Optional[CrawlCheckpoint]:
+    return (
+        db.query(CrawlCheckpoint).filter(CrawlCheckpoint.scrape_run_id == run_id).first()
+    )
+
+
+def save_crawl_checkpoint(
+    db: Session,
+    run_id: int,
+    start_url: str,
+    last_completed_url: Optional[str],
+    next_url: Optional[str],
+    visited_urls: List[str],
+    stats: Dict,
+) -> CrawlCheckpoint:
+    """
+    Persist crawl progress for a search run.
+    Callers commit together with the page's listing upserts so the checkpoint
+    never points past data that was not saved.
+    """
+    checkpoint = get_crawl_checkpoint(db, run_id)
+    if not checkpoint:
+        checkpoint = CrawlCheckpoint(scrape_run_id=run_id, start_url=start_url)
+        db.add(checkpoint)
+
+    checkpoint_any = cast(Any, checkpoint)
+    checkpoint_any.last_completed_url = last_completed_url
+    checkpoint_any.next_url = next_url
+    # Assign fresh containers so the JSON columns are flagged as modified
+    checkpoint_any.visited_urls = list(visited_urls)
+    checkpoint_any.stats = dict(stats)
+    checkpoint_any.pages_completed = len(visited_urls)
+    checkpoint_any.updated_at = datetime.utcnow()
+    db.flush()
+    return checkpoint
+
+
+def get_resumable_search_run(db: Session, start_url: str) -> Optional[ScrapeRun]:
+    """
+    Return the latest search run for start_url if it was interrupted mid-crawl.
+    A run is resumable when it never completed and its checkpoint still has a
+    page left to fetch.
+    """
+    latest = (
+        db.query(ScrapeRun)
+        .join(CrawlCheckpoint, CrawlCheckpoint.scrape_run_id == ScrapeRun.id)
+        .filter(ScrapeRun.run_type == "search")
+        .filter(CrawlCheckpoint.start_url == start_url)
+        .order_by(ScrapeRun.started_at.desc(), ScrapeRun.id.desc())
+        .first()
+    )
+    if not latest or latest.status not in {"running", "failed"}:
+        return None
+    if not latest.checkpoint or not latest.checkpoint.next_url:
+        return None
+    return latest
+
+
+def get_search_target_by_url(db: Session, url: str) -> Optional[SearchTarget]:
+    return db.query(SearchTarget).filter(SearchTarget.url == url).first()
+
+
+def create_search_target(
+    db: Session,
+    url: str,
+    name: Optional[str] = None,
+    cadence_minutes: Optional[int] = None,
+    priority: int = 0,
+    enabled: bool = True,
+) -> SearchTarget:
+    """
+    Without cadence_minutes the target starts daily and the adaptive planner
+    (cadence_service) tunes it; an explicit cadence is kept as set.
+    """
+    if get_search_target_by_url(db, url):
+        raise ValueError(f"Search target already exists for {url}")
+    target = SearchTarget(
+        url=url,
+        name=name,
+        cadence_minutes=cadence_minutes if cadence_minutes is not None else 1440,
+        cadence_override=cadence_minutes is not None,
+        priority=priority,
+        enabled=enabled,
+    )
+    db.add(target)
+    db.flush()
+    return target
+
+
+def get_enabled_search_targets(db: Session) -> List[SearchTarget]:
+    return (
+        db.query(SearchTarget)
+        .filter(SearchTarget.enabled.is_(True))
+        .order_by(SearchTarget.priority.desc(), SearchTarget.id.asc())
+        .all()
+    )
+
+
+def get_due_search_targets(
+    db: Session, now: Optional[datetime] = None
+) -> List[SearchTarget]:
+    """Enabled targets whose cadence has elapsed, highest priority first."""
+    now = now or datetime.utcnow()
+    due = []
+    for target in get_enabled_search_targets(db):
+        last_run_at = cast(Optional[datetime], target.last_run_at)
+        cadence = timedelta(minutes=int(cast(Any, target.cadence_minutes) or 0))
+        if last_run_at is None or last_run_at + cadence <= now:
+            due.append(target)
+    return due
+
+
+def update_search_target(db: Session, target_id: int, values: Dict) -> None:
+    target = db.query(SearchTarget).filter(SearchTarget.id == target_id).first()
+    if not target:
+        return
+
+    for key, value in values.items():
+        if hasattr(target, key):
+            setattr(target, key, value)
+    db.flush()
+
+
+def mark_search_target_run(
+    db: Session, target_id: int, run_at: Optional[datetime] = None
+) -> None:
+    target = db.query(SearchTarget).filter(SearchTarget.id == target_id).first()
+    if target:
+        target_any = cast(Any, target)
+        target_any.last_run_at = run_at or datetime.utcnow()  # type: ignore[assignment]
+        db.flush()
+
+
+LISTING_SORT_COLUMNS = {
+    "last_updated_at": Listing.last_updated_at,
+    "first_seen_at": Listing.first_seen_at,
+    "asking_price": Listing.asking_price,
+    "cash_flow": Listing.cash_flow_num,
+    "revenue": Listing.revenue_num,
+    "inventory": Listing.inventory_num,
+    "multiple": Listing.multiple,
+}
+# filter key -> (column, comparison)
+LISTING_RANGE_FILTERS = {
+    "min_price": (Listing.asking_price, "ge"),
+    "max_price": (Listing.asking_price, "le"),
+    "min_cash_flow": (Listing.cash_flow_num, "ge"),
+    "max_cash_flow": (Listing.cash_flow_num, "le"),
+    "min_revenue": (Listing.revenue_num, "ge"),
+    "max_revenue": (Listing.revenue_num, "le"),
+    "min_multiple": (Listing.multiple, "ge"),
+    "max_multiple": (Listing.multiple, "le"),
+    "since": (Listing.first_seen_at, "ge"),
+}
+
+
+def filter_listings(db: Session, filters: Dict[str, Any]):
+    """
+    Listing query with filters applied. Keys: is_active, is_retirement,
+    state, city, category/keyword (case-insensitive substring) and the
+    LISTING_RANGE_FILTERS bounds; None values are ignored.
+    """
+    query = db.query(Listing)
+    if filters.get("is_active") is not None:
+        query = query.filter(Listing.is_active.is_(filters["is_active"]))
+    if filters.get("is_retirement") is not None:
+        query = query.filter(Listing.is_retirement_listing.is_(filters["is_retirement"]))
+    if filters.get("state"):
+        query = query.filter(Listing.location_state == filters["state"])
+    if filters.get("city"):
+        query = query.filter(Listing.location_city == filters["city"])
+    if filters.get("category"):
+        query = query.filter(Listing.business_category.ilike(f"%{filters['category']}%"))
+    if filters.get("keyword"):
+        query = query.filter(Listing.title.ilike(f"%{filters['keyword']}%"))
+    for key, (column, comparison) in LISTING_RANGE_FILTERS.items():
+        value = filters.get(key)
+        if value is not None:
+            query = query.filter(column >= value if comparison == "ge" else column <= value)
+    return query
+
+
+def search_listings(
+    db: Session,
+    filters: Dict[str, Any],
+    sort_by: str = "last_updated_at",
+    descending: bool = True,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Listing]:
+    sort_column = LISTING_SORT_COLUMNS.get(sort_by)
+    if sort_column is None:
+        raise ValueError(f"sort_by must be one of {', '.join(LISTING_SORT_COLUMNS)}")
+    order = sort_column.desc() if descending else sort_column.asc()
+    # Listings without the value sort last in either direction
+    query = filter_listings(db, filters).order_by(order.nullslast(), Listing.id.desc())
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def count_listings(db: Session, filters: Dict[str, Any]) -> int:
+    return filter_listings(db, filters).count()
+
+
+def get_listing_stats(
+    db: Session, since: datetime, state: Optional[str] = None
+) -> Dict[str, Any]:
+    """Counts plus average price and cash flow of active listings."""
+    base = {"state": state}
+    active = filter_listings(db, {**base, "is_active": True})
+    averages = active.with_entities(
+        func.avg(Listing.asking_price), func.avg(Listing.cash_flow_num)
+    ).one()
+    return {
+        "total_listings": count_listings(db, base),
+        "active_listings": active.count(),
+        "retirement_listings": count_listings(db, {**base, "is_retirement": True}),
+        "new_since": count_listings(db, {**base, "since": since}),
+        "avg_asking_price": int(averages[0]) if averages[0] is not None else None,
+        "avg_cash_flow": int(averages[1]) if averages[1] is not None else None,
+    }
+
+
+def get_price_history(
+    db: Session, listing_id: int, limit: int = 50
+) -> List[Dict[str, Any]]:
+    """
+    Oldest-first asking price / financials from the listing's snapshots,
+    keeping only snapshots where one of them changed.
+    """
+    snapshots = (
+        db.query(ListingSnapshot.created_at, ListingSnapshot.data_json)
+        .filter(ListingSnapshot.listing_id == listing_id)
+        .order_by(ListingSnapshot.created_at.asc(), ListingSnapshot.id.asc())
+        .all()
+    )
+    history: List[Dict[str, Any]] = []
+    for created_at, data in snapshots:
+        data = data or {}
+        point = {
+            "date": created_at.date().isoformat(),
+            "asking_price": data.get("asking_price"),
+            "cash_flow": data.get("cash_flow"),
+            "revenue": data.get("revenue"),
+        }
+        if history and all(history[-1][key] == point[key] for key in point if key != "date"):
+            continue
+        history.append(point)
+    return history[-limit:]
+
+
+def get_new_listings(
+    db: Session,
+    since_date: datetime,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Listing]:
+    query = (
+        db.query(Listing)
+        .filter(Listing.first_seen_at >= since_date)
+        .order_by(Listing.first_seen_at.desc(), Listing.id.desc())
+    )
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def compact_listing(listing: Listing) -> Dict[str, Any]:
+    """Token-light listing summary for agent tools; empty fields are dropped."""
+    listing_any = cast(Any, listing)
+    values = {
+        "id": listing_any.id,
+        "title": listing_any.title,
+        "price": listing_any.asking_price,
+        "cash_flow": listing_any.cash_flow_num,
+        "revenue": listing_any.revenue_num,
+        "multiple": listing_any.multiple,
+        "location": listing_any.location_raw
+        or ", ".join(filter(None, [listing_any.location_city, listing_any.location_state])),
+        "category": listing_any.business_category,
+        "retirement": listing_any.is_retirement_listing or None,
+        "first_seen": listing_any.first_seen_at.date().isoformat()
+        if listing_any.first_seen_at
+        else None,
+        "url": listing_any.url,
+    }
+    return {key: value for key, value in values.items() if value not in (None, "")}
 
 
 def get_retirement_listings(
@@ -236,8 +635,12 @@ def mark_listing_inactive(db: Session, external_id: str) -> None:
     listing = get_listing_by_external_id(db, external_id)
     if listing:
         listing_any = cast(Any, listing)
+        now = datetime.utcnow()
+        if listing_any.is_active:
+            # A deactivation is a content change for incremental exports
+            listing_any.content_changed_at = now
         listing_any.is_active = False  # type: ignore[assignment]
-        listing_any.last_updated_at = datetime.utcnow()  # type: ignore[assignment]
+        listing_any.last_updated_at = now  # type: ignore[assignment]
 
 
 def record_user_action(
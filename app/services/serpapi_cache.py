@@ -0,0 +1,273 @@
+"""SQLite cache for SerpApi responses, shared by every SerpApi caller.
+
+Entries are keyed on the canonicalized request params (api_key excluded),
+expire after a per-engine TTL and are evicted least-recently-used once
+the cache holds more than max_entries responses.
+
+Run with: python -m app.services.serpapi_cache [--purge-expired] [--clear]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+DEFAULT_DB_PATH = "data/leadgen/cache.db"
+DEFAULT_MAX_ENTRIES = 10_000
+DAY_SECONDS = 24 * 60 * 60
+
+# Params that never change the response.
+EXCLUDED_PARAMS = {"api_key", "output", "async", "no_cache"}
+
+# Places and airports barely move; job postings turn over daily.
+DEFAULT_TTL_SECONDS = {
+    "google_maps": 30 * DAY_SECONDS,
+    "google_flights": 7 * DAY_SECONDS,
+    "google_jobs": 1 * DAY_SECONDS,
+}
+FALLBACK_TTL_SECONDS = 1 * DAY_SECONDS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS serpapi_cache (
+    key TEXT PRIMARY KEY,
+    engine TEXT NOT NULL,
+    params TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS idx_serpapi_cache_last_access ON serpapi_cache (last_access)"
+
+
+def canonical_params(params: dict[str, Any]) -> str:
+    """Stable JSON for params: sorted keys, stringified values, no secrets."""
+    cleaned = {
+        str(key): str(value)
+        for key, value in params.items()
+        if key not in EXCLUDED_PARAMS and value is not None
+    }
+    return json.dumps(cleaned, sort_keys=True, separators=(",", ":"))
+
+
+def cache_key(url: str, params: dict[str, Any]) -> str:
+    return hashlib.sha256(f"{url}?{canonical_params(params)}".encode("utf-8")).hexdigest()
+
+
+def _default_ttls() -> dict[str, int]:
+    ttls = dict(DEFAULT_TTL_SECONDS)
+    leadgen_days = os.getenv("LEADGEN_CACHE_TTL_DAYS")
+    if leadgen_days:
+        ttls["google_maps"] = int(float(leadgen_days) * DAY_SECONDS)
+    return ttls
+
+
+class SerpApiCache:
+    """Response cache; stats count this process's hits, misses and writes."""
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        max_entries: int | None = None,
+        ttl_seconds: dict[str, int] | None = None,
+    ) -> None:
+        self.db_path = Path(db_path or os.getenv("LEADGEN_CACHE_DB_PATH") or DEFAULT_DB_PATH)
+        self.max_entries = max_entries or int(
+            os.getenv("SERPAPI_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+        )
+        self.ttl_seconds = {**_default_ttls(), **(ttl_seconds or {})}
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(_SCHEMA)
+        self.conn.execute(_INDEX)
+        self.conn.commit()
+
+    def ttl_for(self, engine: str) -> int:
+        return self.ttl_seconds.get(engine, FALLBACK_TTL_SECONDS)
+
+    def get(self, url: str, params: dict[str, Any]) -> dict[str, Any] | None:
+        key = cache_key(url, params)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT engine, response, created_at FROM serpapi_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[2] > self.ttl_for(row[0]):
+                self.stats["misses"] += 1
+                return None
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE serpapi_cache SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                    (now, key),
+                )
+            self.stats["hits"] += 1
+        return json.loads(row[1])
+
+    def set(self, url: str, params: dict[str, Any], response: dict[str, Any]) -> None:
+        now = time.time()
+        engine = str(params.get("engine", ""))
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO serpapi_cache "
+                "(key, engine, params, response, created_at, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (
+                    cache_key(url, params),
+                    engine,
+                    canonical_params(params),
+                    json.dumps(response, separators=(",", ":")),
+                    now,
+                    now,
+                ),
+            )
+            self.stats["stores"] += 1
+            overflow = (
+                self.conn.execute("SELECT COUNT(*) FROM serpapi_cache").fetchone()[0]
+                - self.max_entries
+            )
+            if overflow > 0:
+                self.conn.execute(
+                    "DELETE FROM serpapi_cache WHERE key IN "
+                    "(SELECT key FROM serpapi_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats["evictions"] += overflow
+
+    async def fetch_json(
+        self,
+        url: str,
+        params: dict[str, Any],
+        client: httpx.AsyncClient | None = None,
+    ) -> dict[str, Any]:
+        """GET url?params through the cache. Error payloads are not cached."""
+        cached = self.get(url, params)
+        if cached is not None:
+            return cached
+        payload = await get_serpapi_json(url, params, client=client)
+        if isinstance(payload, dict) and not payload.get("error"):
+            self.set(url, params, payload)
+        return payload
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        removed = 0
+        with self._lock, self.conn:
+            engines = [row[0] for row in self.conn.execute("SELECT DISTINCT engine FROM serpapi_cache")]
+            for engine in engines:
+                removed += self.conn.execute(
+                    "DELETE FROM serpapi_cache WHERE engine = ? AND created_at < ?",
+                    (engine, now - self.ttl_for(engine)),
+                ).rowcount
+        return removed
+
+    def clear(self) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM serpapi_cache")
+
+    def summary(self) -> dict[str, Any]:
+        """Stored entries per engine plus this process's counters."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT engine, COUNT(*), COALESCE(SUM(hits), 0) FROM serpapi_cache GROUP BY engine"
+            ).fetchall()
+        return {
+            **self.stats,
+            "entries": sum(row[1] for row in rows),
+            "engines": {row[0]: {"entries": row[1], "lifetime_hits": row[2]} for row in rows},
+        }
+
+    def format_stats(self) -> str:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        rate = f"{self.stats['hits'] / lookups:.0%}" if lookups else "n/a"
+        return (
+            f"{self.stats['hits']} hits, {self.stats['misses']} misses ({rate} hit rate), "
+            f"{self.stats['stores']} stored, {self.stats['evictions']} evicted"
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+_default_cache: SerpApiCache | None = None
+
+
+def get_serpapi_cache() -> SerpApiCache:
+    """Process-wide cache at LEADGEN_CACHE_DB_PATH, opened on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SerpApiCache()
+    return _default_cache
+
+
+def cache_enabled() -> bool:
+    return os.getenv("SERPAPI_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def resolve_cache(cache: SerpApiCache | None = None, use_cache: bool = True) -> SerpApiCache | None:
+    """The caller's cache, else the shared one unless caching is switched off."""
+    if not use_cache:
+        return None
+    if cache is not None:
+        return cache
+    return get_serpapi_cache() if cache_enabled() else None
+
+
+async def get_serpapi_json(
+    url: str,
+    params: dict[str, Any],
+    cache: SerpApiCache | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Any]:
+    """GET a SerpApi endpoint, through cache when one is given."""
+    if cache is not None:
+        return await cache.fetch_json(url, params, client=client)
+    if client is not None:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+    async with httpx.AsyncClient(timeout=30.0) as new_client:
+        response = await new_client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect or prune the SerpApi response cache")
+    parser.add_argument("--db-path", default=None, help="Cache database (default LEADGEN_CACHE_DB_PATH)")
+    parser.add_argument("--purge-expired", action="store_true", help="Delete expired entries")
+    parser.add_argument("--clear", action="store_true", help="Delete every entry")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    cache = SerpApiCache(db_path=args.db_path)
+    try:
+        if args.clear:
+            cache.clear()
+            print("Cleared SerpApi cache")
+        elif args.purge_expired:
+            print(f"Purged {cache.purge_expired()} expired entries")
+        summary = cache.summary()
+        print(f"{summary['entries']} cached responses in {cache.db_path}")
+        for engine, info in sorted(summary["engines"].items()):
+            print(f"  {engine}: {info['entries']} entries, {info['lifetime_hits']} hits")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
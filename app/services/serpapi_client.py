@@ -2,12 +2,21 @@ from typing import Any
 import os
 import httpx
 
+from app.services.serpapi_cache import SerpApiCache, get_serpapi_json, resolve_cache
+
 
 class SerpApiClient:
     """Client for SerpAPI Google Flights and search services."""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache: SerpApiCache | None = None,
+        use_cache: bool = True,
+    ):
         self.api_key = api_key or os.getenv("SERPAPI_API_KEY")
+        self.cache = cache
+        self.use_cache = use_cache
         if not self.api_key:
             raise ValueError("SERPAPI_API_KEY not provided or found in environment")
         self.base_url = "https://serpapi.com/search"
@@ -103,7 +112,7 @@ class SerpApiClient:
             "api_key": self.api_key,
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(self.base_url, params=params)
-            response.raise_for_status()
-            return response.json()
+        # Airport lookups are stable, so they are served from the response cache.
+        return await get_serpapi_json(
+            self.base_url, params, cache=resolve_cache(self.cache, self.use_cache)
+        )
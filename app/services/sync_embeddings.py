@@ -0,0 +1,46 @@
+"""Embed new or changed listings and update the on-disk vector index.
+
+Run with: python -m app.services.sync_embeddings
+"""
+
+import argparse
+
+from app.database import SessionLocal, init_db
+from app.services import embedding_service
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sync listing embeddings")
+    parser.add_argument(
+        "--model",
+        default=None,
+        help="Embedding model (default: EMBEDDING_MODEL or 'hashing')",
+    )
+    parser.add_argument("--batch-size", type=int, default=256, help="Listings per commit")
+    parser.add_argument(
+        "--encode-batch-size", type=int, default=64, help="Texts per model call"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    init_db()
+    db = SessionLocal()
+    try:
+        stats = embedding_service.sync_embeddings(
+            db,
+            model=embedding_service.get_embedding_model(args.model),
+            batch_size=max(1, args.batch_size),
+            encode_batch_size=max(1, args.encode_batch_size),
+        )
+    finally:
+        db.close()
+    print(
+        f"Embeddings ({stats['model']}): scanned {stats['scanned']}, "
+        f"encoded {stats['encoded']}, indexed {stats['indexed']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""BizBuySell listing tools for the researcher agent.
+
+Answers come from the local listings database, so results are bounded and
+paginated and listings are returned in a compact form.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any
+from agents import function_tool
+from app.database import SessionLocal
+from app.services import embedding_service, listing_service
+
+MAX_PAGE_SIZE = 25
+
+
+def _page(page: int, page_size: int) -> tuple[int, int]:
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    return max(1, page), page_size
+
+
+@function_tool
+def search_listings(
+    state: str | None = None,
+    city: str | None = None,
+    category: str | None = None,
+    keyword: str | None = None,
+    min_price: int | None = None,
+    max_price: int | None = None,
+    min_cash_flow: int | None = None,
+    max_multiple: float | None = None,
+    retirement_only: bool = False,
+    sort_by: str = "last_updated_at",
+    descending: bool = True,
+    page: int = 1,
+    page_size: int = 10,
+) -> dict[str, Any]:
+    """
+    Search active BizBuySell listings stored in the local database.
+
+    Args:
+        state: Two-letter state code (e.g., "TN")
+        city: City name (e.g., "Nashville")
+        category: Substring of the business category (e.g., "restaurant")
+        keyword: Substring of the listing title (e.g., "HVAC")
+        min_price: Minimum asking price in dollars
+        max_price: Maximum asking price in dollars
+        min_cash_flow: Minimum annual cash flow in dollars
+        max_multiple: Maximum asking price / cash flow multiple
+        retirement_only: Only listings where the seller is retiring
+        sort_by: One of last_updated_at, first_seen_at, asking_price, cash_flow, revenue, inventory, multiple
+        descending: Sort high to low (default: true)
+        page: Page number starting at 1
+        page_size: Listings per page (max 25)
+
+    Returns:
+        has_more flag and compact listings for the page
+    """
+    page, page_size = _page(page, page_size)
+    filters = {
+        "is_active": True,
+        "is_retirement": True if retirement_only else None,
+        "state": state,
+        "city": city,
+        "category": category,
+        "keyword": keyword,
+        "min_price": min_price,
+        "max_price": max_price,
+        "min_cash_flow": min_cash_flow,
+        "max_multiple": max_multiple,
+    }
+    db = SessionLocal()
+    try:
+        # keyword / category are substring filters no index can serve, so a
+        # count would read every listing; one extra row gives has_more instead
+        try:
+            listings = listing_service.search_listings(
+                db,
+                filters,
+                sort_by=sort_by,
+                descending=descending,
+                limit=page_size + 1,
+                offset=(page - 1) * page_size,
+            )
+        except ValueError as exc:
+            return {"error": str(exc)}
+        return {
+            "page": page,
+            "has_more": len(listings) > page_size,
+            "results": [
+                listing_service.compact_listing(listing) for listing in listings[:page_size]
+            ],
+        }
+    finally:
+        db.close()
+
+
+@function_tool
+def get_listing_stats(state: str | None = None, since_hours: int = 24) -> dict[str, Any]:
+    """
+    Summary counts for stored BizBuySell listings.
+
+    Args:
+        state: Optional two-letter state code to restrict the stats to
+        since_hours: Window for the new-listing count (default: 24)
+
+    Returns:
+        total, active, retirement and new listing counts plus average
+        asking price and cash flow of active listings
+    """
+    db = SessionLocal()
+    try:
+        since = datetime.utcnow() - timedelta(hours=max(1, since_hours))
+        return listing_service.get_listing_stats(db, since, state=state)
+    finally:
+        db.close()
+
+
+@function_tool
+def get_listing_price_history(listing_id: int, limit: int = 20) -> dict[str, Any]:
+    """
+    Asking price and financials over time for one stored listing.
+
+    Args:
+        listing_id: Listing id from search results
+        limit: Maximum number of most recent changes to return (max 50)
+
+    Returns:
+        Listing title and the dated points where price or financials changed
+    """
+    db = SessionLocal()
+    try:
+        listing = listing_service.get_listing_by_id(db, listing_id)
+        if listing is None:
+            return {"error": f"Listing {listing_id} not found"}
+        return {
+            "id": listing_id,
+            "title": listing.title,
+            "history": listing_service.get_price_history(
+                db, listing_id, limit=max(1, min(limit, 50))
+            ),
+        }
+    finally:
+        db.close()
+
+
+@function_tool
+def get_new_listings(
+    since: str | None = None,
+    since_hours: int = 24,
+    page: int = 1,
+    page_size: int = 10,
+) -> dict[str, Any]:
+    """
+    Listings first seen after a point in time, newest first.
+
+    Args:
+        since: ISO date or datetime (e.g., "2024-03-01"); overrides since_hours
+        since_hours: Look-back window in hours when since is not given (default: 24)
+        page: Page number starting at 1
+        page_size: Listings per page (max 25)
+
+    Returns:
+        The cutoff used, has_more flag and compact listings for the page
+    """
+    page, page_size = _page(page, page_size)
+    if since:
+        try:
+            since_date = datetime.fromisoformat(since)
+        except ValueError:
+            return {"error": f"Invalid since value: {since}"}
+    else:
+        since_date = datetime.utcnow() - timedelta(hours=max(1, since_hours))
+
+    db = SessionLocal()
+    try:
+        # One extra row tells whether another page exists without a count query
+        listings = listing_service.get_new_listings(
+            db, since_date, limit=page_size + 1, offset=(page - 1) * page_size
+        )
+        return {
+            "since": since_date.isoformat(timespec="minutes"),
+            "page": page,
+            "has_more": len(listings) > page_size,
+            "results": [
+                listing_service.compact_listing(listing) for listing in listings[:page_size]
+            ],
+        }
+    finally:
+        db.close()
+
+
+@function_tool
+def semantic_search_listings(query: str, limit: int = 10) -> dict[str, Any]:
+    """
+    Find stored BizBuySell listings whose description matches a natural-language query.
+
+    Args:
+        query: What to look for (e.g., "HVAC businesses with recurring service contracts")
+        limit: Maximum listings to return (1-25, default: 10)
+
+    Returns:
+        Matching active listings, best first, with a similarity score
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    db = SessionLocal()
+    try:
+        results = embedding_service.search_listings(db, query, limit=limit)
+        return {
+            "query": query,
+            "count": len(results),
+            "results": [embedding_service.compact_result(result) for result in results],
+        }
+    finally:
+        db.close()
@@ -0,0 +1,153 @@
+"""Google Maps lead export throughput: per-row dicts vs. shared tuple rows.
+
+"dict rows" is the old path: normalize_google_maps_record per record (a
+timestamp and a dict each) through csv.DictWriter. The other cases use
+google_maps_rows, which CSV and Sheets exports share. Records are cycled
+from a pool of distinct synthetic records, so 1M rows fit in memory.
+
+Run with: python -m benchmarks.leadgen_export --records 1000000
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from app.leadgen.export.sheets import (
+    GOOGLE_MAPS_COLUMNS,
+    export_google_maps_records_to_csv,
+    google_maps_rows,
+    normalize_google_maps_record,
+)
+
+POOL_SIZE = 10_000
+_CATEGORIES = ["Coffee shop", "Cafe", "Bakery", "Barber shop", "Taco restaurant"]
+_CITIES = ["Memphis", "Nashville", "Knoxville", "Chattanooga", "Germantown"]
+
+
+def build_record(index: int, rng: random.Random) -> Dict[str, Any]:
+    city = rng.choice(_CITIES)
+    record: Dict[str, Any] = {
+        "source": "google_maps",
+        "vendor_name": f"Synthetic Business {index}",
+        "contract_category": rng.choice(_CATEGORIES),
+        "city": city,
+        "state": "TN",
+        "source_url": f"https://www.google.com/maps/place/?q=place_id:p{index}",
+        "raw_data": {
+            "query": "coffee shops",
+            "location": f"{city}, Tennessee",
+            "address": f"{index} Main St, {city}, TN 38103",
+            "phone": f"+1 901-555-{index % 10_000:04d}",
+            "website": f"https://business{index}.example" if index % 3 else None,
+            "rating": round(rng.uniform(1, 5), 1),
+            "reviews": rng.randint(0, 2_000),
+            "type": "Coffee shop",
+            "place_id": f"p{index}",
+            "data_id": f"0x{index:x}:0x{index * 7:x}",
+            "data_cid": str(index * 13),
+            "gps_coordinates": {
+                "latitude": 35.0 + rng.random() * 0.3,
+                "longitude": -90.2 + rng.random() * 0.4,
+            },
+        },
+    }
+    if index % 2:
+        record["enrichment"] = {
+            "status": "ok",
+            "emails": [f"hello@business{index}.example"],
+            "socials": {"facebook": f"https://facebook.com/business{index}"},
+            "tech": ["wordpress"],
+        }
+    return record
+
+
+def synthetic_records(count: int, seed: int = 7) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    pool = [build_record(i, rng) for i in range(min(count, POOL_SIZE))]
+    return itertools.islice(itertools.cycle(pool), count)
+
+
+def _dict_rows_csv(records: Iterator[Dict[str, Any]], path: Path) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=GOOGLE_MAPS_COLUMNS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(normalize_google_maps_record(record))
+
+
+def run(count: int) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        out = Path(tmpdir)
+        cases: List[tuple] = [
+            (
+                "dict rows -> csv",
+                lambda: _dict_rows_csv(synthetic_records(count), out / "dict.csv"),
+                out / "dict.csv",
+            ),
+            (
+                "tuple rows -> csv",
+                lambda: export_google_maps_records_to_csv(synthetic_records(count), tmpdir, "tuple.csv"),
+                out / "tuple.csv",
+            ),
+            (
+                "tuple rows -> csv.gz",
+                lambda: export_google_maps_records_to_csv(
+                    synthetic_records(count), tmpdir, "tuple.csv", compress=True
+                ),
+                out / "tuple.csv.gz",
+            ),
+            (
+                "tuple rows (sheets)",
+                lambda: deque(google_maps_rows(synthetic_records(count)), maxlen=0),
+                None,
+            ),
+        ]
+        for name, func, path in cases:
+            elapsed = _time(func)
+            results.append(
+                {
+                    "case": name,
+                    "records": count,
+                    "seconds": round(elapsed, 3),
+                    "records_per_sec": round(count / elapsed),
+                    "bytes": os.path.getsize(path) if path else None,
+                }
+            )
+    return results
+
+
+def _time(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Leadgen export throughput benchmark")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    results = run(args.records)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for row in results:
+        size = f"{row['bytes'] / 1_000_000:8.1f} MB" if row["bytes"] else ""
+        print(f"{row['case']:<22} {row['seconds']:8.2f}s {row['records_per_sec']:>10,} rec/s {size}")
+
+
+if __name__ == "__main__":
+    main()
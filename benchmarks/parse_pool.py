@@ -0,0 +1,85 @@
+"""Crawl throughput with parsing inline vs. in a process pool.
+
+Simulates concurrent fetches (asyncio.sleep stands in for network latency)
+followed by parse_search_page through app.scheduler.parsing.run_parse, and
+reports pages/sec for each pool size.
+
+Run with: python -m benchmarks.parse_pool --pages 200 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from app.parsers.bizbuysell import BizBuySellParser
+from app.scheduler.parsing import configure_parse_pool, run_parse, shutdown_parse_pool
+from benchmarks.synthetic_pages import build_search_page
+
+
+async def _crawl(pages: List[str], concurrency: int, latency: float) -> float:
+    parser = BizBuySellParser()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def fetch_and_parse(index: int, html: str) -> int:
+        async with slots:
+            await asyncio.sleep(latency)
+            page = await run_parse(
+                parser.parse_search_page, html, f"https://www.bizbuysell.com/search/?page={index}"
+            )
+            return len(page["listings"])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(fetch_and_parse(i, html) for i, html in enumerate(pages)))
+    return time.perf_counter() - started
+
+
+def run(
+    pool_sizes: List[int], pages: int, listings: int, concurrency: int, latency: float
+) -> List[Dict]:
+    corpus = [build_search_page(listings, page=i + 1) for i in range(pages)]
+    results = []
+    for processes in pool_sizes:
+        configure_parse_pool(processes)
+        try:
+            # Warm the pool so process start-up is not counted
+            asyncio.run(_crawl(corpus[: max(1, processes)], concurrency, 0.0))
+            elapsed = asyncio.run(_crawl(corpus, concurrency, latency))
+        finally:
+            shutdown_parse_pool()
+        results.append(
+            {
+                "parse_processes": processes,
+                "pages": pages,
+                "seconds": round(elapsed, 3),
+                "pages_per_sec": round(pages / elapsed, 1),
+            }
+        )
+    return results
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parse pool throughput benchmark")
+    parser.add_argument("--pool-sizes", default="0,1,2,4", help="Comma-separated sizes")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--listings", type=int, default=30, help="Listings per page")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent fetches")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Simulated fetch latency (s)"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    pool_sizes = [int(size) for size in args.pool_sizes.split(",") if size.strip()]
+    results = run(pool_sizes, args.pages, args.listings, args.concurrency, args.latency)
+    for row in results:
+        label = row["parse_processes"] or "inline"
+        print(f"parse processes {label!s:>6}: {row['pages_per_sec']:8.1f} pages/sec")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
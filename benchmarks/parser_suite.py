@@ -0,0 +1,219 @@
+"""Offline throughput and peak-memory benchmarks for BizBuySellParser.
+
+Runs every parser entry point against the HTML corpus in
+benchmarks/fixtures and writes the results as JSON, keyed by git commit, so
+runs from different commits can be compared.
+
+Run with:
+    python -m benchmarks.parser_suite --output parser-<commit>.json
+    python -m benchmarks.parser_suite --compare parser-<base>.json
+    python -m benchmarks.parser_suite --write-fixtures  # regenerate the corpus
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from app.parsers.bizbuysell import (
+    BizBuySellParser,
+    _extract_key_value_pairs,
+    _extract_labeled_value,
+)
+from benchmarks.synthetic_pages import build_detail_page, build_search_page
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SEARCH_URL = "https://www.bizbuysell.com/search/?page=1"
+REASON_LABELS = ["Reason for Selling", "Reason for sale", "Reason for Selling?"]
+
+# name -> builder; sizes span a sparse page to a very long one
+CORPUS: Dict[str, Callable[[], str]] = {
+    "search_small": lambda: build_search_page(10, seed=1),
+    "search_medium": lambda: build_search_page(30, seed=2),
+    "search_large": lambda: build_search_page(100, seed=3),
+    "detail_small": lambda: build_detail_page(rows=8, paragraphs=2, seed=1),
+    "detail_medium": lambda: build_detail_page(rows=40, paragraphs=20, seed=2),
+    "detail_large": lambda: build_detail_page(rows=150, paragraphs=120, seed=3),
+}
+
+
+def write_fixtures() -> None:
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    for name, build in CORPUS.items():
+        (FIXTURES_DIR / f"{name}.html").write_text(build(), encoding="utf-8")
+
+
+def load_fixtures() -> Dict[str, str]:
+    fixtures = {}
+    for name in CORPUS:
+        path = FIXTURES_DIR / f"{name}.html"
+        if not path.exists():
+            raise SystemExit(f"Missing fixture {path}; run with --write-fixtures")
+        fixtures[name] = path.read_text(encoding="utf-8")
+    return fixtures
+
+
+def build_cases(fixtures: Dict[str, str]) -> List[Tuple[str, str, Callable[[], Any]]]:
+    """(case name, fixture name, zero-arg callable) for every parser entry point."""
+    parser = BizBuySellParser()
+    cases: List[Tuple[str, str, Callable[[], Any]]] = []
+    for name, html in fixtures.items():
+        if name.startswith("search"):
+            cases.append(
+                ("parse_search_results", name, lambda html=html: parser.parse_search_results(html))
+            )
+            cases.append(
+                (
+                    "find_next_page_url",
+                    name,
+                    lambda html=html: parser.find_next_page_url(html, SEARCH_URL),
+                )
+            )
+        else:
+            # Helpers take a soup; build it once so only the helper is timed
+            soup = BeautifulSoup(html, "html.parser")
+            cases.append(
+                ("parse_detail_page", name, lambda html=html: parser.parse_detail_page(html))
+            )
+            cases.append(
+                (
+                    "_extract_labeled_value",
+                    name,
+                    lambda soup=soup: _extract_labeled_value(soup, REASON_LABELS),
+                )
+            )
+            cases.append(
+                (
+                    "_extract_key_value_pairs",
+                    name,
+                    lambda soup=soup: _extract_key_value_pairs(soup),
+                )
+            )
+    return cases
+
+
+def measure(func: Callable[[], Any], min_time: float, min_rounds: int) -> Dict[str, Any]:
+    func()  # warm-up
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < min_rounds or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    func()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mean = statistics.fmean(timings)
+    return {
+        "rounds": len(timings),
+        "mean_ms": round(mean * 1000, 4),
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "min_ms": round(min(timings) * 1000, 4),
+        "ops_per_sec": round(1 / mean, 2) if mean else None,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return (
+            subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL)
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
+
+
+def run(min_time: float, min_rounds: int, only: Optional[str] = None) -> Dict[str, Any]:
+    fixtures = load_fixtures()
+    results: Dict[str, Any] = {}
+    for case, fixture, func in build_cases(fixtures):
+        if only and only not in case:
+            continue
+        key = f"{case}[{fixture}]"
+        results[key] = dict(measure(func, min_time, min_rounds), fixture_bytes=len(fixtures[fixture]))
+        print(
+            f"{key:48} {results[key]['mean_ms']:10.3f} ms "
+            f"{results[key]['ops_per_sec']:10.1f} ops/s "
+            f"{results[key]['peak_memory_kb']:10.1f} KB peak"
+        )
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Print per-case deltas; return False if any case slowed beyond threshold."""
+    ok = True
+    print(f"\nvs {baseline.get('commit') or 'baseline'} (threshold +{threshold:.0%}):")
+    for key, result in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if not base:
+            print(f"{key:48} new")
+            continue
+        time_delta = result["mean_ms"] / base["mean_ms"] - 1 if base["mean_ms"] else 0.0
+        mem_delta = (
+            result["peak_memory_kb"] / base["peak_memory_kb"] - 1
+            if base["peak_memory_kb"]
+            else 0.0
+        )
+        flag = ""
+        if time_delta > threshold:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{key:48} time {time_delta:+8.1%}  memory {mem_delta:+8.1%}{flag}")
+    return ok
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="BizBuySellParser benchmark suite")
+    parser.add_argument("--output", default=None, help="Write results JSON to this path")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to diff against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed slowdown before failing"
+    )
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds per case")
+    parser.add_argument("--min-rounds", type=int, default=5, help="Minimum calls per case")
+    parser.add_argument("--only", default=None, help="Run cases whose name contains this")
+    parser.add_argument(
+        "--write-fixtures", action="store_true", help="Regenerate the HTML corpus and exit"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.write_fixtures:
+        write_fixtures()
+        print(f"Wrote {len(CORPUS)} fixtures to {FIXTURES_DIR}")
+        return
+
+    report = run(args.min_time, args.min_rounds, args.only)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved results to {args.output}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if not compare(report, baseline, args.threshold):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Synthetic BizBuySell-shaped HTML pages for offline benchmarks."""
+
+import random
+from typing import List
+
+CATEGORIES = ["Restaurant", "Car Wash", "HVAC Service", "Laundromat", "Dental Practice"]
+CITIES = [("Memphis", "TN"), ("Austin", "TX"), ("Denver", "CO"), ("Tampa", "FL")]
+FILLER = (
+    "Established business with loyal customers, trained staff and documented "
+    "procedures. Owner is ready to retire and will assist with transition. "
+)
+
+
+def build_search_page(listings: int, page: int = 1, seed: int = 0) -> str:
+    """Search results page with `listings` cards and a next-page link."""
+    rng = random.Random(seed * 100_000 + page)
+    cards: List[str] = []
+    for i in range(listings):
+        listing_id = page * 100_000 + i
+        card_class = ("diamond", "showcase", "basic")[i % 3]
+        category = rng.choice(CATEGORIES)
+        city, state = rng.choice(CITIES)
+        price = rng.randrange(50, 5_000) * 1_000
+        cash_flow = rng.randrange(20, 900) * 1_000
+        cards.append(
+            f'<a class="{card_class}" id="{listing_id}" '
+            f'href="/business-opportunity/{category.lower().replace(" ", "-")}/{listing_id}/">'
+            f'<span class="title">{category} for sale in {city}</span>'
+            f'<p class="asking-price">${price:,}</p>'
+            f'<p class="location">{city}, {state}</p>'
+            f'<p class="cash-flow">Cash Flow: ${cash_flow:,}</p>'
+            f'<p class="description">{FILLER * rng.randrange(1, 4)}</p>'
+            "</a>"
+        )
+    return (
+        "<html><head><title>Businesses for sale</title>"
+        '<script>var analytics = {"page": "search"};</script></head><body>'
+        '<nav><ul><li><a href="/">Home</a></li><li><a href="/buy">Buy</a></li></ul></nav>'
+        f'<div class="results">{"".join(cards)}</div>'
+        f'<ul class="pagination"><li class="next"><a rel="next" href="/search/?page={page + 1}">Next</a></li></ul>'
+        "</body></html>"
+    )
+
+
+def build_detail_page(rows: int, paragraphs: int, seed: int = 0) -> str:
+    """Listing detail page with `rows` key/value facts and a long description."""
+    rng = random.Random(seed)
+    facts = [
+        ("Asking Price", f"${rng.randrange(50, 5_000) * 1_000:,}"),
+        ("Cash Flow", f"${rng.randrange(20, 900) * 1_000:,}"),
+        ("Gross Revenue", f"${rng.randrange(100, 9_000) * 1_000:,}"),
+        ("Inventory", f"${rng.randrange(1, 200) * 1_000:,}"),
+        ("Years in Business", str(rng.randrange(2, 60))),
+        ("Employees", str(rng.randrange(1, 80))),
+        ("Real Estate", rng.choice(["Included", "Not Included"])),
+        ("Training", rng.choice(["Yes", "No"])),
+    ]
+    facts.extend((f"Extra Fact {i}", f"Value {i}") for i in range(max(0, rows - len(facts))))
+    detail_rows = "".join(
+        f'<div class="row"><span class="label">{k}</span><span class="value">{v}</span></div>'
+        for k, v in facts[: len(facts) // 2]
+    )
+    dl_rows = "".join(f"<dt>{k}</dt><dd>{v}</dd>" for k, v in facts[len(facts) // 2 :])
+    description = "".join(f"<p>{FILLER * 3}</p>" for _ in range(paragraphs))
+    sidebar = "".join(
+        f'<li><a href="/listing/{i}/">Similar listing {i}</a><span>{FILLER}</span></li>'
+        for i in range(paragraphs)
+    )
+    return (
+        "<html><head><title>Business for sale</title>"
+        '<script type="application/ld+json">{"@type": "Product", '
+        '"description": "Profitable business. Reason for sale: owner retiring."}</script>'
+        "</head><body>"
+        '<h1 class="location">Memphis, TN</h1>'
+        f'<div id="listing-description">{description}</div>'
+        f'<div class="listing-details">{detail_rows}</div>'
+        f"<dl>{dl_rows}</dl>"
+        "<div><strong>Reason for Selling</strong><span>Owner retiring after 30 years</span></div>"
+        f'<aside><ul>{sidebar}</ul></aside>'
+        "</body></html>"
+    )
@@ -0,0 +1,26 @@
+"""Existence checks so migrations also apply to databases built by create_all.
+
+Before migrations existed, init_db created whatever tables the models had at
+the time, so a database stamped at the baseline may already contain some
+later tables, columns or indexes.
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+def has_table(name: str) -> bool:
+    return inspect(op.get_bind()).has_table(name)
+
+
+def has_column(table: str, column: str) -> bool:
+    return any(col["name"] == column for col in inspect(op.get_bind()).get_columns(table))
+
+
+def has_index(table: str, index: str) -> bool:
+    return any(idx["name"] == index for idx in inspect(op.get_bind()).get_indexes(table))
+
+
+def create_index_if_missing(name: str, table: str, columns, **kwargs) -> None:
+    if not has_index(table, name):
+        op.create_index(name, table, columns, **kwargs)
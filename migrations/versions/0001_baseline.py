@@ -0,0 +1,146 @@
+"""Baseline schema: listings, details, snapshots, user actions, scrape runs, queue
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "listings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("external_id", sa.String(50), nullable=False),
+        sa.Column("title", sa.String(500), nullable=False),
+        sa.Column("business_category", sa.String(200)),
+        sa.Column("asking_price", sa.Integer()),
+        sa.Column("asking_price_raw", sa.String(100)),
+        sa.Column("location_city", sa.String(200)),
+        sa.Column("location_state", sa.String(50)),
+        sa.Column("location_raw", sa.String(300)),
+        sa.Column("revenue", sa.String(100)),
+        sa.Column("cash_flow", sa.String(100)),
+        sa.Column("seller_reason_raw", sa.Text()),
+        sa.Column("url", sa.String(1000), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("first_seen_at", sa.DateTime(), nullable=False),
+        sa.Column("last_updated_at", sa.DateTime(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_retirement_listing", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_listings_external_id", "listings", ["external_id"], unique=True)
+    op.create_index("idx_listings_price", "listings", ["asking_price"])
+    op.create_index("idx_listings_location", "listings", ["location_state", "location_city"])
+    op.create_index(
+        "idx_listings_retirement", "listings", ["is_retirement_listing", "is_active"]
+    )
+    op.create_index("idx_listings_updated", "listings", ["last_updated_at"])
+
+    op.create_table(
+        "listing_details",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "listing_id",
+            sa.Integer(),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("full_description", sa.Text()),
+        sa.Column("financial_details", sa.JSON()),
+        sa.Column("years_in_business", sa.String(50)),
+        sa.Column("employees", sa.String(50)),
+        sa.Column("real_estate_included", sa.Boolean()),
+        sa.Column("inventory_value", sa.String(100)),
+        sa.Column("training_included", sa.Boolean()),
+        sa.Column("detailed_location", sa.String(500)),
+        sa.Column("reason_for_selling", sa.Text()),
+        sa.Column("scraped_at", sa.DateTime(), nullable=False),
+        sa.Column("scrape_status", sa.String(50)),
+    )
+
+    op.create_table(
+        "listing_snapshots",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "listing_id",
+            sa.Integer(),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("data_json", sa.JSON(), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "idx_snapshots_listing_date", "listing_snapshots", ["listing_id", "created_at"]
+    )
+
+    op.create_table(
+        "user_actions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "listing_id",
+            sa.Integer(),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("action", sa.String(50), nullable=False),
+        sa.Column("notes", sa.Text()),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "idx_user_actions_listing", "user_actions", ["listing_id", "created_at"]
+    )
+
+    op.create_table(
+        "scrape_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("run_type", sa.String(50), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime()),
+        sa.Column("listings_found", sa.Integer()),
+        sa.Column("new_listings", sa.Integer()),
+        sa.Column("updated_listings", sa.Integer()),
+        sa.Column("detail_pages_scraped", sa.Integer()),
+        sa.Column("errors", sa.Integer()),
+        sa.Column("status", sa.String(50)),
+        sa.Column("error_message", sa.Text()),
+    )
+    op.create_index("idx_scrape_runs_date", "scrape_runs", ["started_at"])
+
+    op.create_table(
+        "scraping_queue",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "listing_id",
+            sa.Integer(),
+            sa.ForeignKey("listings.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("priority", sa.Integer()),
+        sa.Column("status", sa.String(50)),
+        sa.Column("retry_count", sa.Integer()),
+        sa.Column("error_message", sa.Text()),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("processed_at", sa.DateTime()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scraping_queue")
+    op.drop_table("scrape_runs")
+    op.drop_table("user_actions")
+    op.drop_table("listing_snapshots")
+    op.drop_table("listing_details")
+    op.drop_table("listings")
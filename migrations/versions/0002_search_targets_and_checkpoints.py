@@ -0,0 +1,81 @@
+"""Search targets, crawl checkpoints and scrape_runs.target_id
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.schema_helpers import create_index_if_missing, has_column, has_table
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_table("search_targets"):
+        op.create_table(
+            "search_targets",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(200)),
+            sa.Column("url", sa.String(1000), nullable=False, unique=True),
+            sa.Column("cadence_minutes", sa.Integer(), nullable=False),
+            sa.Column("priority", sa.Integer(), nullable=False),
+            sa.Column("enabled", sa.Boolean(), nullable=False),
+            sa.Column("last_run_at", sa.DateTime()),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+    create_index_if_missing(
+        "idx_search_targets_enabled", "search_targets", ["enabled", "priority"]
+    )
+
+    if not has_column("scrape_runs", "target_id"):
+        with op.batch_alter_table("scrape_runs") as batch_op:
+            batch_op.add_column(sa.Column("target_id", sa.Integer()))
+            batch_op.create_foreign_key(
+                "fk_scrape_runs_target_id",
+                "search_targets",
+                ["target_id"],
+                ["id"],
+                ondelete="SET NULL",
+            )
+    create_index_if_missing(
+        "idx_scrape_runs_target", "scrape_runs", ["target_id", "started_at"]
+    )
+
+    if not has_table("crawl_checkpoints"):
+        op.create_table(
+            "crawl_checkpoints",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "scrape_run_id",
+                sa.Integer(),
+                sa.ForeignKey("scrape_runs.id", ondelete="CASCADE"),
+                nullable=False,
+                unique=True,
+            ),
+            sa.Column("start_url", sa.String(1000), nullable=False),
+            sa.Column("last_completed_url", sa.String(1000)),
+            sa.Column("next_url", sa.String(1000)),
+            sa.Column("visited_urls", sa.JSON(), nullable=False),
+            sa.Column("pages_completed", sa.Integer()),
+            sa.Column("stats", sa.JSON()),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+    create_index_if_missing(
+        "idx_crawl_checkpoints_start_url", "crawl_checkpoints", ["start_url"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("crawl_checkpoints")
+    op.drop_index("idx_scrape_runs_target", table_name="scrape_runs")
+    with op.batch_alter_table("scrape_runs") as batch_op:
+        batch_op.drop_constraint("fk_scrape_runs_target_id", type_="foreignkey")
+        batch_op.drop_column("target_id")
+    op.drop_table("search_targets")
@@ -0,0 +1,41 @@
+"""Numeric financial columns on listings, with indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+Existing rows are filled by python -m app.services.backfill_financials.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.schema_helpers import create_index_if_missing, has_column
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ("revenue_num", sa.Integer(), "idx_listings_revenue"),
+    ("cash_flow_num", sa.Integer(), "idx_listings_cash_flow"),
+    ("inventory_num", sa.Integer(), "idx_listings_inventory"),
+    ("multiple", sa.Float(), "idx_listings_multiple"),
+]
+
+
+def upgrade() -> None:
+    for name, column_type, index_name in COLUMNS:
+        if not has_column("listings", name):
+            op.add_column("listings", sa.Column(name, column_type))
+        create_index_if_missing(index_name, "listings", [name])
+
+
+def downgrade() -> None:
+    for name, _column_type, index_name in COLUMNS:
+        op.drop_index(index_name, table_name="listings")
+    with op.batch_alter_table("listings") as batch_op:
+        for name, _column_type, _index_name in COLUMNS:
+            batch_op.drop_column(name)
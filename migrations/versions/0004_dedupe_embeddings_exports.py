@@ -0,0 +1,94 @@
+"""Duplicate detection, embedding cache and export watermark tables
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.schema_helpers import create_index_if_missing, has_table
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def _listing_fk(unique: bool = False) -> sa.Column:
+    return sa.Column(
+        "listing_id",
+        sa.Integer(),
+        sa.ForeignKey("listings.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=unique,
+    )
+
+
+def upgrade() -> None:
+    if not has_table("listing_signatures"):
+        op.create_table(
+            "listing_signatures",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            _listing_fk(unique=True),
+            sa.Column("text_hash", sa.String(64), nullable=False),
+            sa.Column("minhash", sa.JSON(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+
+    if not has_table("listing_lsh_buckets"):
+        op.create_table(
+            "listing_lsh_buckets",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            _listing_fk(),
+            sa.Column("bucket", sa.String(32), nullable=False),
+        )
+    create_index_if_missing("idx_lsh_buckets_bucket", "listing_lsh_buckets", ["bucket"])
+    create_index_if_missing("idx_lsh_buckets_listing", "listing_lsh_buckets", ["listing_id"])
+
+    if not has_table("duplicate_clusters"):
+        op.create_table(
+            "duplicate_clusters",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            _listing_fk(unique=True),
+            sa.Column("cluster_id", sa.Integer(), nullable=False),
+            sa.Column("matched_listing_id", sa.Integer()),
+            sa.Column("similarity", sa.Float()),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+    create_index_if_missing(
+        "idx_duplicate_clusters_cluster", "duplicate_clusters", ["cluster_id"]
+    )
+
+    if not has_table("listing_embeddings"):
+        op.create_table(
+            "listing_embeddings",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            _listing_fk(unique=True),
+            sa.Column("model", sa.String(200), nullable=False),
+            sa.Column("content_hash", sa.String(64), nullable=False),
+            sa.Column("vector", sa.LargeBinary(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+    create_index_if_missing("idx_listing_embeddings_model", "listing_embeddings", ["model"])
+
+    if not has_table("export_watermarks"):
+        op.create_table(
+            "export_watermarks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("destination", sa.String(200), nullable=False, unique=True),
+            sa.Column("last_updated_at", sa.DateTime()),
+            sa.Column("last_id", sa.Integer()),
+            sa.Column("rows_exported", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("export_watermarks")
+    op.drop_table("listing_embeddings")
+    op.drop_table("duplicate_clusters")
+    op.drop_table("listing_lsh_buckets")
+    op.drop_table("listing_signatures")
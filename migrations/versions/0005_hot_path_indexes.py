@@ -0,0 +1,31 @@
+"""Indexes for full table scans found by the index advisor
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+get_new_listings filtered listings.first_seen_at and
+get_pending_detail_scrapes filtered scraping_queue.status without an index.
+"""
+
+from alembic import op
+
+from migrations.schema_helpers import create_index_if_missing
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index_if_missing("idx_listings_first_seen", "listings", ["first_seen_at"])
+    create_index_if_missing(
+        "idx_scraping_queue_status", "scraping_queue", ["status", "priority", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_scraping_queue_status", table_name="scraping_queue")
+    op.drop_index("idx_listings_first_seen", table_name="listings")
@@ -0,0 +1,96 @@
+"""Leadgen leads, rating/review observations and ingest runs
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.schema_helpers import create_index_if_missing, has_table
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def _run_fk(name: str) -> sa.Column:
+    return sa.Column(name, sa.Integer(), sa.ForeignKey("ingest_runs.id", ondelete="SET NULL"))
+
+
+def upgrade() -> None:
+    if not has_table("ingest_runs"):
+        op.create_table(
+            "ingest_runs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("source", sa.String(50), nullable=False),
+            sa.Column("query", sa.String(300), nullable=False),
+            sa.Column("location", sa.String(300), nullable=False),
+            sa.Column("started_at", sa.DateTime(), nullable=False),
+            sa.Column("completed_at", sa.DateTime()),
+            sa.Column("records_fetched", sa.Integer()),
+            sa.Column("new_leads", sa.Integer()),
+            sa.Column("updated_leads", sa.Integer()),
+            sa.Column("status", sa.String(50)),
+            sa.Column("error_message", sa.Text()),
+        )
+    create_index_if_missing("idx_ingest_runs_date", "ingest_runs", ["started_at"])
+
+    if not has_table("leads"):
+        op.create_table(
+            "leads",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("place_id", sa.String(200), nullable=False),
+            sa.Column("data_id", sa.String(200)),
+            sa.Column("source", sa.String(50), nullable=False),
+            sa.Column("name", sa.String(500), nullable=False),
+            sa.Column("niche", sa.String(300)),
+            sa.Column("city", sa.String(200)),
+            sa.Column("state", sa.String(50)),
+            sa.Column("address", sa.String(500)),
+            sa.Column("phone", sa.String(50)),
+            sa.Column("website", sa.String(1000)),
+            sa.Column("category", sa.String(200)),
+            sa.Column("rating", sa.Float()),
+            sa.Column("reviews", sa.Integer()),
+            sa.Column("latitude", sa.Float()),
+            sa.Column("longitude", sa.Float()),
+            sa.Column("source_url", sa.String(1000)),
+            sa.Column("raw_data", sa.JSON(), nullable=False),
+            sa.Column("content_hash", sa.String(64), nullable=False),
+            _run_fk("last_run_id"),
+            sa.Column("first_seen_at", sa.DateTime(), nullable=False),
+            sa.Column("last_seen_at", sa.DateTime(), nullable=False),
+            sa.Column("last_updated_at", sa.DateTime(), nullable=False),
+        )
+    create_index_if_missing("ix_leads_place_id", "leads", ["place_id"], unique=True)
+    create_index_if_missing("idx_leads_niche_city", "leads", ["niche", "city"])
+    create_index_if_missing("idx_leads_updated", "leads", ["last_updated_at"])
+
+    if not has_table("lead_observations"):
+        op.create_table(
+            "lead_observations",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "lead_id",
+                sa.Integer(),
+                sa.ForeignKey("leads.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            _run_fk("run_id"),
+            sa.Column("rating", sa.Float()),
+            sa.Column("reviews", sa.Integer()),
+            sa.Column("observed_at", sa.DateTime(), nullable=False),
+        )
+    create_index_if_missing(
+        "idx_lead_observations_lead_date", "lead_observations", ["lead_id", "observed_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("lead_observations")
+    op.drop_table("leads")
+    op.drop_table("ingest_runs")
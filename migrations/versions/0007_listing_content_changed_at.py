@@ -0,0 +1,49 @@
+"""Change timestamp for listings; incremental export watermarks use it
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+
+last_updated_at moves on every recrawl, so unchanged listings were exported
+again. content_changed_at starts out equal to last_updated_at.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.schema_helpers import create_index_if_missing, has_column
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_column("listings", "content_changed_at"):
+        op.add_column("listings", sa.Column("content_changed_at", sa.DateTime()))
+        op.execute("UPDATE listings SET content_changed_at = last_updated_at")
+        with op.batch_alter_table("listings") as batch_op:
+            batch_op.alter_column(
+                "content_changed_at", existing_type=sa.DateTime(), nullable=False
+            )
+    create_index_if_missing("idx_listings_changed", "listings", ["content_changed_at"])
+
+    if has_column("export_watermarks", "last_updated_at"):
+        with op.batch_alter_table("export_watermarks") as batch_op:
+            batch_op.alter_column(
+                "last_updated_at",
+                new_column_name="last_changed_at",
+                existing_type=sa.DateTime(),
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("export_watermarks") as batch_op:
+        batch_op.alter_column(
+            "last_changed_at", new_column_name="last_updated_at", existing_type=sa.DateTime()
+        )
+    op.drop_index("idx_listings_changed", table_name="listings")
+    with op.batch_alter_table("listings") as batch_op:
+        batch_op.drop_column("content_changed_at")
@@ -0,0 +1,55 @@
+"""Manual cadence flag on search targets and a log of detail page changes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+
+The adaptive planner rewrote cadence_minutes every hour, including cadences
+set through the API, and only counted search card changes. Existing targets
+start out adaptive.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.schema_helpers import create_index_if_missing, has_column, has_table
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_column("search_targets", "cadence_override"):
+        op.add_column(
+            "search_targets",
+            sa.Column(
+                "cadence_override", sa.Boolean(), nullable=False, server_default=sa.false()
+            ),
+        )
+
+    if not has_table("listing_detail_changes"):
+        op.create_table(
+            "listing_detail_changes",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "listing_id",
+                sa.Integer(),
+                sa.ForeignKey("listings.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("changed_at", sa.DateTime(), nullable=False),
+        )
+    create_index_if_missing(
+        "idx_listing_detail_changes_listing_date",
+        "listing_detail_changes",
+        ["listing_id", "changed_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("listing_detail_changes")
+    with op.batch_alter_table("search_targets") as batch_op:
+        batch_op.drop_column("cadence_override")
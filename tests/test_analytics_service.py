@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, Listing, ScrapeRun
+from app.services import analytics_service, listing_service
+
+
+def _listing(external_id: str, state: str, price, retirement: bool, active: bool = True):
+    return Listing(
+        external_id=external_id,
+        title=external_id,
+        url=f"https://x/{external_id}/",
+        content_hash="h",
+        location_state=state,
+        asking_price=price,
+        is_retirement_listing=retirement,
+        is_active=active,
+    )
+
+
+class TestAnalyticsService(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add_all(
+            [
+                _listing("1", "TN", 100_000, True),
+                _listing("2", "TN", 300_000, False),
+                _listing("3", "TN", 200_000, True),
+                _listing("4", "TX", 500_000, False),
+                _listing("5", "TX", None, True),
+                _listing("6", "TX", 9_000_000, True, active=False),
+            ]
+        )
+        self.db.commit()
+        analytics_service.invalidate_listing_frame()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        analytics_service.invalidate_listing_frame()
+
+    def test_group_by_median_and_share(self) -> None:
+        frame = analytics_service.get_listing_frame(self.db)
+        prices = {
+            row["group"]: row
+            for row in analytics_service.group_by(
+                frame, "state", "asking_price", ["count", "median", "max"]
+            )
+        }
+        self.assertEqual(prices["TN"], {"group": "TN", "count": 3, "median": 200_000, "max": 300_000})
+        self.assertEqual(prices["TX"]["count"], 1)
+
+        shares = {
+            row["group"]: row["mean"]
+            for row in analytics_service.group_by(
+                frame, "state", "is_retirement_listing", ["mean"]
+            )
+        }
+        self.assertAlmostEqual(shares["TN"], 2 / 3, places=4)
+        self.assertEqual(shares["TX"], 0.5)
+
+    def test_percentiles_and_histogram(self) -> None:
+        frame = analytics_service.get_listing_frame(self.db)
+        result = analytics_service.percentiles(frame, "asking_price", [50])
+        self.assertEqual(result, {"count": 4, "p50": 250_000})
+        hist = analytics_service.histogram(frame, "asking_price", bins=4)
+        self.assertEqual(sum(hist["counts"]), 4)
+        self.assertEqual(len(hist["edges"]), 5)
+
+    def test_histogram_bounds_apply_on_their_own(self) -> None:
+        frame = analytics_service.get_listing_frame(self.db)
+        low = analytics_service.histogram(frame, "asking_price", bins=2, min_value=200_000)
+        self.assertEqual(low["count"], 3)
+        self.assertEqual(low["edges"], [200_000, 350_000, 500_000])
+
+        high = analytics_service.histogram(frame, "asking_price", bins=2, max_value=300_000)
+        self.assertEqual(high["count"], 3)
+        self.assertEqual(high["edges"], [100_000, 200_000, 300_000])
+
+    def test_frame_reloads_after_detail_financials_change(self) -> None:
+        frame = analytics_service.get_listing_frame(self.db)
+        listing = self.db.query(Listing).filter_by(external_id="1").one()
+        listing_service.save_listing_detail(
+            self.db, listing.id, {"financial_details": {"Cash Flow": "$80,000"}}
+        )
+        self.db.commit()
+
+        reloaded = analytics_service.get_listing_frame(self.db)
+        self.assertIsNot(reloaded, frame)
+        self.assertEqual(np.nansum(reloaded.metric("cash_flow")), 80_000)
+
+    def test_frame_reloads_after_completed_run(self) -> None:
+        frame = analytics_service.get_listing_frame(self.db)
+        self.assertIs(analytics_service.get_listing_frame(self.db), frame)
+
+        self.db.add(_listing("7", "CO", 50_000, False))
+        self.db.add(ScrapeRun(run_type="search", status="completed", completed_at=frame.token[1]))
+        self.db.commit()
+        reloaded = analytics_service.get_listing_frame(self.db)
+        self.assertIsNot(reloaded, frame)
+        self.assertEqual(reloaded.size, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from bs4 import BeautifulSoup
+
+from app.parsers.bizbuysell import (
+    BizBuySellParser,
+    _LabelIndex,
+    _extract_key_value_pairs,
+    _extract_labeled_value,
+)
+
+
+DETAIL_HTML = """
+<html><head>
+<script>var label = "Reason for Selling";</script>
+</head><body>
+<!-- Reason for sale is filled in by the broker -->
+<div id="listing-description">Turnkey bakery with wholesale accounts.</div>
+<div><span>Reason for Selling:</span><span></span></div>
+<div><strong>reason for selling</strong><span>Owner retiring</span></div>
+<div class="listing-details">
+  <div class="row"><span class="label">Cash Flow</span><span class="value">$120,000</span></div>
+  <div><div class="row"><span class="detail-label">Employees</span><span class="detail-value">6</span></div></div>
+</div>
+<div class="row"><span class="label">Ignored</span><span class="value">outside details</span></div>
+<dl><dt>Cash Flow</dt><dd>$999</dd><dt>Training</dt><dd>Yes</dd></dl>
+</body></html>
+"""
+
+
+class TestLabelIndex(unittest.TestCase):
+    def test_labeled_value_skips_empty_and_matches_case_insensitively(self) -> None:
+        soup = BeautifulSoup(DETAIL_HTML, "html.parser")
+        self.assertEqual(
+            _extract_labeled_value(soup, ["Reason for Selling", "Reason for sale"]),
+            "Owner retiring",
+        )
+        self.assertIsNone(_extract_labeled_value(soup, ["Asking Price"]))
+
+    def test_key_value_pairs_prefer_detail_rows(self) -> None:
+        soup = BeautifulSoup(DETAIL_HTML, "html.parser")
+        self.assertEqual(
+            _extract_key_value_pairs(soup),
+            {"Cash Flow": "$120,000", "Employees": "6", "Training": "Yes"},
+        )
+
+    def test_shared_index_matches_standalone_calls(self) -> None:
+        soup = BeautifulSoup(DETAIL_HTML, "html.parser")
+        index = _LabelIndex(soup)
+        labels = ["Reason for sale"]
+        self.assertEqual(
+            _extract_labeled_value(soup, labels, index=index),
+            _extract_labeled_value(soup, labels),
+        )
+        self.assertEqual(
+            _extract_key_value_pairs(soup, index=index), _extract_key_value_pairs(soup)
+        )
+
+    def test_parse_detail_page(self) -> None:
+        detail = BizBuySellParser().parse_detail_page(DETAIL_HTML)
+        self.assertEqual(detail["reason_for_selling"], "Owner retiring")
+        self.assertEqual(detail["employees"], "6")
+        self.assertTrue(detail["training_included"])
+
+
+if __name__ == "__main__":
+    unittest.main()
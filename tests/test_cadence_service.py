@@ -0,0 +1,189 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import (
+    Base,
+    Listing,
+    ListingDetail,
+    ListingDetailChange,
+    ListingSnapshot,
+    ScrapeRun,
+)
+from app.services import cadence_service, listing_service
+
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+class TestCadenceService(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def _add_runs(self, target_id: int, changes_per_run: int, days: int) -> None:
+        for day in range(days):
+            self.db.add(
+                ScrapeRun(
+                    run_type="search",
+                    target_id=target_id,
+                    started_at=NOW - timedelta(days=day + 1),
+                    listings_found=30,
+                    new_listings=changes_per_run,
+                    updated_listings=0,
+                    status="completed",
+                )
+            )
+
+    def _add_listing(self, external_id: str, snapshots: int, scraped_days_ago: int) -> Listing:
+        listing = Listing(
+            external_id=external_id,
+            title=external_id,
+            url=f"https://x/{external_id}/",
+            content_hash="h",
+            first_seen_at=NOW - timedelta(days=20),
+        )
+        self.db.add(listing)
+        self.db.flush()
+        for i in range(snapshots):
+            self.db.add(
+                ListingSnapshot(
+                    listing_id=listing.id,
+                    data_json={},
+                    content_hash=str(i),
+                    created_at=NOW - timedelta(days=i + 1),
+                )
+            )
+        self.db.add(
+            ListingDetail(
+                listing_id=listing.id,
+                scraped_at=NOW - timedelta(days=scraped_days_ago),
+            )
+        )
+        return listing
+
+    def test_hot_targets_crawl_more_often(self) -> None:
+        hot = listing_service.create_search_target(self.db, "https://x/hot")
+        cold = listing_service.create_search_target(self.db, "https://x/cold")
+        self._add_runs(hot.id, changes_per_run=48, days=5)
+        self._add_runs(cold.id, changes_per_run=0, days=5)
+        self.db.flush()
+
+        plans = {
+            plan["target_id"]: plan
+            for plan in cadence_service.plan_target_cadence(self.db, NOW, 10_000)
+        }
+        self.assertEqual(plans[hot.id]["interval"], cadence_service.TARGET_MIN_INTERVAL)
+        self.assertEqual(plans[cold.id]["interval"], cadence_service.TARGET_MAX_INTERVAL)
+
+    def test_budget_stretches_target_intervals(self) -> None:
+        hot = listing_service.create_search_target(self.db, "https://x/hot")
+        self._add_runs(hot.id, changes_per_run=48, days=5)
+        self.db.flush()
+
+        plan = cadence_service.plan_target_cadence(self.db, NOW, fetch_budget_per_day=10)[0]
+        self.assertLessEqual(
+            plan["fetches_per_day"], 10 * cadence_service.SEARCH_BUDGET_SHARE + 1e-6
+        )
+        self.assertGreater(plan["interval"], cadence_service.TARGET_MIN_INTERVAL)
+
+    def test_overrides_over_budget_slow_adaptive_targets(self) -> None:
+        listing_service.create_search_target(self.db, "https://x/manual", cadence_minutes=15)
+        hot = listing_service.create_search_target(self.db, "https://x/hot")
+        self._add_runs(hot.id, changes_per_run=48, days=5)
+        self.db.flush()
+
+        # 96 fetches/day of overrides against a search share of 60
+        plans = {
+            plan["target_id"]: plan
+            for plan in cadence_service.plan_target_cadence(self.db, NOW, fetch_budget_per_day=100)
+        }
+        self.assertEqual(plans[hot.id]["interval"], cadence_service.TARGET_MAX_INTERVAL)
+
+    def test_listing_recrawls_follow_change_rate(self) -> None:
+        busy = self._add_listing("busy", snapshots=20, scraped_days_ago=2)
+        quiet = self._add_listing("quiet", snapshots=1, scraped_days_ago=3)
+        stale = self._add_listing("stale", snapshots=1, scraped_days_ago=8)
+        self.db.flush()
+
+        due = cadence_service.plan_listing_recrawls(self.db, NOW, max_fetches=10)
+        due_ids = [item["listing_id"] for item in due]
+        self.assertIn(busy.id, due_ids)
+        self.assertIn(stale.id, due_ids)
+        self.assertNotIn(quiet.id, due_ids)
+        self.assertEqual(due_ids[0], busy.id)
+
+        plan = cadence_service.plan_crawl_cadence(self.db, NOW, fetch_budget_per_day=48)
+        cadence_service.apply_crawl_plan(self.db, plan)
+        self.assertEqual(plan["listing_fetches_per_cycle"], 2)
+        self.assertEqual(len(plan["listings"]), 2)
+
+    def test_queued_detail_pages_use_the_cycle_budget_first(self) -> None:
+        busy = self._add_listing("busy", snapshots=20, scraped_days_ago=2)
+        self._add_listing("stale", snapshots=1, scraped_days_ago=8)
+        fresh = self._add_listing("fresh", snapshots=1, scraped_days_ago=0)
+        listing_service.queue_listing_for_details(self.db, fresh.id, priority=10)
+        self.db.flush()
+
+        plan = cadence_service.plan_crawl_cadence(self.db, NOW, fetch_budget_per_day=48)
+        self.assertEqual(plan["listing_fetches_per_cycle"], 2)
+        self.assertEqual(plan["pending_detail_fetches"], 1)
+        self.assertEqual([item["listing_id"] for item in plan["listings"]], [busy.id])
+
+    def test_user_set_cadence_is_kept(self) -> None:
+        manual = listing_service.create_search_target(
+            self.db, "https://x/manual", cadence_minutes=30
+        )
+        adaptive = listing_service.create_search_target(self.db, "https://x/adaptive")
+        self._add_runs(manual.id, changes_per_run=0, days=5)
+        self._add_runs(adaptive.id, changes_per_run=0, days=5)
+        self.db.flush()
+
+        plan = cadence_service.plan_crawl_cadence(self.db, NOW, fetch_budget_per_day=10_000)
+        cadence_service.apply_crawl_plan(self.db, plan)
+        self.assertEqual(manual.cadence_minutes, 30)
+        self.assertTrue(manual.cadence_override)
+        self.assertEqual(adaptive.cadence_minutes, 24 * 60)
+
+    def test_detail_page_changes_speed_up_recrawls(self) -> None:
+        quiet = self._add_listing("quiet", snapshots=1, scraped_days_ago=3)
+        edited = self._add_listing("edited", snapshots=1, scraped_days_ago=3)
+        for day in range(7):
+            self.db.add(
+                ListingDetailChange(
+                    listing_id=edited.id, changed_at=NOW - timedelta(days=day + 1)
+                )
+            )
+        self.db.flush()
+
+        due_ids = [
+            item["listing_id"]
+            for item in cadence_service.plan_listing_recrawls(self.db, NOW, max_fetches=10)
+        ]
+        self.assertEqual(due_ids, [edited.id])
+        self.assertNotIn(quiet.id, due_ids)
+
+    def test_detail_recrawl_logs_only_real_changes(self) -> None:
+        listing = Listing(
+            external_id="listing", title="HVAC", url="https://x/listing/", content_hash="h"
+        )
+        self.db.add(listing)
+        self.db.flush()
+        # The first scrape records the page, not a change
+        for description in ["HVAC company", "HVAC company", "HVAC company, new trucks"]:
+            listing_service.save_listing_detail(
+                self.db, listing.id, {"full_description": description}
+            )
+        self.assertEqual(
+            self.db.query(ListingDetailChange).filter_by(listing_id=listing.id).count(), 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
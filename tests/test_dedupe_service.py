@@ -0,0 +1,138 @@
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, DuplicateCluster
+from app.services import dedupe_service, listing_service
+
+
+DESCRIPTION = (
+    "Established residential and commercial HVAC contractor with recurring "
+    "maintenance agreements, two service vans and a loyal customer base built "
+    "over twenty years in the greater Nashville area."
+)
+
+
+def _listing_data(external_id: str, title: str, state: str = "TN", price: int = 900_000):
+    return {
+        "external_id": external_id,
+        "title": title,
+        "url": f"https://x/{external_id}/",
+        "location_state": state,
+        "asking_price": price,
+    }
+
+
+class TestDuplicateDetection(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def _save(self, data, description: str = DESCRIPTION):
+        listing, _is_new, _is_updated = listing_service.save_or_update_listing(self.db, data)
+        listing_service.save_listing_detail(
+            self.db, listing.id, {"full_description": description}
+        )
+        self.db.commit()
+        return listing
+
+    def test_relisted_business_joins_cluster(self) -> None:
+        original = self._save(_listing_data("100", "Profitable HVAC Service Company"))
+        relisted = self._save(
+            _listing_data("200", "Profitable HVAC Service Company - Price Reduced", price=850_000)
+        )
+        self._save(
+            _listing_data("300", "Downtown Coffee Shop"),
+            description="Busy espresso bar with drive-thru near the university campus.",
+        )
+
+        duplicates = dedupe_service.get_duplicates(self.db, relisted.id)
+        self.assertEqual([row["listing"].id for row in duplicates], [original.id])
+        self.assertEqual(duplicates[0]["cluster_id"], original.id)
+        self.assertGreaterEqual(duplicates[0]["similarity"], dedupe_service.SIMILARITY_THRESHOLD)
+        self.assertEqual(self.db.query(DuplicateCluster).count(), 2)
+
+    def test_blocking_on_state_and_price(self) -> None:
+        self._save(_listing_data("100", "Profitable HVAC Service Company"))
+        other_state = self._save(
+            _listing_data("200", "Profitable HVAC Service Company", state="GA")
+        )
+        other_price = self._save(
+            _listing_data("300", "Profitable HVAC Service Company", price=3_000_000)
+        )
+        self.assertEqual(dedupe_service.get_duplicates(self.db, other_state.id), [])
+        self.assertEqual(dedupe_service.get_duplicates(self.db, other_price.id), [])
+
+    def test_clusters_merge_under_oldest_listing(self) -> None:
+        first = self._save(_listing_data("1", "HVAC Company"), description="alpha " * 40)
+        second = self._save(_listing_data("2", "Plumbing Company"), description="bravo " * 40)
+        third = self._save(_listing_data("3", "Roofing Company"), description="delta " * 40)
+        self.assertEqual(dedupe_service.get_duplicates(self.db, first.id), [])
+        # Cluster {second, third} is re-rooted when first matches third
+        dedupe_service._merge_cluster(self.db, third.id, [(second.id, 0.9)])
+        dedupe_service._merge_cluster(self.db, first.id, [(third.id, 0.8)])
+        self.db.commit()
+
+        clusters = {row.listing_id: row.cluster_id for row in self.db.query(DuplicateCluster)}
+        self.assertEqual(
+            clusters, {first.id: first.id, second.id: first.id, third.id: first.id}
+        )
+
+    def test_unchanged_text_is_not_reindexed(self) -> None:
+        listing = self._save(_listing_data("100", "Profitable HVAC Service Company"))
+        signature = (
+            self.db.query(dedupe_service.ListingSignature)
+            .filter_by(listing_id=listing.id)
+            .one()
+        )
+        updated_at = signature.updated_at
+        self.assertEqual(dedupe_service.index_listing(self.db, listing), [])
+        self.assertEqual(signature.updated_at, updated_at)
+
+    def test_title_only_listings_are_not_clustered(self) -> None:
+        for external_id in ("100", "200"):
+            listing_service.save_or_update_listing(
+                self.db, _listing_data(external_id, "Profitable HVAC Service Company")
+            )
+        self.db.commit()
+        self.assertEqual(self.db.query(DuplicateCluster).count(), 0)
+        self.assertEqual(self.db.query(dedupe_service.ListingSignature).count(), 0)
+
+    def test_rewritten_listing_leaves_its_cluster(self) -> None:
+        original = self._save(_listing_data("100", "Profitable HVAC Service Company"))
+        relisted = self._save(_listing_data("200", "Profitable HVAC Service Company"))
+        self.assertEqual(len(dedupe_service.get_duplicates(self.db, relisted.id)), 1)
+
+        self._save(
+            _listing_data("200", "Profitable HVAC Service Company"),
+            description="Busy espresso bar with drive-thru near the university campus.",
+        )
+        self.assertEqual(dedupe_service.get_duplicates(self.db, relisted.id), [])
+        self.assertEqual(dedupe_service.get_duplicates(self.db, original.id), [])
+        self.assertEqual(self.db.query(DuplicateCluster).count(), 0)
+
+    def test_cluster_is_rerooted_when_its_root_leaves(self) -> None:
+        first = self._save(_listing_data("1", "Profitable HVAC Service Company"))
+        second = self._save(_listing_data("2", "Profitable HVAC Service Company"))
+        third = self._save(_listing_data("3", "Profitable HVAC Service Company"))
+
+        self._save(
+            _listing_data("1", "Profitable HVAC Service Company"),
+            description="Busy espresso bar with drive-thru near the university campus.",
+        )
+        clusters = {row.listing_id: row.cluster_id for row in self.db.query(DuplicateCluster)}
+        self.assertEqual(clusters, {second.id: second.id, third.id: second.id})
+        self.assertEqual(
+            [row["listing"].id for row in dedupe_service.get_duplicates(self.db, third.id)],
+            [second.id],
+        )
+        self.assertEqual(dedupe_service.get_duplicates(self.db, first.id), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, Listing, ListingDetail, ListingEmbedding
+from app.services import embedding_service
+
+
+class CountingEmbedder(embedding_service.HashingEmbedder):
+    def __init__(self) -> None:
+        super().__init__(dim=256)
+        self.encoded = 0
+
+    def encode(self, texts, batch_size=64):
+        self.encoded += len(texts)
+        return super().encode(texts, batch_size)
+
+
+class TestEmbeddingService(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model = CountingEmbedder()
+        descriptions = {
+            "1": "Commercial HVAC contractor with recurring service contracts and maintenance plans",
+            "2": "Family pizza restaurant with catering and delivery",
+            "3": "Landscaping company with seasonal lawn care customers",
+        }
+        for external_id, description in descriptions.items():
+            listing = Listing(
+                external_id=external_id,
+                title=f"Business {external_id}",
+                url=f"https://x/{external_id}/",
+                content_hash="h",
+            )
+            self.db.add(listing)
+            self.db.flush()
+            self.db.add(ListingDetail(listing_id=listing.id, full_description=description))
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.tmp.cleanup()
+
+    def _sync(self):
+        return embedding_service.sync_embeddings(
+            self.db, model=self.model, index_dir=self.tmp.name, batch_size=2
+        )
+
+    def _search(self, query: str):
+        return embedding_service.search_listings(
+            self.db, query, limit=2, model=self.model, index_dir=self.tmp.name
+        )
+
+    def test_only_changed_listings_are_reencoded(self) -> None:
+        self.assertEqual(self._sync()["encoded"], 3)
+        self.assertEqual(self._sync()["encoded"], 0)
+
+        detail = self.db.query(ListingDetail).filter_by(listing_id=2).one()
+        detail.full_description = "Family pizza restaurant, now with a bar"
+        self.db.commit()
+        stats = self._sync()
+        self.assertEqual((stats["encoded"], stats["indexed"]), (1, 3))
+        self.assertEqual(self.model.encoded, 4)
+
+    def test_search_ranks_matching_listing_first(self) -> None:
+        self._sync()
+        results = self._search("HVAC service contracts")
+        self.assertEqual(results[0]["listing"].external_id, "1")
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+        listing = self.db.query(Listing).filter_by(external_id="1").one()
+        listing.is_active = False
+        self.db.commit()
+        self.assertNotIn(
+            "1", [result["listing"].external_id for result in self._search("HVAC service contracts")]
+        )
+
+    def test_search_reuses_index_until_a_sync(self) -> None:
+        self._sync()
+        with patch.object(
+            embedding_service,
+            "open_vector_index",
+            wraps=embedding_service.open_vector_index,
+        ) as opened:
+            self._search("pizza delivery")
+            self._search("lawn care")
+            self.assertEqual(opened.call_count, 1)
+
+            self.db.add(
+                Listing(
+                    external_id="4",
+                    title="Boat repair shop",
+                    url="https://x/4/",
+                    content_hash="h",
+                )
+            )
+            self.db.commit()
+            self._sync()
+            opened.reset_mock()
+            results = self._search("boat repair")
+            self.assertEqual(opened.call_count, 1)
+            self.assertEqual(results[0]["listing"].external_id, "4")
+
+    def test_interrupted_sync_leaves_index_in_step_with_db(self) -> None:
+        self._sync()
+        for listing_id, text in [(1, "Boat repair shop"), (3, "Mobile dog grooming van")]:
+            detail = self.db.query(ListingDetail).filter_by(listing_id=listing_id).one()
+            detail.full_description = text
+        self.db.commit()
+
+        # The first batch (listings 1-2) commits, the second crashes
+        real_encode = self.model.encode
+        calls = []
+
+        def crash_on_second_batch(texts, batch_size=64):
+            calls.append(texts)
+            if len(calls) == 2:
+                raise RuntimeError("killed")
+            return real_encode(texts, batch_size)
+
+        with patch.object(self.model, "encode", crash_on_second_batch):
+            with self.assertRaises(RuntimeError):
+                self._sync()
+        self.db.rollback()
+
+        index = embedding_service.open_vector_index(self.model, self.tmp.name)
+        stored = self.db.query(ListingEmbedding).filter_by(listing_id=1).one()
+        hits = index.search(embedding_service.np.frombuffer(stored.vector, dtype="float32"), 1)
+        self.assertEqual(hits[0][0], 1)
+        self.assertAlmostEqual(hits[0][1], 1.0, places=4)
+
+        stats = self._sync()
+        self.assertEqual((stats["encoded"], stats["indexed"]), (1, 3))
+
+    def test_exact_index_fallback_rebuilds_from_cache(self) -> None:
+        with patch.object(
+            embedding_service,
+            "open_vector_index",
+            lambda model, index_dir=None: embedding_service.ExactIndex(
+                embedding_service.Path(index_dir) / "exact", model.dim
+            ),
+        ):
+            self._sync()
+            (embedding_service.Path(self.tmp.name) / "exact.npz").unlink()
+            stats = self._sync()
+            self.assertEqual((stats["encoded"], stats["indexed"]), (0, 3))
+            self.assertEqual(self._search("pizza delivery")[0]["listing"].external_id, "2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+import csv
+import json
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, Listing, ListingDetail, ListingSnapshot
+from app.services.export_service import (
+    export_listings_incremental,
+    export_to_parquet,
+    get_export_watermark,
+)
+from app.services.listing_service import (
+    mark_listing_inactive,
+    save_listing_detail,
+    save_or_update_listing,
+)
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pq = None
+
+
+@unittest.skipIf(pq is None, "pyarrow not installed")
+class TestParquetExport(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        for index in range(5):
+            listing = Listing(
+                external_id=str(index),
+                title=f"Listing {index}",
+                url=f"https://x/{index}/",
+                content_hash="h",
+                asking_price=100_000 * (index + 1),
+                cash_flow_num=50_000,
+                multiple=2.0 * (index + 1),
+            )
+            self.db.add(listing)
+            self.db.flush()
+            self.db.add(
+                ListingDetail(
+                    listing_id=listing.id,
+                    financial_details={"Cash Flow": "$50,000"},
+                    scrape_status="completed",
+                )
+            )
+            for day in (1, 2):
+                self.db.add(
+                    ListingSnapshot(
+                        listing_id=listing.id,
+                        data_json={"title": listing.title, "day": day},
+                        content_hash=f"h{day}",
+                        created_at=datetime(2024, 3, day, 12, index),
+                    )
+                )
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_writes_partitioned_datasets_in_batches(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            files = export_to_parquet(
+                self.db, tmp, batch_size=2, snapshot_date=date(2024, 3, 5)
+            )
+
+            self.assertEqual(
+                [Path(path).parent.name for path in files["listing_snapshots"]],
+                ["snapshot_date=2024-03-01", "snapshot_date=2024-03-02"],
+            )
+            self.assertEqual(
+                Path(files["listings"][0]).parent.name, "snapshot_date=2024-03-05"
+            )
+
+            listings = pq.read_table(files["listings"][0])
+            self.assertEqual(listings.num_rows, 5)
+            self.assertEqual(listings.column("multiple").to_pylist()[-1], 10.0)
+            self.assertEqual(pq.ParquetFile(files["listings"][0]).num_row_groups, 3)
+
+            details = pq.read_table(files["listing_details"][0])
+            self.assertEqual(
+                details.column("financial_details").to_pylist()[0],
+                '{"Cash Flow": "$50,000"}',
+            )
+
+            first_day = pq.read_table(files["listing_snapshots"][0])
+            self.assertEqual(first_day.num_rows, 5)
+            self.assertEqual(sorted(first_day.column("content_hash").to_pylist()), ["h1"] * 5)
+
+
+class TestIncrementalExport(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.tmp = tempfile.TemporaryDirectory()
+        for index in range(3):
+            self._save(str(index))
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.tmp.cleanup()
+
+    def _save(self, external_id: str, **changes) -> Listing:
+        data = {
+            "external_id": external_id,
+            "title": f"Listing {external_id}",
+            "url": f"https://x/{external_id}/",
+            "asking_price": 500_000,
+            **changes,
+        }
+        listing, _is_new, _is_updated = save_or_update_listing(self.db, data)
+        return listing
+
+    def _export(self):
+        result = export_listings_incremental(self.db, "crm", self.tmp.name, batch_size=2)
+        self.db.commit()
+        return result
+
+    def _external_ids(self, path: str):
+        with open(path, newline="", encoding="utf-8") as csvfile:
+            return [row["external_id"] for row in csv.DictReader(csvfile)]
+
+    def test_only_changed_rows_after_watermark(self) -> None:
+        first = self._export()
+        self.assertEqual(first["rows"], 3)
+        self.assertEqual(self._external_ids(first["file"]), ["0", "1", "2"])
+
+        self.assertEqual(self._export()["rows"], 0)
+
+        self._save("3")
+        changed = self._save("0", title="Renamed")
+        self.db.commit()
+
+        second = self._export()
+        self.assertEqual(sorted(self._external_ids(second["file"])), ["0", "3"])
+        with open(second["manifest"], encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+        self.assertEqual(manifest["mode"], "upsert")
+        self.assertEqual(manifest["key"], "external_id")
+        self.assertEqual(manifest["rows"], 2)
+        self.assertEqual(
+            manifest["watermark_to"]["last_changed_at"], str(changed.content_changed_at)
+        )
+
+        watermark = get_export_watermark(self.db, "crm")
+        self.assertEqual(watermark.rows_exported, 5)
+        self.assertEqual(watermark.last_id, changed.id)
+
+    def test_unchanged_recrawl_is_not_exported(self) -> None:
+        self._export()
+        listing = self._save("1")
+        self._save("1")
+        self.db.commit()
+
+        self.assertGreater(listing.last_updated_at, listing.content_changed_at)
+        self.assertEqual(self._export()["rows"], 0)
+
+    def test_detail_page_changes_are_exported(self) -> None:
+        listing = self.db.query(Listing).filter(Listing.external_id == "1").one()
+        detail = {"full_description": "HVAC company", "financial_details": {"Cash Flow": "$100,000"}}
+        save_listing_detail(self.db, listing.id, dict(detail))
+        self.db.commit()
+        self._export()
+
+        # Same detail page again: nothing to export
+        save_listing_detail(self.db, listing.id, dict(detail))
+        self.db.commit()
+        self.assertEqual(self._export()["rows"], 0)
+
+        save_listing_detail(
+            self.db, listing.id, {**detail, "financial_details": {"Cash Flow": "$150,000"}}
+        )
+        self.db.commit()
+        result = self._export()
+        self.assertEqual(self._external_ids(result["file"]), ["1"])
+        self.assertEqual(listing.cash_flow_num, 150_000)
+
+    def test_deactivations_are_exported(self) -> None:
+        self._export()
+        mark_listing_inactive(self.db, "2")
+        self.db.commit()
+
+        result = self._export()
+        with open(result["file"], newline="", encoding="utf-8") as csvfile:
+            rows = list(csv.DictReader(csvfile))
+        self.assertEqual([row["external_id"] for row in rows], ["2"])
+        self.assertEqual(rows[0]["is_active"], "False")
+
+        mark_listing_inactive(self.db, "2")
+        self.db.commit()
+        self.assertEqual(self._export()["rows"], 0)
+
+    def test_rejects_unsafe_destination(self) -> None:
+        with self.assertRaises(ValueError):
+            export_listings_incremental(self.db, "../crm", self.tmp.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
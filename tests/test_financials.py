@@ -0,0 +1,103 @@
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, Listing
+from app.parsers.financials import parse_money
+from app.services import listing_service
+
+
+class TestParseMoney(unittest.TestCase):
+    def test_formats(self) -> None:
+        cases = {
+            "$1,200,000": 1_200_000,
+            "$1.2M": 1_200_000,
+            "950K": 950_000,
+            "$1.5 million": 1_500_000,
+            "Cash Flow: $120,000": 120_000,
+            "(12,000)": -12_000,
+            "$100K - $200K": 150_000,
+            "$1 - 2M": 1_500_000,
+            "$100,000 to $200,000": 150_000,
+        }
+        for text, expected in cases.items():
+            self.assertEqual(parse_money(text), expected, text)
+
+    def test_sign_and_year_context(self) -> None:
+        cases = {
+            "Asking Price - $450,000": 450_000,
+            "SDE (2023): $200,000 (approx)": 200_000,
+            "Revenue (2022) 1.2M": 1_200_000,
+            "-$12,000": -12_000,
+            "$-12,000": -12_000,
+            "($12,000)": -12_000,
+            "Net - (15,000)": -15_000,
+        }
+        for text, expected in cases.items():
+            self.assertEqual(parse_money(text), expected, text)
+        for text in ["2020-2021", "Established 1998"]:
+            self.assertIsNone(parse_money(text), text)
+
+    def test_placeholders(self) -> None:
+        for text in ["N/A", "Not Disclosed", "", None, "Call"]:
+            self.assertIsNone(parse_money(text), text)
+
+
+class TestFinancialColumns(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_columns_follow_listing_and_details(self) -> None:
+        listing, _is_new, _is_updated = listing_service.save_or_update_listing(
+            self.db,
+            {
+                "external_id": "2001",
+                "title": "HVAC Service",
+                "asking_price": 900_000,
+                "cash_flow": "$300K",
+                "revenue": "",
+                "url": "https://x/2001/",
+            },
+        )
+        self.assertEqual(listing.cash_flow_num, 300_000)
+        self.assertIsNone(listing.revenue_num)
+        self.assertEqual(listing.multiple, 3.0)
+
+        listing_service.save_listing_detail(
+            self.db,
+            listing.id,
+            {
+                "financial_details": {"Gross Revenue": "$1,250,000", "Inventory": "N/A"},
+                "inventory_value": "$40,000",
+            },
+        )
+        self.assertEqual(listing.revenue_num, 1_250_000)
+        self.assertEqual(listing.inventory_num, 40_000)
+
+    def test_backfill(self) -> None:
+        self.db.add(
+            Listing(
+                external_id="legacy",
+                title="Legacy",
+                url="https://x/legacy/",
+                content_hash="h",
+                asking_price=500_000,
+                cash_flow="$250,000",
+            )
+        )
+        self.db.commit()
+
+        self.assertEqual(listing_service.backfill_financial_fields(self.db, batch_size=1), 1)
+        listing = self.db.query(Listing).one()
+        self.assertEqual(listing.cash_flow_num, 250_000)
+        self.assertEqual(listing.multiple, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import csv
+import gzip
 import tempfile
 import unittest
 from pathlib import Path
@@ -7,6 +8,7 @@ from app.leadgen.export.sheets import (
     GOOGLE_MAPS_COLUMNS,
     build_google_maps_rows,
     export_google_maps_records_to_csv,
+    google_maps_rows,
     normalize_google_maps_record,
 )
 
@@ -49,6 +51,25 @@ class TestGoogleMapsExport(unittest.TestCase):
         self.assertEqual(rows[0], GOOGLE_MAPS_COLUMNS)
         self.assertEqual(rows[1][1], "Sunrise Coffee")
 
+    def test_rows_follow_columns_and_share_one_timestamp(self) -> None:
+        rows = list(google_maps_rows([SAMPLE_RECORD, SAMPLE_RECORD]))
+        self.assertEqual(len(rows[0]), len(GOOGLE_MAPS_COLUMNS))
+        self.assertEqual(
+            dict(zip(GOOGLE_MAPS_COLUMNS, rows[0]))["place_id"], "place_1"
+        )
+        fetched = GOOGLE_MAPS_COLUMNS.index("fetched_at_utc")
+        self.assertEqual(rows[0][fetched], rows[1][fetched])
+
+    def test_export_compressed_csv(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = export_google_maps_records_to_csv(
+                [SAMPLE_RECORD], output_dir=tmpdir, fetched_at_utc="t", compress=True
+            )
+            self.assertTrue(path.endswith("google_maps_leads.csv.gz"))
+            with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows[0]["vendor_name"], "Sunrise Coffee")
+
     def test_export_csv(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             path = export_google_maps_records_to_csv(
@@ -1,10 +1,15 @@
+import argparse
 import json
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
+from app.leadgen.export.sheets import export_google_maps_stream_to_csv
+from app.leadgen.ingest import google_maps
 from app.leadgen.ingest.google_maps import GoogleMapsIngest
+from app.leadgen.scoring import DEFAULT_MAX_DISTANCE_KM, DEFAULT_WEIGHTS, rank_records
+from app.leadgen.jsonl import append_jsonl, read_jsonl, repair_jsonl
 
 
 class TestGoogleMapsIngest(unittest.IsolatedAsyncioTestCase):
@@ -95,10 +100,10 @@ class TestGoogleMapsIngest(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(rows[0]["source"], "google_maps")
             self.assertEqual(rows[0]["raw_data"]["type"], "Coffee shop")
 
-            output_file = Path(tmpdir) / "google_maps_raw.json"
+            output_file = Path(tmpdir) / "google_maps_raw.jsonl"
             self.assertTrue(output_file.exists())
 
-            saved = json.loads(output_file.read_text(encoding="utf-8"))
+            saved = [json.loads(line) for line in output_file.read_text(encoding="utf-8").splitlines()]
             self.assertEqual(len(saved), 3)
             self.assertEqual(saved[0]["city"], "Nashville")
 
@@ -180,5 +185,127 @@ class TestGoogleMapsIngest(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(rows_second[0]["vendor_name"], "Roaster Corner")
 
 
+def _page(start: int, size: int = 20) -> dict:
+    return {
+        "local_results": [
+            {
+                "title": f"Shop {i}",
+                "address": f"{i} Main St, Memphis, TN 38103",
+                "type": "Coffee shop",
+                "place_id": f"place_{i}",
+            }
+            for i in range(start, start + size)
+        ]
+    }
+
+
+class TestGoogleMapsStreaming(unittest.IsolatedAsyncioTestCase):
+    def _ingest(self, tmpdir: str, **kwargs) -> GoogleMapsIngest:
+        return GoogleMapsIngest(
+            query="coffee shops",
+            location="Memphis, Tennessee",
+            api_key="test_api_key",
+            output_dir=tmpdir,
+            limit=100,
+            dedupe_across_runs=False,
+            **kwargs,
+        )
+
+    async def test_pages_are_saved_before_records_are_yielded(self) -> None:
+        async def fake_search_page(self, start: int):
+            return _page(start) if start < 60 else {"local_results": []}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ingest = self._ingest(tmpdir, compress=True)
+            with patch.object(GoogleMapsIngest, "_search_page", new=fake_search_page):
+                async for record in ingest.stream():
+                    saved = [r["vendor_name"] for r in read_jsonl(ingest.output_path)]
+                    self.assertIn(record["vendor_name"], saved)
+
+            self.assertTrue(ingest.output_path.name.endswith(".jsonl.gz"))
+            self.assertEqual(len(list(read_jsonl(ingest.output_path))), 60)
+
+            with patch.object(GoogleMapsIngest, "_search_page", new=fake_search_page):
+                csv_path = await export_google_maps_stream_to_csv(
+                    self._ingest(tmpdir).stream(), output_dir=tmpdir
+                )
+            self.assertEqual(len(Path(csv_path).read_text(encoding="utf-8").splitlines()), 61)
+
+    async def test_resume_continues_after_crash(self) -> None:
+        calls: list[int] = []
+
+        async def crashing_search_page(self, start: int):
+            if start == 40:
+                raise RuntimeError("network down")
+            return _page(start)
+
+        async def fake_search_page(self, start: int):
+            calls.append(start)
+            return _page(start) if start < 80 else {"local_results": []}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(GoogleMapsIngest, "_search_page", new=crashing_search_page):
+                with self.assertRaises(RuntimeError):
+                    await self._ingest(tmpdir).fetch()
+            # A torn final line, as if the process died mid-write.
+            with (Path(tmpdir) / "google_maps_raw.jsonl").open("a", encoding="utf-8") as f:
+                f.write('{"vendor_name": "Sho')
+
+            ingest = self._ingest(tmpdir, resume=True)
+            with patch.object(GoogleMapsIngest, "_search_page", new=fake_search_page):
+                resumed = await ingest.fetch()
+
+            self.assertEqual(calls, [40, 60, 80])
+            self.assertEqual(len(resumed), 40)
+            self.assertEqual(ingest.records_fetched, 80)
+            names = [r["vendor_name"] for r in read_jsonl(ingest.output_path)]
+            self.assertEqual(names, [f"Shop {i}" for i in range(80)])
+
+    def test_repair_drops_torn_gzip_member(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "raw.jsonl.gz"
+            append_jsonl(path, [{"a": 1}])
+            first_member = path.stat().st_size
+            append_jsonl(path, [{"a": 2}])
+            path.write_bytes(path.read_bytes()[: first_member + 12])
+            self.assertEqual(repair_jsonl(path), 1)
+            append_jsonl(path, [{"a": 3}])
+            self.assertEqual(list(read_jsonl(path)), [{"a": 1}, {"a": 3}])
+
+
+class TestSheetRanking(unittest.TestCase):
+    def test_incremental_rows_are_scored_against_every_stored_lead(self) -> None:
+        def lead(place_id: str, lat: float) -> dict:
+            return {
+                "vendor_name": place_id,
+                "raw_data": {
+                    "place_id": place_id,
+                    "gps_coordinates": {"latitude": lat, "longitude": -90.0},
+                },
+            }
+
+        stored = [lead("a", 35.0), lead("b", 35.0), lead("c", 35.0), lead("far", 35.3)]
+        args = argparse.Namespace(
+            score_weights=dict(DEFAULT_WEIGHTS),
+            score_centroid=None,
+            score_max_km=DEFAULT_MAX_DISTANCE_KM,
+            sheets_incremental=True,
+        )
+
+        def lead_records(niche, updated_since):
+            return [dict(r) for r in (stored if updated_since is None else stored[3:])]
+
+        with patch.object(google_maps, "_lead_records", lead_records):
+            records = google_maps._stored_sheet_records(args, "coffee", saved_at=object())
+
+        # Measured from the median of all four, "far" is ~33 km out; scored
+        # alone it would sit on its own centroid
+        self.assertEqual([r["raw_data"]["place_id"] for r in records], ["far"])
+        expected = rank_records([lead("far", 35.3)], category="coffee", centroid=(35.0, -90.0))
+        self.assertEqual(records[0]["lead_score"], expected[0]["lead_score"])
+        alone = rank_records([lead("far", 35.3)], category="coffee")
+        self.assertNotEqual(records[0]["lead_score"], alone[0]["lead_score"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,191 @@
+import copy
+import re
+import unittest
+from unittest.mock import patch
+
+from app.leadgen.export import sheets
+from app.leadgen.export.sheets import (
+    GOOGLE_MAPS_COLUMNS,
+    sync_google_maps_records_to_worksheet,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code)
+
+
+def _column_number(letters: str) -> int:
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+class FakeWorksheet:
+    """In-memory stand-in for gspread.Worksheet (the calls the sync uses)."""
+
+    def __init__(self, rows=None, fail_next=()) -> None:
+        self.rows = [list(row) for row in rows or []]
+        self.calls = []
+        self.fail_next = list(fail_next)
+
+    def _record(self, name, *args):
+        if self.fail_next:
+            raise FakeAPIError(self.fail_next.pop(0))
+        self.calls.append((name, copy.deepcopy(args)))
+
+    def get_all_values(self, value_render_option=None):
+        self._record("get_all_values")
+        width = max((len(row) for row in self.rows), default=0)
+        cells = [["" if v is None else str(v) for v in row] for row in self.rows]
+        return [row + [""] * (width - len(row)) for row in cells]
+
+    def _write(self, first_row, first_col, values):
+        for offset, row_values in enumerate(values):
+            index = first_row - 1 + offset
+            while len(self.rows) <= index:
+                self.rows.append([])
+            row = self.rows[index]
+            while len(row) < first_col - 1 + len(row_values):
+                row.append("")
+            row[first_col - 1 : first_col - 1 + len(row_values)] = row_values
+
+    def update(self, range_name, values):
+        self._record("update", range_name)
+        match = re.match(r"([A-Z]+)(\d+)", range_name)
+        self._write(int(match.group(2)), _column_number(match.group(1)), values)
+
+    def batch_update(self, data, value_input_option=None):
+        self._record("batch_update", [item["range"] for item in data])
+        for item in data:
+            match = re.match(r"([A-Z]+)(\d+)", item["range"])
+            self._write(int(match.group(2)), _column_number(match.group(1)), item["values"])
+
+    def append_rows(self, values, value_input_option=None):
+        self._record("append_rows", len(values))
+        self.rows.extend(list(row) for row in values)
+
+    def sort(self, *specs, range=None):
+        self._record("sort", specs, range)
+        (column, order), = specs
+        last = int(re.match(r"A2:[A-Z]+(\d+)", range).group(1))
+        body = self.rows[1:last]
+        filled = [row for row in body if row[column - 1] != ""]
+        blank = [row for row in body if row[column - 1] == ""]
+        filled.sort(key=lambda row: float(row[column - 1]), reverse=order == "des")
+        self.rows[1:last] = filled + blank
+
+
+def _record(place_id: str, name: str, rating: float = 4.0, **extra) -> dict:
+    return {
+        "vendor_name": name,
+        "city": "Memphis",
+        "raw_data": {"place_id": place_id, "rating": rating},
+        **extra,
+    }
+
+
+def _sheet_rows(records) -> list:
+    header = list(GOOGLE_MAPS_COLUMNS)
+    rows = [header]
+    for record in records:
+        normalized = sheets.normalize_google_maps_record(record, fetched_at_utc="old")
+        rows.append([normalized[col] for col in header])
+    return rows
+
+
+class TestSheetsSync(unittest.TestCase):
+    def _sync(self, worksheet, records, **kwargs):
+        return sync_google_maps_records_to_worksheet(
+            worksheet, records, fetched_at_utc="new", backoff_seconds=0, **kwargs
+        )
+
+    def test_empty_sheet_gets_header_and_appends(self) -> None:
+        worksheet = FakeWorksheet()
+        stats = self._sync(worksheet, [_record("p1", "A"), _record("p2", "B"), _record("", "C")])
+        self.assertEqual(stats, {"updated": 0, "inserted": 2, "unchanged": 0, "skipped": 1})
+        self.assertEqual(worksheet.rows[0], GOOGLE_MAPS_COLUMNS)
+        self.assertEqual([row[1] for row in worksheet.rows[1:]], ["A", "B"])
+
+    def test_existing_places_update_in_place_and_new_ones_append(self) -> None:
+        existing = [_record(f"p{i}", f"Shop {i}") for i in range(1, 7)]
+        worksheet = FakeWorksheet(_sheet_rows(existing))
+        records = [
+            _record("p1", "Shop 1"),
+            _record("p2", "Shop 2", rating=4.9),
+            _record("p3", "Shop 3", rating=4.8),
+            _record("p6", "Shop 6", rating=3.1),
+            _record("p7", "Shop 7"),
+            _record("p8", "Shop 8"),
+            _record("p9", "Shop 9"),
+        ]
+        stats = self._sync(worksheet, records, chunk_rows=2)
+
+        self.assertEqual(stats, {"updated": 3, "inserted": 3, "unchanged": 1, "skipped": 0})
+        reads = [name for name, _ in worksheet.calls if name == "get_all_values"]
+        self.assertEqual(reads, ["get_all_values"])
+        last = sheets._column_letter(len(GOOGLE_MAPS_COLUMNS))
+        batches = [args[0] for name, args in worksheet.calls if name == "batch_update"]
+        self.assertEqual(batches, [[f"A3:{last}4"], [f"A7:{last}7"]])
+        appends = [args[0] for name, args in worksheet.calls if name == "append_rows"]
+        self.assertEqual(appends, [2, 1])
+
+        rating = GOOGLE_MAPS_COLUMNS.index("rating")
+        fetched = GOOGLE_MAPS_COLUMNS.index("fetched_at_utc")
+        self.assertEqual(worksheet.rows[2][rating], 4.9)
+        self.assertEqual(worksheet.rows[1][fetched], "old")
+        self.assertEqual(worksheet.rows[2][fetched], "new")
+        self.assertEqual(len(worksheet.rows), 10)
+
+    def test_only_fetched_at_changed_is_not_rewritten(self) -> None:
+        existing = [_record(f"p{i}", f"Shop {i}", rating=4.5) for i in range(1, 4)]
+        worksheet = FakeWorksheet(_sheet_rows(existing))
+        stats = self._sync(worksheet, existing)
+
+        self.assertEqual(stats, {"updated": 0, "inserted": 0, "unchanged": 3, "skipped": 0})
+        self.assertEqual([name for name, _ in worksheet.calls], ["get_all_values"])
+
+    def test_scored_rows_keep_score_order(self) -> None:
+        existing = [
+            _record("p1", "Shop 1", lead_score=0.7),
+            _record("p2", "Shop 2", lead_score=0.4),
+        ]
+        worksheet = FakeWorksheet(_sheet_rows(existing))
+        stats = self._sync(
+            worksheet,
+            [_record("p3", "Shop 3", lead_score=0.9), _record("p4", "Shop 4", lead_score=0.5)],
+        )
+
+        self.assertEqual(stats["inserted"], 2)
+        last = sheets._column_letter(len(GOOGLE_MAPS_COLUMNS))
+        sorts = [args for name, args in worksheet.calls if name == "sort"]
+        score = GOOGLE_MAPS_COLUMNS.index("lead_score")
+        self.assertEqual(sorts, [(((score + 1, "des"),), f"A2:{last}5")])
+        self.assertEqual([row[1] for row in worksheet.rows[1:]], ["Shop 3", "Shop 1", "Shop 4", "Shop 2"])
+
+    def test_retries_rate_limited_calls(self) -> None:
+        worksheet = FakeWorksheet(fail_next=[429, 503])
+        with patch.object(sheets.time, "sleep") as sleep:
+            stats = self._sync(worksheet, [_record("p1", "A")])
+        self.assertEqual(stats["inserted"], 1)
+        self.assertEqual(sleep.call_count, 2)
+
+        worksheet = FakeWorksheet(fail_next=[400])
+        with self.assertRaises(FakeAPIError):
+            self._sync(worksheet, [_record("p1", "A")])
+
+    def test_rejects_foreign_header(self) -> None:
+        worksheet = FakeWorksheet([["name", "phone"]])
+        with self.assertRaises(ValueError):
+            self._sync(worksheet, [_record("p1", "A")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, IngestRun, Lead
+from app.services import lead_service
+
+
+def _record(place_id: str, name: str, rating=None, reviews=None, query="coffee shops", city="Memphis") -> dict:
+    return {
+        "source": "google_maps",
+        "vendor_name": name,
+        "city": city,
+        "state": "TN",
+        "raw_data": {
+            "query": query,
+            "location": "Memphis, Tennessee",
+            "place_id": place_id,
+            "rating": rating,
+            "reviews": reviews,
+            "gps_coordinates": {"latitude": 35.14, "longitude": -90.05},
+        },
+    }
+
+
+def _names(records) -> list:
+    return [record["vendor_name"] for record in records]
+
+
+class TestLeadService(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_upsert_tracks_rating_and_review_changes(self) -> None:
+        first_run, stats = lead_service.record_ingest(
+            self.db,
+            "coffee shops",
+            "Memphis, Tennessee",
+            [_record("p1", "Sunrise", 4.5, 10), _record("p2", "Roasters", 4.0, 3), _record("", "No ID")],
+        )
+        self.assertEqual(stats, {"new": 2, "updated": 0, "unchanged": 0, "skipped": 1})
+        self.assertEqual((first_run.status, first_run.records_fetched, first_run.new_leads), ("completed", 3, 2))
+
+        later = datetime(2030, 1, 1)
+        stats = lead_service.upsert_leads(
+            self.db,
+            [_record("p1", "Sunrise", 4.6, 12), _record("p2", "Roasters", 4.0, 3), _record("p3", "Taco Place")],
+            now=later,
+        )
+        self.assertEqual(stats, {"new": 1, "updated": 1, "unchanged": 1, "skipped": 0})
+
+        lead = self.db.query(Lead).filter(Lead.place_id == "p1").one()
+        self.assertEqual((lead.rating, lead.reviews, lead.latitude), (4.6, 12, 35.14))
+        self.assertEqual(lead.last_updated_at, later)
+        history = lead_service.get_lead_history(self.db, lead.id)
+        self.assertEqual([(h["rating"], h["reviews"]) for h in history], [(4.5, 10), (4.6, 12)])
+
+        unchanged = self.db.query(Lead).filter(Lead.place_id == "p2").one()
+        self.assertEqual(unchanged.last_seen_at, later)
+        self.assertLess(unchanged.last_updated_at, later)
+        self.assertEqual(len(lead_service.get_lead_history(self.db, unchanged.id)), 1)
+        self.assertEqual(self.db.query(IngestRun).count(), 1)
+
+    def test_export_queries(self) -> None:
+        lead_service.upsert_leads(
+            self.db,
+            [
+                _record("p1", "Sunrise"),
+                _record("p2", "Fade Shop", query="barbers"),
+                _record("p3", "Germantown Beans", city="Germantown"),
+            ],
+            now=datetime(2024, 1, 1),
+        )
+        lead_service.upsert_leads(self.db, [_record("p3", "Germantown Beans", 4.9, 1, city="Germantown")], now=datetime(2024, 2, 1))
+
+        self.assertEqual(_names(lead_service.get_lead_records(self.db, niche="coffee shops")), ["Sunrise", "Germantown Beans"])
+        self.assertEqual(_names(lead_service.get_lead_records(self.db, niche="coffee shops", city="Memphis")), ["Sunrise"])
+        self.assertEqual(
+            _names(lead_service.get_lead_records(self.db, updated_since=datetime(2024, 1, 15))),
+            ["Germantown Beans"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
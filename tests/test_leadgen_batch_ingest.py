@@ -0,0 +1,128 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.leadgen.ingest.batch import run_batch_ingest
+from app.leadgen.ingest.google_maps import GoogleMapsIngest
+from app.leadgen.jsonl import read_jsonl
+from app.leadgen.seen_ids import SqliteSeenIdStore
+
+
+def _result(place_id: str, title: str, city: str) -> dict:
+    return {
+        "title": title,
+        "address": f"1 Main St, {city}, TN 37000",
+        "type": "Coffee shop",
+        "place_id": place_id,
+        "data_id": f"data_{place_id}",
+    }
+
+
+PAGES = {
+    ("coffee shops", "Memphis, Tennessee"): [
+        _result("p1", "Memphis Roasters", "Memphis"),
+        _result("shared", "Chain Coffee", "Memphis"),
+    ],
+    ("coffee shops", "Nashville, Tennessee"): [
+        _result("shared", "Chain Coffee", "Nashville"),
+        _result("p2", "Music City Beans", "Nashville"),
+    ],
+    ("barbers", "Memphis, Tennessee"): [_result("p3", "Fade Shop", "Memphis")],
+}
+
+
+class TestBatchIngest(unittest.IsolatedAsyncioTestCase):
+    async def test_fans_out_jobs_and_dedupes_globally(self) -> None:
+        running = 0
+        peak = 0
+
+        async def fake_search_page(self, start: int):
+            nonlocal running, peak
+            assert self.client is not None and self.rate_limiter is not None
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if (self.query, self.location) == ("barbers", "Nashville, Tennessee"):
+                raise RuntimeError("quota exceeded")
+            if start:
+                return {"local_results": []}
+            return {"local_results": PAGES.get((self.query, self.location), [])}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(GoogleMapsIngest, "_search_page", new=fake_search_page):
+                result = await run_batch_ingest(
+                    queries=["coffee shops", "barbers"],
+                    locations=["Memphis, Tennessee", "Nashville, Tennessee"],
+                    api_key="test_api_key",
+                    output_dir=tmpdir,
+                    concurrency=2,
+                    requests_per_second=1000,
+                )
+
+            self.assertLessEqual(peak, 2)
+            self.assertEqual(
+                [record["raw_data"]["place_id"] for record in result["records"]],
+                ["p1", "shared", "p2", "p3"],
+            )
+            errors = [job for job in result["jobs"] if job["error"]]
+            self.assertEqual([(job["query"], job["location"]) for job in errors], [("barbers", "Nashville, Tennessee")])
+
+            coffee = Path(tmpdir) / "coffee_shops"
+            saved = list(read_jsonl(coffee / "google_maps_raw.jsonl"))
+            self.assertEqual(len(saved), 3)
+            self.assertTrue((coffee / "google_maps_leads.csv").exists())
+            store = SqliteSeenIdStore(
+                Path(tmpdir) / "seen_ids.db", namespace="coffee_shops_memphis,_tennessee"
+            )
+            self.assertEqual(store.seen_among(["p1", "shared", "p2"]), {"p1", "shared"})
+            store.close()
+
+    async def test_failed_job_keeps_pages_fetched_before_the_failure(self) -> None:
+        async def fake_search_page(self, start: int):
+            if start:
+                raise RuntimeError("quota exceeded")
+            return {
+                "local_results": [
+                    _result(f"p{i}", f"Shop {i}", "Memphis") for i in range(20)
+                ]
+            }
+
+        namespace = "coffee_shops_memphis,_tennessee"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            kwargs = dict(
+                queries=["coffee shops"],
+                locations=["Memphis, Tennessee"],
+                api_key="test_api_key",
+                output_dir=tmpdir,
+            )
+            with patch.object(GoogleMapsIngest, "_search_page", new=fake_search_page):
+                with patch(
+                    "app.leadgen.ingest.batch._write_niche_outputs",
+                    side_effect=OSError("disk full"),
+                ):
+                    with self.assertRaises(OSError):
+                        await run_batch_ingest(**kwargs)
+                store = SqliteSeenIdStore(Path(tmpdir) / "seen_ids.db", namespace=namespace)
+                self.assertEqual(len(store), 0)
+                store.close()
+
+                result = await run_batch_ingest(**kwargs)
+
+            self.assertEqual(len(result["records"]), 20)
+            self.assertEqual(result["jobs"][0]["error"], "quota exceeded")
+            saved = list(read_jsonl(Path(tmpdir) / "coffee_shops" / "google_maps_raw.jsonl"))
+            self.assertEqual(len(saved), 20)
+            store = SqliteSeenIdStore(Path(tmpdir) / "seen_ids.db", namespace=namespace)
+            self.assertEqual(len(store), 20)
+            store.close()
+
+    async def test_requires_queries_and_locations(self) -> None:
+        with self.assertRaises(ValueError):
+            await run_batch_ingest(queries=[" "], locations=["Memphis"], api_key="k")
+
+
+if __name__ == "__main__":
+    unittest.main()
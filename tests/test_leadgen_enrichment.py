@@ -0,0 +1,134 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+from app.leadgen.enrich.website import (
+    EnrichmentCache,
+    WebsiteEnricher,
+    extract_emails,
+    extract_socials,
+    extract_tech,
+)
+from app.leadgen.export.sheets import normalize_google_maps_record
+
+HOME = """
+<html><head><script src="https://www.googletagmanager.com/gtm.js?id=GTM-1"></script>
+<link href="/wp-content/themes/cafe/style.css" rel="stylesheet"></head>
+<body>
+  <a href="https://www.facebook.com/sharer/sharer.php?u=x">Share</a>
+  <a href="https://www.facebook.com/sunrisecoffee">Facebook</a>
+  <a href="https://instagram.com/sunrise.coffee/">Instagram</a>
+  <a href="/contact-us">Contact</a>
+  <img src="logo@2x.png">
+</body></html>
+"""
+CONTACT = '<p>Email <a href="mailto:Hello@SunriseCoffee.example">us</a> or jobs@sunrisecoffee.example.</p>'
+
+
+def _lead(place_id: str, website: str | None) -> dict:
+    return {"vendor_name": place_id, "raw_data": {"place_id": place_id, "website": website}}
+
+
+class TestExtractors(unittest.TestCase):
+    def test_extracts_contacts_and_tech(self) -> None:
+        self.assertEqual(
+            extract_emails(CONTACT), ["hello@sunrisecoffee.example", "jobs@sunrisecoffee.example"]
+        )
+        self.assertEqual(extract_emails(HOME), [])
+        self.assertEqual(
+            extract_socials(HOME, "https://sunrisecoffee.example/"),
+            {
+                "facebook": "https://www.facebook.com/sunrisecoffee",
+                "instagram": "https://instagram.com/sunrise.coffee/",
+            },
+        )
+        self.assertEqual(extract_tech(HOME), ["wordpress", "google_tag_manager"])
+
+
+class TestWebsiteEnricher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.requests = []
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(str(request.url))
+        html_headers = {"content-type": "text/html; charset=utf-8"}
+        if request.url.host == "sunrisecoffee.example":
+            body = CONTACT if request.url.path == "/contact-us" else HOME
+            return httpx.Response(200, text=body, headers=html_headers)
+        if request.url.host == "slow.example":
+            raise httpx.ConnectTimeout("timed out", request=request)
+        if request.url.host == "broken.example":
+            raise ValueError("malformed URL")
+        return httpx.Response(404, text="missing", headers=html_headers)
+
+    def _enricher(self) -> WebsiteEnricher:
+        return WebsiteEnricher(
+            concurrency=4,
+            per_domain_rate=1000,
+            cache=EnrichmentCache(Path(self.tmp.name) / "cache.db"),
+            transport=httpx.MockTransport(self._handler),
+        )
+
+    async def test_enriches_once_per_domain_and_caches(self) -> None:
+        records = [
+            _lead("p1", "https://sunrisecoffee.example/"),
+            _lead("p2", "sunrisecoffee.example/locations/downtown"),
+            _lead("p3", "https://www.facebook.com/tacoplace"),
+            _lead("p4", None),
+            _lead("p5", "https://slow.example"),
+        ]
+        enricher = self._enricher()
+        await enricher.enrich(records)
+        enricher.close()
+
+        self.assertCountEqual(
+            self.requests,
+            ["https://sunrisecoffee.example/", "https://sunrisecoffee.example/contact-us", "https://slow.example"],
+        )
+        first = records[0]["enrichment"]
+        self.assertIs(records[1]["enrichment"], first)
+        self.assertEqual(first["status"], "ok")
+        self.assertEqual(first["emails"], ["hello@sunrisecoffee.example", "jobs@sunrisecoffee.example"])
+        self.assertEqual(records[2]["enrichment"]["status"], "social_only")
+        self.assertEqual(records[3]["enrichment"]["status"], "no_website")
+        self.assertEqual(records[4]["enrichment"]["status"], "error: ConnectTimeout")
+        self.assertEqual(enricher.stats["errors"], 1)
+
+        row = normalize_google_maps_record(records[0], fetched_at_utc="t")
+        self.assertEqual(row["emails"], "hello@sunrisecoffee.example; jobs@sunrisecoffee.example")
+        self.assertEqual(row["instagram"], "https://instagram.com/sunrise.coffee/")
+        self.assertEqual(row["tech_hints"], "wordpress, google_tag_manager")
+
+        self.requests.clear()
+        again = self._enricher()
+        rerun = [_lead("p1", "https://sunrisecoffee.example"), _lead("p5", "https://slow.example")]
+        await again.enrich(rerun)
+        again.close()
+        self.assertEqual(self.requests, ["https://slow.example"])
+        self.assertEqual(again.stats["cached"], 1)
+        self.assertEqual(rerun[0]["enrichment"]["emails"], first["emails"])
+
+    async def test_unexpected_error_stays_with_its_domain(self) -> None:
+        records = [_lead("p1", "https://broken.example"), _lead("p2", "https://sunrisecoffee.example")]
+        cache = EnrichmentCache(Path(self.tmp.name) / "cache.db")
+        enricher = WebsiteEnricher(
+            per_domain_rate=1000, cache=cache, transport=httpx.MockTransport(self._handler)
+        )
+        await enricher.enrich(records)
+
+        self.assertEqual(records[0]["enrichment"]["status"], "error: ValueError")
+        self.assertEqual(records[1]["enrichment"]["status"], "ok")
+        self.assertEqual(enricher.stats["errors"], 1)
+        self.assertIsNone(cache.get("broken.example"))
+        self.assertEqual(cache.get("sunrisecoffee.example"), records[1]["enrichment"])
+        enricher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
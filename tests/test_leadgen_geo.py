@@ -0,0 +1,142 @@
+import random
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from app.leadgen.geo import (
+    GeoDedupeIndex,
+    dedupe_records,
+    grid_tiles,
+    name_similarity,
+    normalize_name,
+    parse_bbox,
+)
+from app.leadgen.ingest.batch import run_batch_ingest
+from app.leadgen.ingest.google_maps import GoogleMapsIngest
+
+
+def _lead(name, lat=None, lon=None, place_id=None, address=None, phone=None) -> dict:
+    gps = {"latitude": lat, "longitude": lon} if lat is not None else None
+    return {
+        "vendor_name": name,
+        "raw_data": {
+            "place_id": place_id,
+            "address": address,
+            "phone": phone,
+            "gps_coordinates": gps,
+        },
+    }
+
+
+class TestGeoDedupeIndex(unittest.TestCase):
+    def test_names(self) -> None:
+        self.assertEqual(normalize_name("The Sunrise Coffee Co."), "sunrise coffee")
+        self.assertEqual(name_similarity("sunrise coffee", "sunrise coffee roasters"), 1.0)
+        self.assertGreaterEqual(name_similarity("cafe olé", "cafe ole"), 0.8)
+        self.assertLess(name_similarity("sunrise coffee", "fade shop"), 0.5)
+
+    def test_nearby_similar_names_merge_and_chain_locations_do_not(self) -> None:
+        records = [
+            _lead("Sunrise Coffee", 35.1495, -90.0490, place_id="p1"),
+            _lead("Sunrise Coffee Co.", 35.14955, -90.04905),  # ~7 m away, no ID
+            _lead("Fade Shop", 35.1496, -90.0491),  # next door, different business
+            _lead("Starbucks", 35.1495, -90.0490, place_id="s1"),
+            _lead("Starbucks", 35.1600, -90.0300, place_id="s2"),  # ~2 km away
+            _lead("Taco Place", 35.1700, -90.0100, phone="(901) 555-0100"),
+            _lead("Los Tacos", 35.17003, -90.01002, phone="+1 901-555-0100"),
+            _lead("Mystery Shop", address="1 Main St"),
+            _lead("Mystery Shop", address="9 Elm St"),
+            _lead("Sunrise Coffee", 35.2, -90.1, place_id="P1"),  # same place_id
+        ]
+        kept = dedupe_records(records)
+        self.assertEqual(
+            [(r["vendor_name"], r["raw_data"]["place_id"]) for r in kept],
+            [
+                ("Sunrise Coffee", "p1"),
+                ("Fade Shop", None),
+                ("Starbucks", "s1"),
+                ("Starbucks", "s2"),
+                ("Taco Place", None),
+                ("Mystery Shop", None),
+                ("Mystery Shop", None),
+            ],
+        )
+
+    def test_zero_distance_disables_fuzzy_matching(self) -> None:
+        index = GeoDedupeIndex(max_distance_m=0)
+        self.assertIsNone(index.match_or_add(_lead("Sunrise Coffee", 35.1, -90.0)))
+        self.assertIsNone(index.match_or_add(_lead("Sunrise Coffee Roasters", 35.1, -90.0)))
+        self.assertIsNotNone(index.match_or_add(_lead("Sunrise Coffee", 35.1, -90.0)))
+
+    def test_one_index_across_latitudes(self) -> None:
+        index = GeoDedupeIndex()
+        index.match_or_add(_lead("Equator Cafe", 0.0, -78.5, place_id="q1"))
+        # 70 m apart in longitude at 70°N spans several equator-scaled cells
+        step = 70 / (111_320 * 0.342)
+        for i in range(20):
+            # Starting points at every offset within a cell, 1 km apart
+            lon = 25.0 + i * (0.03 + 0.000031)
+            name = f"Northern Cafe {chr(97 + i) * 6}"
+            self.assertIsNone(index.match_or_add(_lead(name, 70.0, lon, place_id=f"a{i}")))
+            self.assertEqual(
+                index.match_or_add(_lead(name, 70.0, lon + step, place_id=f"b{i}")),
+                f"place_id:a{i}",
+            )
+
+    def test_scales_to_a_metro(self) -> None:
+        rng = random.Random(7)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        records = [
+            _lead("".join(rng.choices(letters, k=10)), 35.0 + rng.random() * 0.3, -90.2 + rng.random() * 0.4, place_id=f"p{i}")
+            for i in range(30_000)
+        ]
+        records += [dict(r, raw_data={**r["raw_data"], "place_id": None}) for r in records[:1000]]
+        started = time.perf_counter()
+        kept = dedupe_records(records)
+        self.assertEqual(len(kept), 30_000)
+        self.assertLess(time.perf_counter() - started, 10.0)
+
+
+class TestTiles(unittest.IsolatedAsyncioTestCase):
+    def test_grid_tiles_cover_bbox(self) -> None:
+        bbox = parse_bbox("35.0,-90.2,35.1,-90.0")
+        tiles = grid_tiles(bbox, tile_km=5)
+        self.assertEqual(len(tiles), 3 * 4)
+        self.assertEqual(tiles[0], "@35.016667,-90.175000,15z")
+        with self.assertRaises(ValueError):
+            parse_bbox("35.1,-90.2,35.0,-90.0")
+
+    async def test_tile_jobs_search_by_viewport_and_merge(self) -> None:
+        seen_params = []
+
+        async def fake_search_page(self, start: int):
+            seen_params.append(self.ll)
+            if start:
+                return {"local_results": []}
+            return {
+                "local_results": [
+                    {"title": "Shared Cafe", "place_id": "shared"},
+                    {"title": f"Cafe {self.ll}", "place_id": self.ll},
+                ]
+            }
+
+        tiles = ["@35.0,-90.0,14z", "@35.0,-89.9,14z"]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(GoogleMapsIngest, "_search_page", new=fake_search_page):
+                result = await run_batch_ingest(
+                    queries=["coffee shops"],
+                    locations=["Memphis, Tennessee"],
+                    api_key="test_api_key",
+                    output_dir=tmpdir,
+                    dedupe_across_runs=False,
+                    tiles=tiles,
+                )
+        self.assertCountEqual(set(seen_params), tiles)
+        self.assertEqual(len(result["records"]), 3)
+        self.assertEqual([job["tile"] for job in result["jobs"]], tiles)
+        self.assertEqual([job["kept"] for job in result["jobs"]], [2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import random
+import time
+import unittest
+
+from app.leadgen.export.sheets import normalize_google_maps_record
+from app.leadgen.scoring import (
+    category_terms,
+    lead_features,
+    parse_weights,
+    rank_records,
+    score_leads,
+)
+
+
+def _lead(name, rating=None, reviews=None, website=None, category="Coffee shop", lat=None, lon=None) -> dict:
+    gps = {"latitude": lat, "longitude": lon} if lat is not None else None
+    return {
+        "vendor_name": name,
+        "contract_category": category,
+        "raw_data": {"rating": rating, "reviews": reviews, "website": website, "gps_coordinates": gps},
+    }
+
+
+def _rows(records) -> list:
+    return [normalize_google_maps_record(record, fetched_at_utc="t") for record in records]
+
+
+class TestLeadScoring(unittest.TestCase):
+    def test_features(self) -> None:
+        rows = _rows(
+            [
+                _lead("Top", 5.0, 500, "https://top.example", lat=35.0, lon=-90.0),
+                _lead("Bare", category="Barber shop"),
+                _lead("Far", 3.0, 0, lat=35.0, lon=-89.0),  # ~91 km east
+            ]
+        )
+        features = lead_features(rows, terms=category_terms("coffee shops"), centroid=(35.0, -90.0))
+        self.assertEqual(features["rating"].tolist(), [1.0, 0.0, 0.5])
+        self.assertEqual(features["reviews"].tolist(), [1.0, 0.0, 0.0])
+        self.assertEqual(features["website"].tolist(), [1.0, 0.0, 0.0])
+        self.assertEqual(features["category"].tolist(), [1.0, 1.0, 1.0])
+        self.assertEqual(features["distance"].tolist(), [1.0, 0.0, 0.0])
+        self.assertEqual(
+            lead_features(rows, terms=["coffee"])["category"].tolist(), [1.0, 0.0, 1.0]
+        )
+
+    def test_rank_records_with_custom_weights(self) -> None:
+        records = [
+            _lead("No site, great reviews", 4.8, 300),
+            _lead("Has site", 4.8, 300, "https://x.example"),
+            _lead("Unrated"),
+        ]
+        ranked = rank_records(records, category="coffee shops")
+        self.assertEqual([r["vendor_name"] for r in ranked], ["Has site", "No site, great reviews", "Unrated"])
+        self.assertGreater(ranked[0]["lead_score"], ranked[1]["lead_score"])
+        self.assertEqual(normalize_google_maps_record(ranked[0])["lead_score"], ranked[0]["lead_score"])
+
+        ranked = rank_records(records, weights=parse_weights("website=-1"), category="coffee shops")
+        self.assertEqual(ranked[0]["vendor_name"], "No site, great reviews")
+        with self.assertRaises(ValueError):
+            parse_weights("popularity=1")
+
+    def test_scores_100k_leads_quickly(self) -> None:
+        rng = random.Random(3)
+        categories = ["Coffee shop", "Cafe", "Bakery", "Espresso bar", "Restaurant"]
+        rows = _rows(
+            _lead(
+                f"Lead {i}",
+                round(rng.uniform(1, 5), 1),
+                rng.randint(0, 2000),
+                "https://x.example" if i % 3 else None,
+                rng.choice(categories),
+                35.0 + rng.random() * 0.3,
+                -90.2 + rng.random() * 0.4,
+            )
+            for i in range(100_000)
+        )
+        started = time.perf_counter()
+        scores = score_leads(rows, terms=category_terms("coffee shops"))
+        elapsed = time.perf_counter() - started
+        self.assertEqual(scores.shape, (100_000,))
+        self.assertTrue(((scores >= 0) & (scores <= 1)).all())
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.leadgen.seen_ids import (
+    BloomFilter,
+    JsonSeenIdStore,
+    SeenIdStore,
+    SqliteSeenIdStore,
+    migrate_json_seen_ids,
+    open_seen_id_store,
+)
+
+
+class TestSeenIdStores(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "seen_ids.db"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_sqlite_store_namespaces_and_persists(self) -> None:
+        coffee = SqliteSeenIdStore(self.db_path, namespace="coffee_shops_memphis")
+        coffee.add_many(["a", "b"])
+        self.assertEqual(coffee.seen_among(["a", "c"]), {"a"})
+        coffee.close()
+
+        barbers = SqliteSeenIdStore(self.db_path, namespace="barbers_memphis")
+        self.assertEqual(barbers.seen_among(["a", "b"]), set())
+        barbers.close()
+
+        reopened = SqliteSeenIdStore(self.db_path, namespace="coffee_shops_memphis", use_bloom=True)
+        self.assertEqual(reopened.seen_among(["a", "b", "c"]), {"a", "b"})
+        reopened.add_many(["a", "c"])
+        self.assertEqual(len(reopened), 3)
+        reopened.close()
+
+    def test_two_connections_share_the_file(self) -> None:
+        first = SqliteSeenIdStore(self.db_path, namespace="n")
+        second = SqliteSeenIdStore(self.db_path, namespace="n")
+        first.add_many(["x"])
+        first.flush()
+        second.add_many(["x", "y"])
+        second.flush()
+        self.assertEqual(first.seen_among(["x", "y", "z"]), {"x", "y"})
+        first.close()
+        second.close()
+
+    def test_bloom_filter_has_no_false_negatives(self) -> None:
+        bloom = BloomFilter(1000, error_rate=0.01)
+        keys = [f"place_{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f"other_{i}" in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_incomplete_store_fails_on_construction(self) -> None:
+        class LookupOnlyStore(SeenIdStore):
+            def seen_among(self, keys):
+                return set()
+
+        with self.assertRaises(TypeError):
+            LookupOnlyStore()
+
+    def test_open_store_keeps_json_paths_on_legacy_format(self) -> None:
+        json_path = Path(self.tmp.name) / "legacy.json"
+        store = open_seen_id_store(json_path, namespace="ignored")
+        self.assertIsInstance(store, JsonSeenIdStore)
+        store.add_many(["b", "a"])
+        store.close()
+        self.assertEqual(json.loads(json_path.read_text(encoding="utf-8")), ["a", "b"])
+
+    def test_migrate_json_files(self) -> None:
+        json_dir = Path(self.tmp.name) / "seen_ids"
+        json_dir.mkdir()
+        (json_dir / "coffee_shops_memphis,_tennessee.json").write_text(
+            json.dumps(["ChIJ-A", "chij-b"]), encoding="utf-8"
+        )
+        (json_dir / "tacos_memphis,_tennessee.json").write_text("[]", encoding="utf-8")
+
+        counts = migrate_json_seen_ids(json_dir, self.db_path)
+        self.assertEqual(counts, {"coffee_shops_memphis,_tennessee": 2, "tacos_memphis,_tennessee": 0})
+        self.assertEqual(migrate_json_seen_ids(json_dir, self.db_path), counts)
+
+        store = SqliteSeenIdStore(self.db_path, namespace="coffee_shops_memphis,_tennessee")
+        self.assertEqual(store.seen_among(["chij-a", "chij-b"]), {"chij-a", "chij-b"})
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
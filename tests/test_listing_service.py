@@ -0,0 +1,112 @@
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, Listing, ListingSnapshot
+from app.services import listing_service
+
+
+def _listing(external_id: str, **values) -> Listing:
+    defaults = {
+        "title": f"Listing {external_id}",
+        "url": f"https://x/{external_id}/",
+        "content_hash": "h",
+        "location_state": "TN",
+        "first_seen_at": datetime(2024, 3, 1),
+    }
+    defaults.update(values)
+    return Listing(external_id=external_id, **defaults)
+
+
+class TestListingQueries(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add_all(
+            [
+                _listing("1", title="HVAC Service Co", asking_price=900_000, cash_flow_num=300_000),
+                _listing("2", title="Pizza Shop", asking_price=250_000, business_category="Restaurants"),
+                _listing("3", title="HVAC Installer", asking_price=1_500_000, location_state="GA"),
+                _listing("4", title="Closed HVAC", asking_price=100_000, is_active=False),
+                _listing("5", title="Bakery", first_seen_at=datetime(2024, 3, 10), is_retirement_listing=True),
+            ]
+        )
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_search_filters_sorts_and_pages(self) -> None:
+        filters = {"is_active": True, "keyword": "hvac"}
+        first = listing_service.search_listings(
+            self.db, filters, sort_by="asking_price", limit=1
+        )
+        second = listing_service.search_listings(
+            self.db, filters, sort_by="asking_price", limit=1, offset=1
+        )
+        self.assertEqual([first[0].external_id, second[0].external_id], ["3", "1"])
+        self.assertEqual(listing_service.count_listings(self.db, filters), 2)
+        self.assertEqual(
+            [
+                listing.external_id
+                for listing in listing_service.search_listings(
+                    self.db, {"category": "restaurant", "state": "TN"}
+                )
+            ],
+            ["2"],
+        )
+        with self.assertRaises(ValueError):
+            listing_service.search_listings(self.db, {}, sort_by="title")
+
+    def test_stats_and_new_listings(self) -> None:
+        stats = listing_service.get_listing_stats(self.db, datetime(2024, 3, 5), state="TN")
+        self.assertEqual(stats["total_listings"], 4)
+        self.assertEqual(stats["active_listings"], 3)
+        self.assertEqual(stats["retirement_listings"], 1)
+        self.assertEqual(stats["new_since"], 1)
+        self.assertEqual(stats["avg_asking_price"], 575_000)
+
+        new = listing_service.get_new_listings(self.db, datetime(2024, 2, 1), limit=2)
+        self.assertEqual(new[0].external_id, "5")
+        self.assertEqual(len(new), 2)
+
+    def test_price_history_keeps_changes_only(self) -> None:
+        listing = self.db.query(Listing).filter_by(external_id="1").one()
+        for day, price in [(1, 900_000), (2, 900_000), (5, 850_000)]:
+            self.db.add(
+                ListingSnapshot(
+                    listing_id=listing.id,
+                    data_json={"asking_price": price, "cash_flow": "$300,000"},
+                    content_hash=str(day),
+                    created_at=datetime(2024, 3, day),
+                )
+            )
+        self.db.commit()
+
+        history = listing_service.get_price_history(self.db, listing.id)
+        self.assertEqual(
+            [(point["date"], point["asking_price"]) for point in history],
+            [("2024-03-01", 900_000), ("2024-03-05", 850_000)],
+        )
+
+    def test_compact_listing_drops_empty_fields(self) -> None:
+        listing = self.db.query(Listing).filter_by(external_id="2").one()
+        self.assertEqual(
+            listing_service.compact_listing(listing),
+            {
+                "id": listing.id,
+                "title": "Pizza Shop",
+                "price": 250_000,
+                "location": "TN",
+                "category": "Restaurants",
+                "first_seen": "2024-03-01",
+                "url": "https://x/2/",
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import PROJECT_ROOT, Base, migrate_database
+from app.services import index_advisor
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _migrated(self, name: str, source: Path = None):
+        path = Path(self.tmp.name) / f"{name}.db"
+        if source is not None:
+            shutil.copy(source, path)
+        engine = create_engine(f"sqlite:///{path}")
+        migrate_database(engine)
+        return engine
+
+    def _assert_matches_models(self, engine) -> None:
+        with engine.connect() as connection:
+            diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+            version = connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+        self.assertEqual(diff, [])
+        self.assertEqual(version, "0008")
+        engine.dispose()
+
+    def test_fresh_database_matches_models(self) -> None:
+        self._assert_matches_models(self._migrated("fresh"))
+
+    def test_checked_in_database_upgrades_in_place(self) -> None:
+        engine = self._migrated("copy", PROJECT_ROOT / "bizbuysell_listings.db")
+        with engine.connect() as connection:
+            self.assertGreater(
+                connection.exec_driver_sql("SELECT COUNT(*) FROM listings").scalar(), 0
+            )
+        self._assert_matches_models(engine)
+
+    def test_create_all_database_is_stamped_and_upgraded(self) -> None:
+        path = Path(self.tmp.name) / "legacy.db"
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        migrate_database(engine)
+        self._assert_matches_models(engine)
+
+
+class TestHotPathQueryPlans(unittest.TestCase):
+    def test_hot_paths_use_indexes(self) -> None:
+        engine = create_engine("sqlite://")
+        migrate_database(engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            reports = index_advisor.analyze_hot_paths(db)
+        finally:
+            db.close()
+
+        self.assertEqual(
+            {report["path"] for report in reports}, set(index_advisor.HOT_PATHS)
+        )
+        scans = [
+            f"{report['path']}: {report['statement']} -> {report['plan']}"
+            for report in reports
+            if report["full_scans"] and not report["known"]
+        ]
+        self.assertEqual(scans, [])
+        # Known scans stay listed only while they still scan
+        self.assertEqual(
+            {report["path"] for report in reports if report["full_scans"]},
+            set(index_advisor.KNOWN_FULL_SCANS),
+        )
+
+    def test_detects_full_scan(self) -> None:
+        self.assertEqual(index_advisor.full_scans(["SCAN listings"]), ["listings"])
+        self.assertEqual(index_advisor.full_scans(["SCAN TABLE listings"]), ["listings"])
+        index_scan = ["SCAN scrape_runs USING INDEX idx_scrape_runs_date"]
+        self.assertEqual(index_advisor.full_scans(index_scan), ["scrape_runs"])
+        self.assertEqual(
+            index_advisor.full_scans(index_scan, "SELECT * FROM scrape_runs LIMIT ?"), []
+        )
+        self.assertEqual(
+            index_advisor.full_scans(
+                index_scan + ["USE TEMP B-TREE FOR ORDER BY"],
+                "SELECT * FROM scrape_runs ORDER BY id LIMIT ?",
+            ),
+            ["scrape_runs"],
+        )
+        title_scan = ["SCAN listings USING INDEX idx_listings_updated"]
+        self.assertEqual(
+            index_advisor.full_scans(
+                title_scan,
+                "SELECT * FROM listings WHERE lower(listings.title) LIKE lower(?) LIMIT ?",
+            ),
+            ["listings"],
+        )
+        self.assertEqual(
+            index_advisor.full_scans(["SEARCH listings USING INDEX idx_listings_price (asking_price>?)"]),
+            [],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
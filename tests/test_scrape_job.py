@@ -0,0 +1,193 @@
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, Listing, ListingSnapshot, ScrapeRun, SearchTarget
+from app.services import listing_service
+from app.scheduler import parsing, scrape_job
+
+
+START_URL = "https://www.bizbuysell.com/search/"
+PAGES = {
+    START_URL: [{"external_id": "1001", "title": "Bakery", "url": "https://x/1001/"}],
+    START_URL + "?page=2": [
+        {"external_id": "1002", "title": "Car Wash", "url": "https://x/1002/"}
+    ],
+    START_URL + "?page=3": [
+        {"external_id": "1003", "title": "Laundromat", "url": "https://x/1003/"}
+    ],
+}
+NEXT_PAGE = {
+    START_URL: START_URL + "?page=2",
+    START_URL + "?page=2": START_URL + "?page=3",
+    START_URL + "?page=3": START_URL + "?page=3",
+}
+
+
+class FakeParser:
+    fetched: list = []
+    fail_on: str | None = None
+
+    async def fetch_page(self, url: str, timeout: float = 30.0) -> str:
+        FakeParser.fetched.append(url)
+        if url == FakeParser.fail_on:
+            raise RuntimeError("unlocker timeout")
+        return url
+
+    def parse_search_results(self, html: str):
+        return [dict(item) for item in PAGES[html]]
+
+    def find_next_page_url(self, html: str, current_url: str):
+        return NEXT_PAGE[current_url]
+
+    def parse_search_page(self, html: str, current_url: str):
+        return {
+            "listings": self.parse_search_results(html),
+            "next_url": self.find_next_page_url(html, current_url),
+        }
+
+
+class ScrapeJobTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        FakeParser.fetched = []
+        FakeParser.fail_on = None
+        parsing.configure_parse_pool(0)
+        self.patches = [
+            patch.object(scrape_job, "SessionLocal", self.Session),
+            patch.object(scrape_job, "init_db", lambda: None),
+            patch.object(scrape_job, "BizBuySellParser", FakeParser),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self) -> None:
+        for p in self.patches:
+            p.stop()
+        parsing.shutdown_parse_pool()
+
+
+class TestResumableSearchScrape(ScrapeJobTestCase):
+    async def test_resume_continues_from_checkpoint(self) -> None:
+        FakeParser.fail_on = START_URL + "?page=3"
+        await scrape_job.run_search_scrape(start_url=START_URL)
+
+        db = self.Session()
+        failed = db.query(ScrapeRun).one()
+        self.assertEqual(failed.status, "failed")
+        self.assertEqual(failed.checkpoint.last_completed_url, START_URL + "?page=2")
+        self.assertEqual(failed.checkpoint.next_url, START_URL + "?page=3")
+        self.assertEqual(failed.checkpoint.stats["listings_found"], 2)
+        db.close()
+
+        FakeParser.fetched = []
+        FakeParser.fail_on = None
+        await scrape_job.run_search_scrape(resume=True, start_url=START_URL)
+
+        self.assertEqual(FakeParser.fetched, [START_URL + "?page=3"])
+        db = self.Session()
+        runs = db.query(ScrapeRun).all()
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0].status, "completed")
+        self.assertEqual(runs[0].listings_found, 3)
+        self.assertEqual(runs[0].new_listings, 3)
+        self.assertIsNone(runs[0].checkpoint.next_url)
+        self.assertEqual(db.query(Listing).count(), 3)
+        db.close()
+
+    async def test_resume_without_interrupted_run_starts_fresh(self) -> None:
+        await scrape_job.run_search_scrape(start_url=START_URL)
+        FakeParser.fetched = []
+        await scrape_job.run_search_scrape(resume=True, start_url=START_URL)
+
+        self.assertEqual(FakeParser.fetched[0], START_URL)
+        db = self.Session()
+        self.assertEqual(db.query(ScrapeRun).count(), 2)
+        db.close()
+
+
+class TestTargetScrapes(ScrapeJobTestCase):
+    async def test_overlapping_targets_upsert_once(self) -> None:
+        other_url = START_URL + "?page=2"
+        db = self.Session()
+        listing_service.create_search_target(db, START_URL, priority=10)
+        listing_service.create_search_target(db, other_url, priority=1)
+        db.commit()
+        db.close()
+
+        await scrape_job.run_target_scrapes(max_concurrency=2)
+
+        db = self.Session()
+        self.assertEqual(db.query(Listing).count(), 3)
+        self.assertEqual(db.query(ListingSnapshot).count(), 3)
+        runs = {run.target.url: run for run in db.query(ScrapeRun).all()}
+        self.assertEqual(runs[START_URL].status, "completed")
+        self.assertEqual(runs[START_URL].listings_found, 3)
+        self.assertEqual(runs[START_URL].new_listings, 3)
+        self.assertEqual(runs[other_url].listings_found, 2)
+        self.assertEqual(runs[other_url].new_listings, 0)
+        db.close()
+
+        # Both targets ran, so nothing is due until their cadence elapses
+        FakeParser.fetched = []
+        await scrape_job.run_target_scrapes()
+        self.assertEqual(FakeParser.fetched, [])
+
+    async def test_failed_target_keeps_partial_results(self) -> None:
+        db = self.Session()
+        listing_service.create_search_target(db, START_URL)
+        db.commit()
+        db.close()
+        FakeParser.fail_on = START_URL + "?page=3"
+
+        await scrape_job.run_target_scrapes()
+
+        db = self.Session()
+        run = db.query(ScrapeRun).one()
+        self.assertEqual(run.status, "failed")
+        self.assertEqual(run.new_listings, 2)
+        self.assertEqual(db.query(Listing).count(), 2)
+        self.assertIsNone(db.query(SearchTarget).one().last_run_at)
+        db.close()
+
+        # Still due on the next poll, which resumes from the checkpoint
+        FakeParser.fetched = []
+        FakeParser.fail_on = None
+        await scrape_job.run_target_scrapes()
+
+        self.assertEqual(FakeParser.fetched, [START_URL + "?page=3"])
+        db = self.Session()
+        run = db.query(ScrapeRun).one()
+        self.assertEqual(run.status, "completed")
+        self.assertEqual(run.listings_found, 3)
+        self.assertEqual(run.new_listings, 3)
+        self.assertIsNotNone(db.query(SearchTarget).one().last_run_at)
+        db.close()
+
+
+class TestAdaptivePlanning(ScrapeJobTestCase):
+    async def test_detail_batch_follows_the_plan(self) -> None:
+        batches = []
+
+        async def fake_detail_scrape(batch_size: int = 25, request_timeout: float = 90.0):
+            batches.append(batch_size)
+
+        with patch.object(scrape_job, "run_detail_scrape", fake_detail_scrape):
+            await scrape_job.run_adaptive_planning(fetch_budget_per_day=240)
+
+        self.assertEqual(batches, [10])
+        jobs = {job.id for job in scrape_job.build_scheduler(adaptive=True).get_jobs()}
+        self.assertEqual(jobs, {"run_target_scrapes", "run_adaptive_planning"})
+
+
+if __name__ == "__main__":
+    unittest.main()
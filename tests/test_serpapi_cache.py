@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.leadgen.ingest.google_maps import GoogleMapsIngest
+from app.services import serpapi_cache
+from app.services.google_jobs_client import GoogleJobsClient
+from app.services.serpapi_cache import SerpApiCache, cache_key
+
+
+class FakeSerpApi:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def __call__(self, url, params, cache=None, client=None):
+        self.calls.append(dict(params))
+        return {"search_parameters": {"q": params.get("q")}, "call": len(self.calls)}
+
+
+class TestSerpApiCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = SerpApiCache(
+            Path(self.tmp.name) / "cache.db",
+            max_entries=2,
+            ttl_seconds={"google_maps": 30 * serpapi_cache.DAY_SECONDS},
+        )
+        self.url = "https://serpapi.com/search"
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_key_ignores_api_key_and_param_order(self) -> None:
+        first = cache_key(self.url, {"engine": "google_jobs", "q": "barista", "api_key": "a"})
+        second = cache_key(self.url, {"api_key": "b", "q": "barista", "engine": "google_jobs"})
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, cache_key(self.url, {"engine": "google_jobs", "q": "chef"}))
+
+    def test_ttl_per_engine_and_lru_eviction(self) -> None:
+        jobs = {"engine": "google_jobs", "q": "barista"}
+        maps = {"engine": "google_maps", "q": "coffee"}
+        with patch.object(serpapi_cache.time, "time", return_value=1_000_000.0):
+            self.cache.set(self.url, jobs, {"jobs": 1})
+            self.cache.set(self.url, maps, {"maps": 1})
+        two_days_later = 1_000_000.0 + 2 * serpapi_cache.DAY_SECONDS
+        with patch.object(serpapi_cache.time, "time", return_value=two_days_later):
+            self.assertIsNone(self.cache.get(self.url, jobs))
+            self.assertEqual(self.cache.get(self.url, maps), {"maps": 1})
+            # maps was just read, so the stale jobs entry is least recently used.
+            self.cache.set(self.url, {"engine": "google_maps", "q": "tacos"}, {"maps": 2})
+            self.assertEqual(self.cache.purge_expired(), 0)
+        self.assertEqual(self.cache.summary()["entries"], 2)
+        self.assertEqual(self.cache.stats["evictions"], 1)
+
+        a_month_later = 1_000_000.0 + 31 * serpapi_cache.DAY_SECONDS
+        with patch.object(serpapi_cache.time, "time", return_value=a_month_later):
+            self.assertEqual(self.cache.purge_expired(), 1)
+
+    async def test_jobs_client_reuses_cached_response(self) -> None:
+        fake = FakeSerpApi()
+        with patch.object(serpapi_cache, "get_serpapi_json", new=fake):
+            first = await GoogleJobsClient(api_key="key-1", cache=self.cache).search_jobs("barista")
+            second = await GoogleJobsClient(api_key="key-2", cache=self.cache).search_jobs("barista")
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(first, second)
+        self.assertEqual((self.cache.stats["hits"], self.cache.stats["misses"]), (1, 1))
+
+    async def test_error_payloads_are_not_cached(self) -> None:
+        async def failing(url, params, cache=None, client=None):
+            return {"error": "Invalid API key"}
+
+        with patch.object(serpapi_cache, "get_serpapi_json", new=failing):
+            await self.cache.fetch_json(self.url, {"engine": "google_jobs", "q": "x"})
+        self.assertEqual(self.cache.summary()["entries"], 0)
+
+    async def test_maps_cache_hits_skip_rate_limiter(self) -> None:
+        fake = FakeSerpApi()
+
+        class CountingLimiter:
+            waits = 0
+
+            async def wait(self) -> None:
+                self.waits += 1
+
+        limiter = CountingLimiter()
+        with patch("app.leadgen.ingest.google_maps.get_serpapi_json", new=fake):
+            for _ in range(2):
+                ingest = GoogleMapsIngest(
+                    query="coffee shops",
+                    location="Memphis, Tennessee",
+                    api_key="test_api_key",
+                    output_dir=self.tmp.name,
+                    cache=self.cache,
+                    rate_limiter=limiter,
+                )
+                await ingest._search_page(start=0)
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(limiter.waits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()